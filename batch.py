@@ -0,0 +1,275 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from corpus import Corpus, is_corpus
+from headless import ALGORITHMS, parse_grid, solve_grid
+from puzzle_io import read_puzzles
+
+# Batch solving of puzzle collections.
+# Puzzles come from a directory, a file holding several puzzles, or any iterator of
+# grids, and are solved in a process pool. Results are yielded as soon as each puzzle
+# finishes, so a collection of any size can be validated as a stream:
+#
+#     python -m batch puzzles/ --algorithm dfs --workers 8 --max-time 10 --json
+#
+# Puzzle files can be in any format read by puzzle_io. Text puzzles are parsed by the
+# workers, so a malformed one is reported instead of ending the batch. Puzzles of a
+# corpus (.yyc) are sent to the workers as record indices: each worker maps the corpus
+# files in its pool initializer and decodes its own puzzles, so no grid is decoded in
+# the parent or pickled between processes. Every result
+# carries a status:
+#   solved      a verified solution was found
+#   unsolved    the search finished without a solution
+#   stopped     the time or node budget ran out (reason tells which)
+#   invalid     the puzzle could not be parsed (reason holds the error)
+#   error       the solver raised an exception (reason holds the error)
+
+SOLVED = "solved"
+UNSOLVED = "unsolved"
+STOPPED = "stopped"
+INVALID = "invalid"
+ERROR = "error"
+
+_corpora = {}  # Corpus files mapped in this process, by path
+
+
+class CorpusRecord:
+    def __init__(self, path, index):
+        """
+        Reference to a puzzle of a corpus file, decoded where it is solved.
+
+        Args:
+            path (str): Corpus file
+            index (int): Position of the puzzle in the corpus
+        """
+        self.path = path
+        self.index = index
+
+    def grid(self):
+        """Decode the puzzle from the corpus, mapping the file on first use."""
+        if self.path not in _corpora:
+            _corpora[self.path] = Corpus(self.path)
+        return _corpora[self.path][self.index]
+
+
+def _init_worker(corpus_paths):
+    """Map the corpus files of the batch once in each pool process."""
+    for path in corpus_paths:
+        if path not in _corpora:
+            _corpora[path] = Corpus(path)
+
+
+class BatchResult:
+    def __init__(self, puzzle_id, status, reason=None, result=None):
+        """
+        Outcome of one puzzle of a batch.
+
+        Args:
+            puzzle_id (str): Where the puzzle came from, e.g. "levels.txt:3"
+            status (str): One of SOLVED, UNSOLVED, STOPPED, INVALID or ERROR
+            reason (str, optional): Why the puzzle was not solved
+            result (SolveResult, optional): Solution and statistics, if the solver ran
+        """
+        self.puzzle_id = puzzle_id
+        self.status = status
+        self.reason = reason
+        self.result = result
+
+    def to_dict(self):
+        """Return the result as a JSON-serializable dictionary."""
+        data = {"puzzle": self.puzzle_id, "status": self.status, "reason": self.reason}
+        if self.result is not None:
+            data.update(self.result.to_dict())
+        return data
+
+
+def _source_files(source):
+    """Return the puzzle files of a path source: the file itself or a directory's files."""
+    path = os.fspath(source)
+    if not os.path.isdir(path):
+        return [path]
+    paths = [os.path.join(path, name) for name in sorted(os.listdir(path)) if not name.startswith(".")]
+    return [file_path for file_path in paths if os.path.isfile(file_path)]
+
+
+def corpus_paths(sources):
+    """
+    Find the corpus files among batch sources.
+
+    Args:
+        sources (list): Sources accepted by iter_puzzles; only paths are inspected
+
+    Returns:
+        list: Paths of the corpus files, in source order
+    """
+    paths = []
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            paths += [path for path in _source_files(source) if path != "-" and is_corpus(path)]
+    return paths
+
+
+def iter_puzzles(source):
+    """
+    Enumerate the puzzles of a batch source.
+
+    Args:
+        source: A directory (every file in it, in name order), a puzzle file, "-" for
+            stdin, or an iterable of grids or (puzzle id, grid) pairs
+
+    Yields:
+        tuple: (puzzle id, puzzle) with a grid, puzzle text or CorpusRecord as the puzzle
+    """
+    if isinstance(source, (str, os.PathLike)):
+        for path in _source_files(source):
+            if path != "-" and is_corpus(path):
+                with Corpus(path) as corpus:
+                    count = len(corpus)
+                for index in range(count):
+                    yield f"{path}:{index + 1}", CorpusRecord(path, index)
+            else:
+                yield from read_puzzles(path, parse=False)
+        return
+
+    for index, item in enumerate(source, 1):
+        if isinstance(item, tuple) and len(item) == 2 and isinstance(item[0], str):
+            yield item
+        else:
+            yield str(index), item
+
+
+def solve_puzzle(puzzle_id, puzzle, algorithm="dfs", max_time=None, max_nodes=None):
+    """
+    Solve one puzzle of a batch, turning every failure into a result.
+
+    Args:
+        puzzle_id (str): Identifier reported with the result
+        puzzle: Grid, puzzle text in the format read by headless.parse_grid, or a
+            CorpusRecord
+        algorithm (str): One of the keys of headless.ALGORITHMS
+        max_time (float, optional): Give up after this many seconds
+        max_nodes (int, optional): Give up after exploring this many states
+
+    Returns:
+        BatchResult: Status and, when the solver ran, its SolveResult
+    """
+    try:
+        if isinstance(puzzle, CorpusRecord):
+            grid = puzzle.grid()
+        elif isinstance(puzzle, str):
+            grid = parse_grid(puzzle)
+        else:
+            grid = puzzle
+        result = solve_grid(grid, algorithm, max_time=max_time, max_nodes=max_nodes)
+    except ValueError as e:
+        return BatchResult(puzzle_id, INVALID, str(e))
+    except Exception as e:
+        return BatchResult(puzzle_id, ERROR, f"{type(e).__name__}: {e}")
+
+    if result.solved:
+        return BatchResult(puzzle_id, SOLVED, result=result)
+    if "stopped" in result.stats:
+        return BatchResult(puzzle_id, STOPPED, result.stats["stopped"], result)
+    return BatchResult(puzzle_id, UNSOLVED, "no solution found", result)
+
+
+def solve_batch(source, algorithm="dfs", workers=None, max_time=None, max_nodes=None, corpora=None):
+    """
+    Solve a collection of puzzles in a process pool.
+    Only a few puzzles per worker are read ahead, so the source may be arbitrarily large.
+
+    Args:
+        source: Anything accepted by iter_puzzles
+        algorithm (str): One of the keys of headless.ALGORITHMS
+        workers (int, optional): Pool size (the CPU count by default); 1 solves in this process
+        max_time (float, optional): Time budget of every puzzle in seconds
+        max_nodes (int, optional): Node budget of every puzzle
+        corpora (list, optional): Corpus files every worker maps when it starts; by
+            default those of a path source
+
+    Yields:
+        BatchResult: One per puzzle, in the order they finish
+
+    Raises:
+        ValueError: If the algorithm is unknown
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm} (choose from {', '.join(ALGORITHMS)})")
+    workers = workers or multiprocessing.cpu_count()
+    puzzles = iter_puzzles(source)
+
+    if workers == 1:
+        for puzzle_id, puzzle in puzzles:
+            yield solve_puzzle(puzzle_id, puzzle, algorithm, max_time, max_nodes)
+        return
+
+    if corpora is None:
+        corpora = corpus_paths([source])
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(corpora,))
+    try:
+        pending = set()
+        for puzzle_id, puzzle in puzzles:
+            pending.add(pool.submit(solve_puzzle, puzzle_id, puzzle, algorithm, max_time, max_nodes))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # Also reached when the caller stops iterating early
+        pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:]
+
+    Returns:
+        int: Exit status, 0 when every puzzle was solved and 1 otherwise
+    """
+    parser = argparse.ArgumentParser(prog="python -m batch", description="Solve a collection of Yin-Yang puzzles.")
+    parser.add_argument("sources", nargs="+", help="Puzzle files or directories, or - for stdin")
+    parser.add_argument("--algorithm", "-a", choices=list(ALGORITHMS), default="dfs", help="Solver mode (default: dfs)")
+    parser.add_argument("--workers", "-j", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--max-time", type=float, help="Give up on a puzzle after this many seconds")
+    parser.add_argument("--max-nodes", type=int, help="Give up on a puzzle after exploring this many states")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per puzzle")
+    args = parser.parse_args(argv)
+
+    counts = {}
+    start = time.perf_counter()
+    puzzles = itertools.chain.from_iterable(iter_puzzles(source) for source in args.sources)
+    corpora = corpus_paths(args.sources)
+    for item in solve_batch(puzzles, args.algorithm, args.workers, args.max_time, args.max_nodes, corpora):
+        counts[item.status] = counts.get(item.status, 0) + 1
+        if args.json:
+            print(json.dumps(item.to_dict()), flush=True)
+            continue
+        line = f"{item.puzzle_id}: {item.status}"
+        if item.result is not None:
+            line += f" in {item.result.elapsed:.3f}s, {item.result.stats.get('states_explored', 0)} states"
+        if item.reason:
+            line += f" ({item.reason})"
+        print(line, flush=True)
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    summary = ", ".join(f"{status}: {count}" for status, count in sorted(counts.items()))
+    print(f"{total} puzzles in {elapsed:.3f}s ({total / elapsed if elapsed else 0:.1f}/s); {summary}",
+          file=sys.stderr)
+    return 0 if counts.get(SOLVED, 0) == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from bitboard import BitBoard, iter_bits
+from board import PUZZLE_LEVELS
+from generator import random_solution
+from headless import ALGORITHMS, solve_grid
+
+# Benchmark suite for the solver modes.
+# Every algorithm runs on every predefined level and on generated larger boards. Each
+# case gets warmup runs, then timed repetitions without tracing, then one extra run
+# under tracemalloc for the peak memory, since tracing slows the solvers down too much
+# to share a run with the timings. Results are printed as a table and can be written
+# as JSON for comparing runs:
+#
+#     python benchmark.py --repeat 5 --output results.json
+#     python benchmark.py --algorithms dfs,sat --sizes 12,16 --levels none
+#
+# Breadth-first modes grow exponentially with the board, so by default they only run on
+# generated boards up to --bfs-max-size. The SAT mode explores no search states; its work
+# is counted in branching decisions and labeled as such. Every run gets the --max-time
+# and --max-nodes budget; a case whose run is stopped by it is not repeated and is
+# reported as stopped instead of failed.
+
+# Modes that are skipped on generated boards larger than --bfs-max-size
+BREADTH_FIRST = {"bfs", "bfs-layered"}
+
+
+def generate_puzzle(size, density, seed):
+    """
+    Generate a solvable board by drawing a random solution and keeping some of its cells.
+
+    Args:
+        size (int): Number of rows/columns
+        density (float): Fraction of cells kept as givens
+        seed (int): Seed for the random choices, so the same puzzle is produced every run
+
+    Returns:
+        list: Grid as nested lists with 0=black, 1=white, 2=empty
+    """
+    rng = random.Random(seed)
+    bitboard = BitBoard(size)
+    black, white = random_solution(size, rng)
+    grid = bitboard.to_grid(black, white).tolist()
+
+    # One cell of each color always stays, so both colors have a given
+    keep = {rng.choice(list(iter_bits(black))), rng.choice(list(iter_bits(white)))}
+    for i in range(bitboard.cells):
+        if i not in keep and rng.random() >= density:
+            grid[i // size][i % size] = 2
+    return grid
+
+
+def run_case(name, grid, algorithm, warmup, repeat, max_time=None, max_nodes=None):
+    """
+    Benchmark one algorithm on one puzzle.
+
+    Args:
+        name (str): Label of the puzzle
+        grid: Puzzle grid with 0=black, 1=white, 2=empty
+        algorithm (str): Key of headless.ALGORITHMS
+        warmup (int): Untimed runs before measuring
+        repeat (int): Timed runs
+        max_time (float, optional): Time budget of every run in seconds
+        max_nodes (int, optional): Node budget of every run
+
+    Returns:
+        dict: Measurements of the case; "stopped" holds the reason if a run ran out
+            of its budget, in which case the remaining runs are skipped
+    """
+    def solve():
+        return solve_grid(grid, algorithm, max_time=max_time, max_nodes=max_nodes)
+
+    # A stopped run would only be stopped again, so the case ends with it
+    times = []
+    result = None
+    for i in range(warmup + repeat):
+        result = solve()
+        if i >= warmup or "stopped" in result.stats:
+            times.append(result.elapsed)
+        if "stopped" in result.stats:
+            break
+    stopped = result.stats.get("stopped")
+
+    peak = 0
+    traced = result
+    if not stopped:
+        tracemalloc.start()
+        traced = solve()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    # Search modes count explored states, the SAT mode branching decisions
+    nodes = result.stats.get("states_explored", 0)
+    unit = "decisions" if "decisions" in result.stats else "states"
+    work = result.stats["decisions"] if unit == "decisions" else nodes
+    median = statistics.median(times)
+    return {
+        "puzzle": name,
+        "size": len(grid),
+        "algorithm": algorithm,
+        "solved": result.solved and traced.solved,
+        "stopped": stopped,
+        "nodes": nodes,
+        "work": work,
+        "work_unit": unit,
+        "work_per_sec": work / median if median > 0 else 0.0,
+        "time_median": median,
+        "time_min": min(times),
+        "time_mean": statistics.fmean(times),
+        "peak_memory_kb": peak / 1024,
+        "stats": result.stats,
+    }
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:]
+
+    Returns:
+        int: Exit status, 1 if any case that was not stopped by the budget failed to
+            produce a valid solution
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Yin-Yang solver modes.")
+    parser.add_argument("--algorithms", default=",".join(ALGORITHMS),
+                        help="Comma-separated solver modes (default: all)")
+    parser.add_argument("--levels", default="all",
+                        help="Comma-separated predefined levels, 'all' or 'none' (default: all)")
+    parser.add_argument("--sizes", default="8,10",
+                        help="Comma-separated sizes of generated boards, empty for none (default: 8,10)")
+    parser.add_argument("--bfs-max-size", type=int, default=8,
+                        help="Largest generated board the breadth-first modes run on (default: 8)")
+    parser.add_argument("--density", type=float, default=0.3,
+                        help="Fraction of givens kept on generated boards (default: 0.3)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated boards (default: 0)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per case (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (default: 3)")
+    parser.add_argument("--max-time", type=float, default=60,
+                        help="Seconds a run may take before it is stopped, 0 for no limit (default: 60)")
+    parser.add_argument("--max-nodes", type=int, default=0,
+                        help="States a run may explore before it is stopped, 0 for no limit (default: 0)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    algorithms = [a for a in args.algorithms.split(",") if a]
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            parser.error(f"Unknown algorithm: {algorithm}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    puzzles = []
+    if args.levels == "all":
+        levels = sorted(PUZZLE_LEVELS)
+    elif args.levels == "none":
+        levels = []
+    else:
+        levels = [int(level) for level in args.levels.split(",")]
+    for level in levels:
+        puzzles.append((f"level-{level}", PUZZLE_LEVELS[level].tolist(), False))
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        puzzles.append((f"generated-{size}", generate_puzzle(size, args.density, args.seed + size),
+                        size > args.bfs_max_size))
+
+    results = []
+    print(f"{'puzzle':<14}{'algorithm':<14}{'solved':<8}{'work':>8} {'unit':<10}{'work/s':>10}"
+          f"{'median s':>11}{'peak KB':>11}")
+    for name, grid, large in puzzles:
+        for algorithm in algorithms:
+            if large and algorithm in BREADTH_FIRST:
+                print(f"{name:<14}{algorithm:<14}skipped (larger than --bfs-max-size)", flush=True)
+                continue
+            case = run_case(name, grid, algorithm, args.warmup, args.repeat,
+                            args.max_time or None, args.max_nodes or None)
+            results.append(case)
+            if case["stopped"]:
+                print(f"{name:<14}{algorithm:<14}stopped ({case['stopped']}) after {case['work']} "
+                      f"{case['work_unit']} in {case['time_min']:.2f}s", flush=True)
+                continue
+            print(f"{name:<14}{algorithm:<14}{str(case['solved']):<8}{case['work']:>8} {case['work_unit']:<10}"
+                  f"{case['work_per_sec']:>10.0f}{case['time_median']:>11.4f}{case['peak_memory_kb']:>11.1f}",
+                  flush=True)
+
+    if args.output:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "settings": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    stopped = [case for case in results if case["stopped"]]
+    if stopped:
+        print(f"{len(stopped)} of {len(results)} cases stopped by the budget: "
+              + ", ".join(f"{case['puzzle']}/{case['algorithm']}" for case in stopped))
+    return 0 if all(case["solved"] for case in results if not case["stopped"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import numpy as np
+
+# Bitboard representation of a Yin-Yang board.
+# A board state is a pair of Python ints (black, white): bit i is set when the cell
+# at row i // size, column i % size holds that color. Empty cells are the bits set
+# in neither mask. Python ints are arbitrary precision, so any board size works.
+
+class BitBoard:
+    def __init__(self, size):
+        """
+        Precompute the masks used to move bits around a board of the given size.
+
+        Args:
+            size (int): Number of rows/columns of the square board
+        """
+        self.size = size
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1  # Every cell on the board
+
+        first_col = 0
+        last_col = 0
+        for r in range(size):
+            first_col |= 1 << (r * size)
+            last_col |= 1 << (r * size + size - 1)
+        self.not_first_col = self.full & ~first_col  # Cells with a left neighbor
+        self.not_last_col = self.full & ~last_col  # Cells with a right neighbor
+
+        # Anchors are the top-left cells of every 2x2 window
+        last_row = ((1 << size) - 1) << (size * (size - 1))
+        self.anchors = self.not_last_col & ~last_row & self.full
+
+        # Orthogonal neighbors of every cell, used for move ordering
+        self.neighbor_masks = [self.neighbors(1 << i) for i in range(self.cells)]
+
+    def index(self, r, c):
+        """Return the bit index of the cell at (r, c)."""
+        return r * self.size + c
+
+    def position(self, i):
+        """Return the (row, col) coordinates of bit index i."""
+        return divmod(i, self.size)
+
+    def pack(self, grid):
+        """
+        Convert a NumPy grid into a bitboard pair.
+
+        Args:
+            grid (numpy.ndarray): Grid with 0=black, 1=white, 2=empty
+
+        Returns:
+            tuple: (black, white) integer masks
+        """
+        flat = np.asarray(grid).ravel()
+        black = int.from_bytes(np.packbits(flat == 0, bitorder='little').tobytes(), 'little')
+        white = int.from_bytes(np.packbits(flat == 1, bitorder='little').tobytes(), 'little')
+        return black, white
+
+    def to_grid(self, black, white):
+        """
+        Convert a bitboard pair back into a NumPy grid.
+
+        Args:
+            black, white (int): Bitboard masks for each color
+
+        Returns:
+            numpy.ndarray: Grid with 0=black, 1=white, 2=empty
+        """
+        grid = np.full(self.cells, 2, dtype=int)
+        grid[self._unpack(black)] = 0
+        grid[self._unpack(white)] = 1
+        return grid.reshape(self.size, self.size)
+
+    def _unpack(self, mask):
+        """Return a boolean array with one entry per cell set where mask has a bit."""
+        raw = np.frombuffer(mask.to_bytes((self.cells + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(raw, bitorder='little')[:self.cells].astype(bool)
+
+    def neighbors(self, mask):
+        """
+        Return every cell orthogonally adjacent to a cell in mask.
+
+        Args:
+            mask (int): Cells to expand
+
+        Returns:
+            int: Mask of neighboring cells (may overlap mask itself)
+        """
+        return (((mask << 1) & self.not_first_col) |
+                ((mask >> 1) & self.not_last_col) |
+                ((mask << self.size) & self.full) |
+                (mask >> self.size))
+
+    def flood(self, seed, passable):
+        """
+        Grow seed through passable cells until it stops changing.
+
+        Args:
+            seed (int): Starting cells
+            passable (int): Cells the fill may enter
+
+        Returns:
+            int: Mask of all passable cells connected to seed
+        """
+        region = seed & passable
+        while True:
+            grown = (region | self.neighbors(region)) & passable
+            if grown == region:
+                return region
+            region = grown
+
+    def is_connected(self, mask):
+        """
+        Check whether the cells in mask form a single connected group.
+
+        Args:
+            mask (int): Cells to check
+
+        Returns:
+            bool: True if mask is empty or a single orthogonally connected group
+        """
+        if not mask:
+            return True
+        return self.flood(mask & -mask, mask) == mask
+
+    def components(self, mask):
+        """
+        Split mask into its connected groups.
+
+        Args:
+            mask (int): Cells to split
+
+        Returns:
+            list: One mask per connected group, in row-major order of their first cell
+        """
+        groups = []
+        while mask:
+            group = self.flood(mask & -mask, mask)
+            groups.append(group)
+            mask &= ~group
+        return groups
+
+    def block_anchors(self, mask):
+        """
+        Find 2x2 windows whose four cells are all in mask.
+
+        Args:
+            mask (int): Cells of a single color
+
+        Returns:
+            int: Mask of the top-left cell of every monochrome 2x2 window
+        """
+        n = self.size
+        return mask & (mask >> 1) & (mask >> n) & (mask >> (n + 1)) & self.anchors
+
+    def cross_anchors(self, black, white):
+        """
+        Find 2x2 windows that form a checkerboard of black and white.
+
+        Args:
+            black, white (int): Bitboard masks for each color
+
+        Returns:
+            int: Mask of the top-left cell of every checkerboard 2x2 window
+        """
+        n = self.size
+        return ((black & (white >> 1) & (white >> n) & (black >> (n + 1))) |
+                (white & (black >> 1) & (black >> n) & (white >> (n + 1)))) & self.anchors
+
+    def window_cells(self, anchors):
+        """
+        Expand a mask of window anchors into the cells those windows cover.
+
+        Args:
+            anchors (int): Top-left cells of 2x2 windows
+
+        Returns:
+            int: Mask of every cell inside one of the windows
+        """
+        n = self.size
+        return anchors | (anchors << 1) | (anchors << n) | (anchors << (n + 1))
+
+    def format_rows(self, black, white):
+        """
+        Render a bitboard pair as text rows for console output.
+
+        Args:
+            black, white (int): Bitboard masks for each color
+
+        Returns:
+            list: One string per row using ■ for black, □ for white and · for empty
+        """
+        rows = []
+        for r in range(self.size):
+            row = []
+            for c in range(self.size):
+                bit = 1 << (r * self.size + c)
+                row.append("■" if black & bit else "□" if white & bit else "·")
+            rows.append(" ".join(row))
+        return rows
+
+
+def iter_bits(mask):
+    """
+    Yield the index of every set bit in mask, lowest first (row-major order).
+
+    Args:
+        mask (int): Bitboard mask
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -1,64 +1,15 @@
+import os
 import numpy as np
-import pygame
+from connectivity import ConnectivityTracker
+from puzzle_io import load_levels, read_puzzles
+from corpus import Corpus, is_corpus
+from rules import block_cells, win_verdicts
 
-# Define puzzle levels with pre-filled cells
+# Puzzle levels are stored in levels.txt next to this module (see puzzle_io for the format)
 # 0 = black, 1 = white, 2 = empty (gray)
 # Each level is a numpy array representing the initial state of the board
-PUZZLE_LEVELS = {
-    1: np.array([
-        [0, 2, 1, 2, 2, 2],
-        [2, 2, 1, 1, 2, 2],
-        [2, 2, 2, 2, 1, 2],
-        [2, 1, 2, 2, 1, 2],
-        [2, 2, 2, 0, 2, 2],
-        [2, 2, 2, 2, 2, 2],
-    ], dtype=int),
-    2: np.array([
-        [1, 2, 1, 1, 2, 2],
-        [2, 0, 2, 2, 0, 2],
-        [2, 2, 2, 0, 0, 2],
-        [1, 2, 2, 0, 2, 2],
-        [2, 2, 0, 2, 2, 2],
-        [2, 2, 2, 2, 2, 2],
-    ], dtype=int),
-    3: np.array([
-        [2, 2, 2, 0, 2, 2],
-        [2, 0, 0, 2, 2, 2],
-        [2, 0, 2, 0, 1, 2],
-        [2, 0, 2, 1, 2, 2],
-        [2, 2, 1, 2, 2, 2],
-        [2, 2, 1, 0, 2, 2],
-    ], dtype=int),
-    4: np.array([
-        [2, 2, 0, 1, 2, 2],
-        [2, 2, 2, 1, 2, 2],
-        [2, 2, 1, 2, 0, 2],
-        [2, 0, 2, 1, 2, 0],
-        [2, 2, 1, 2, 2, 2],
-        [2, 2, 2, 2, 2, 2],
-    ], dtype=int),
-    5: np.array([
-        [1, 2, 2, 2, 2, 2],
-        [2, 1, 2, 0, 2, 1],
-        [2, 1, 0, 2, 2, 2],
-        [0, 1, 2, 2, 1, 2],
-        [2, 2, 0, 1, 1, 2],
-        [2, 2, 2, 2, 2, 2],
-    ], dtype=int),
-    # Special 10x10 level
-    6: np.array([
-        [1, 2, 0, 2, 2, 2, 2, 2, 2, 0],
-        [2, 0, 2, 2, 2, 2, 2, 2, 1, 2],
-        [2, 2, 0, 2, 0, 0, 0, 2, 2, 1],
-        [2, 0, 2, 0, 2, 2, 2, 2, 1, 2],
-        [2, 2, 2, 2, 2, 0, 0, 2, 2, 2],
-        [2, 2, 2, 2, 0, 2, 1, 2, 2, 2],
-        [2, 2, 1, 2, 2, 2, 2, 1, 2, 2],
-        [2, 2, 2, 2, 0, 1, 2, 2, 1, 2],
-        [2, 2, 1, 2, 2, 1, 2, 2, 2, 2],
-        [2, 2, 2, 2, 2, 2, 2, 2, 2, 2],
-    ], dtype=int),
-}
+LEVELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels.txt")
+PUZZLE_LEVELS = load_levels(LEVELS_PATH)
 
 class Board:
     def __init__(self, level=1):
@@ -72,6 +23,55 @@ class Board:
         self.grid = self.load_level(level)
         self.size = self.grid.shape[0]  # Get board size from grid dimensions
     
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Create a board from an arbitrary square grid instead of a predefined level.
+        
+        Args:
+            grid: 2D array-like with 0=black, 1=white, 2=empty
+            
+        Returns:
+            Board: A board holding a copy of the grid, with level set to None
+            
+        Raises:
+            ValueError: If the grid is not square or contains other values
+        """
+        grid = np.array(grid, dtype=int)
+        if grid.ndim != 2 or grid.shape[0] != grid.shape[1] or grid.shape[0] == 0:
+            raise ValueError(f"Grid must be square, got shape {grid.shape}")
+        if not np.isin(grid, (0, 1, 2)).all():
+            raise ValueError("Grid cells must be 0 (black), 1 (white) or 2 (empty)")
+        board = cls.__new__(cls)
+        board.level = None
+        board.grid = grid
+        board.size = grid.shape[0]
+        return board
+    
+    @classmethod
+    def from_file(cls, path, index=0):
+        """
+        Create a board from a puzzle file in any of the puzzle_io formats or a corpus.
+        
+        Args:
+            path (str): Puzzle file
+            index (int): Position of the puzzle in the file, counting from 0
+            
+        Returns:
+            Board: A board holding the puzzle, with level set to None
+            
+        Raises:
+            IndexError: If the file holds fewer puzzles
+            ValueError: If the puzzle cannot be read
+        """
+        if is_corpus(path):
+            with Corpus(path) as corpus:
+                return corpus.board(index)  # Random access, no scan needed
+        for position, (_, grid) in enumerate(read_puzzles(path)):
+            if position == index:
+                return cls.from_grid(grid)
+        raise IndexError(f"{path} has no puzzle at index {index}")
+    
     def load_level(self, level):
         """
         Load a predefined puzzle based on level number.
@@ -102,59 +102,21 @@ class Board:
         Returns:
             set: Coordinates of cells that are part of invalid 2x2 blocks
         """
-        invalid_cells = set()
-        for r in range(self.size-1):
-            for c in range(self.size-1):
-                # Check 2x2 block
-                block = self.grid[r:r+2, c:c+2]
-                if np.all(block == 0) or np.all(block == 1):
-                    invalid_cells.update([(r,c), (r,c+1), (r+1,c), (r+1,c+1)])
-        return invalid_cells
+        rows, cols = np.nonzero(block_cells(self.grid))
+        return set(zip(rows.tolist(), cols.tolist()))
 
     def check_consecutive_blocks(self):
         """
         Check if all cells of the same color form a single connected group.
-        Uses flood fill algorithm to count connected regions.
+        Uses a union-find connectivity tracker to count connected regions.
         
         Returns:
             bool: True if both black and white cells form single connected groups
         """
-        def flood_fill(r, c, color, visited):
-            """
-            Recursive flood fill to count connected cells of the same color.
-            
-            Args:
-                r, c (int): Current cell coordinates
-                color (int): Color to check (0=black, 1=white)
-                visited (set): Set of already visited cells
-                
-            Returns:
-                int: Number of connected cells of the specified color
-            """
-            if (r < 0 or r >= self.size or c < 0 or c >= self.size or 
-                (r,c) in visited or self.grid[r,c] != color):
-                return 0
-            visited.add((r,c))
-            count = 1
-            for dr, dc in [(0,1), (1,0), (0,-1), (-1,0)]:
-                count += flood_fill(r+dr, c+dc, color, visited)
-            return count
-
-        # Count black and white regions
-        black_regions = []
-        white_regions = []
-        visited = set()
-        
-        for r in range(self.size):
-            for c in range(self.size):
-                if (r,c) not in visited:
-                    if self.grid[r,c] == 0:
-                        black_regions.append(flood_fill(r, c, 0, visited))
-                    elif self.grid[r,c] == 1:
-                        white_regions.append(flood_fill(r, c, 1, visited))
+        tracker = ConnectivityTracker.from_grid(self.grid)
         
         # Valid board has exactly one black region and one white region
-        return len(black_regions) == 1 and len(white_regions) == 1
+        return tracker.components == [1, 1]
 
     def check_win_condition(self):
         """
@@ -167,12 +129,4 @@ class Board:
         Returns:
             str: "WIN" if the board is solved, error message if invalid, None if incomplete
         """
-        # Check if board is full
-        if not np.any(self.grid == 2):
-            if self.check_2x2_blocks():
-                return "Invalid: 2x2 blocks detected"
-            elif not self.check_consecutive_blocks():
-                return "Invalid: Regions must be connected"
-            else:
-                return "WIN"
-        return None
+        return win_verdicts(self.grid)
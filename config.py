@@ -12,7 +12,19 @@ GRAY = (200, 200, 200)  # Used for empty cells
 BLUE = (0, 0, 255)  # Used for buttons
 
 # Game Settings
-SOLVE_SPEED = 0  # 0 for instant solve, higher values for step delay in milliseconds
+SOLVE_FPS = 30  # Maximum frames per second drawn while a solver runs
+SOLVE_SPEED = 0  # 0 to draw by frame rate, N > 0 to draw every N explored states instead
 
 # Debug Mode
 DEBUG = False  # Set to True to print debug logs to console
+
+# Search Settings
+TRANSPOSITION_CAPACITY = 1_000_000  # Maximum number of states remembered by a search (0 = unbounded)
+TRANSPOSITION_POLICY = "lru"  # Entry dropped when the table is full: "lru" or "fifo"
+SOLVE_TIME_LIMIT = 0  # Seconds a solve may run before it gives up (0 = no limit)
+SOLVE_NODE_LIMIT = 0  # States a solve may explore before it gives up (0 = no limit)
+ASTAR_NODE_LIMIT = 100_000  # States A* keeps before it frees them and continues as IDA* (0 = no limit)
+DFS_WORKERS = 1  # Processes used by DFS; more than 1 splits the search tree between them
+DFS_SPLIT_DEPTH = 4  # Cells assigned before the DFS tree is split into subproblems
+DFS_SPLIT_NODES = 2000  # States a subproblem explores before it may be split again for an idle worker
+GENERATOR_SEARCH_LIMIT = 20000  # States a uniqueness check of the generator may explore before it keeps the given
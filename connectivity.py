@@ -0,0 +1,170 @@
+# Connectivity tracking with a disjoint-set forest that supports rollback.
+# Unions are made by size without path compression, so every union can be undone in
+# O(1) and finds stay O(log n). This lets a backtracking search keep component counts
+# up to date instead of re-flooding the board after every move.
+
+class RollbackUnionFind:
+    def __init__(self, n):
+        """
+        Create n singleton sets.
+
+        Args:
+            n (int): Number of elements
+        """
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.log = []  # One entry per union call: (child root, parent root) or None
+
+    def find(self, x):
+        """Return the root of the set containing x."""
+        parent = self.parent
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        """
+        Merge the sets containing a and b.
+
+        Args:
+            a, b (int): Elements to merge
+
+        Returns:
+            bool: True if two different sets were merged
+        """
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            self.log.append(None)
+            return False
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        self.log.append((rb, ra))
+        return True
+
+    def rollback(self):
+        """Undo the most recent union call."""
+        entry = self.log.pop()
+        if entry is not None:
+            child, root = entry
+            self.parent[child] = child
+            self.size[root] -= self.size[child]
+
+
+class ConnectivityTracker:
+    def __init__(self, size):
+        """
+        Track the connected groups of each color on a board of the given size.
+
+        Args:
+            size (int): Number of rows/columns of the square board
+        """
+        self.size = size
+        self.cells = size * size
+        self.neighbors = []
+        for i in range(self.cells):
+            r, c = divmod(i, size)
+            self.neighbors.append([nr * size + nc
+                                   for nr, nc in [(r-1, c), (r+1, c), (r, c-1), (r, c+1)]
+                                   if 0 <= nr < size and 0 <= nc < size])
+        self.clear()
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Build a tracker holding every filled cell of a NumPy grid.
+
+        Args:
+            grid (numpy.ndarray): Grid with 0=black, 1=white, 2=empty
+
+        Returns:
+            ConnectivityTracker: Tracker for the grid
+        """
+        tracker = cls(grid.shape[0])
+        for i, color in enumerate(grid.ravel().tolist()):
+            if color != 2:
+                tracker.place(i, color)
+        return tracker
+
+    def clear(self):
+        """Reset to an empty board."""
+        self.forests = [RollbackUnionFind(self.cells), RollbackUnionFind(self.cells)]  # One per color
+        self.colors = [2] * self.cells
+        self.components = [0, 0]  # Number of connected groups per color
+        self.counts = [0, 0]  # Number of cells per color
+        self.trail = []  # (cell, unions made) per placement
+
+    def load(self, black, white):
+        """
+        Reset to the state described by a bitboard pair.
+
+        Args:
+            black, white (int): Bitboard masks for each color
+        """
+        self.clear()
+        for i in range(self.cells):
+            if black >> i & 1:
+                self.place(i, 0)
+            elif white >> i & 1:
+                self.place(i, 1)
+
+    def place(self, i, color):
+        """
+        Fill an empty cell and merge it with its same-colored neighbors.
+
+        Args:
+            i (int): Bit index of the cell
+            color (int): Color placed (0=black, 1=white)
+        """
+        forest = self.forests[color]
+        colors = self.colors
+        colors[i] = color
+        merges = 0
+        unions = 0
+        for j in self.neighbors[i]:
+            if colors[j] == color:
+                unions += 1
+                if forest.union(i, j):
+                    merges += 1
+        self.components[color] += 1 - merges
+        self.counts[color] += 1
+        self.trail.append((i, unions, merges))
+
+    def undo(self):
+        """Undo the most recent place() call."""
+        i, unions, merges = self.trail.pop()
+        color = self.colors[i]
+        forest = self.forests[color]
+        for _ in range(unions):
+            forest.rollback()
+        self.components[color] -= 1 - merges
+        self.counts[color] -= 1
+        self.colors[i] = 2
+
+    def is_connected(self, color):
+        """Return True if the cells of color form at most one connected group."""
+        return self.components[color] <= 1
+
+    def same_group(self, i, j):
+        """Return True if cells i and j hold the same color and are connected."""
+        color = self.colors[i]
+        return color != 2 and color == self.colors[j] and \
+            self.forests[color].find(i) == self.forests[color].find(j)
+
+    def regions(self, color):
+        """
+        List the connected groups of a color.
+
+        Args:
+            color (int): Color to group (0=black, 1=white)
+
+        Returns:
+            list: One set of (row, col) tuples per group, in row-major order of first cell
+        """
+        forest = self.forests[color]
+        groups = {}
+        for i, cell_color in enumerate(self.colors):
+            if cell_color == color:
+                groups.setdefault(forest.find(i), set()).add(divmod(i, self.size))
+        return list(groups.values())
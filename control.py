@@ -0,0 +1,102 @@
+import threading
+import time
+
+# Cooperative control of a running search.
+# The solver calls step() once per explored state. It returns a reason as soon as the
+# search should stop: a cancel() from another thread, or an exhausted time or node
+# budget. Between those checks it also sends throttled progress reports to a callback,
+# so a UI or service can follow a search that runs in another thread. Searches in
+# several processes can share one node budget through a shared counter.
+
+CANCELLED = "cancelled"
+TIME_LIMIT = "time limit"
+NODE_LIMIT = "node limit"
+
+
+class SearchControl:
+    def __init__(self, max_time=None, max_nodes=None, progress=None, progress_interval=0.1,
+                 cancel_event=None, shared_nodes=None):
+        """
+        Create a control with optional budgets.
+
+        Args:
+            max_time (float, optional): Seconds a search may run
+            max_nodes (int, optional): States a search may explore
+            progress (callable, optional): Called with a dict of progress values
+                (nodes, depth, frontier, best_heuristic, elapsed)
+            progress_interval (float): Minimum seconds between progress reports
+            cancel_event (optional): Event shared with other threads or processes that
+                cancels the search when set; a private threading.Event by default
+            shared_nodes (optional): multiprocessing.Value counter shared with other
+                processes; every step is added to it and max_nodes applies to its total
+        """
+        self.max_time = max_time
+        self.max_nodes = max_nodes
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.cancelled = cancel_event if cancel_event is not None else threading.Event()
+        self.shared_nodes = shared_nodes
+        self.start()
+
+    def start(self):
+        """Start the clock for a new search. A pending cancel() stays in effect."""
+        self.started = time.monotonic()
+        self.deadline = self.started + self.max_time if self.max_time else None
+        self.next_report = self.started
+
+    def cancel(self):
+        """Ask the search to stop; safe to call from any thread or process sharing the event."""
+        self.cancelled.set()
+
+    def remaining(self):
+        """Return the seconds left of the time budget, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 1e-6)  # 0 would mean no limit
+
+    def poll(self):
+        """
+        Check cancellation and the time budget without counting a state.
+
+        Returns:
+            str: Reason to stop, or None to continue
+        """
+        if self.cancelled.is_set():
+            return CANCELLED
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return TIME_LIMIT
+        return None
+
+    def step(self, nodes, depth=0, frontier=0, best_heuristic=None):
+        """
+        Account for an explored state.
+
+        Args:
+            nodes (int): States explored so far, including this one; ignored when the
+                control counts in a shared counter
+            depth (int): Depth of the state in the search tree
+            frontier (int): Size of the stack or queue
+            best_heuristic (optional): Best heuristic value of the search so far
+
+        Returns:
+            str: Reason to stop, or None to continue
+        """
+        if self.cancelled.is_set():
+            return CANCELLED
+        if self.shared_nodes is not None:
+            with self.shared_nodes.get_lock():
+                self.shared_nodes.value += 1
+                nodes = self.shared_nodes.value
+        if self.max_nodes and nodes >= self.max_nodes:
+            return NODE_LIMIT
+        if self.deadline is None and self.progress is None:
+            return None
+
+        now = time.monotonic()
+        if self.deadline is not None and now >= self.deadline:
+            return TIME_LIMIT
+        if self.progress is not None and now >= self.next_report:
+            self.next_report = now + self.progress_interval
+            self.progress({"nodes": nodes, "depth": depth, "frontier": frontier,
+                           "best_heuristic": best_heuristic, "elapsed": now - self.started})
+        return None
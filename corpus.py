@@ -0,0 +1,228 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+import numpy as np
+from puzzle_io import pack_puzzle, read_puzzles, unpack_puzzle
+
+# Memory-mapped puzzle corpora.
+# A corpus (.yyc) stores the same 2-bit records as the binary puzzle format, followed
+# by an index with the offset of every record:
+#
+#     header   magic b"YYC1", version (2 bytes), flags (2 bytes),
+#              puzzle count (8 bytes), index offset (8 bytes), all little-endian
+#     records  per puzzle: size (2 bytes) and the packed cells
+#     index    one 8-byte offset per puzzle
+#
+# A Corpus maps the file read-only, so the Nth puzzle is decoded in O(1) without
+# reading anything else. Pages of the map are shared between processes that open the
+# same file, and a Corpus is pickled as its path, so pool workers can receive one cheaply:
+#
+#     python -m corpus build puzzles.yyc levels.txt generated/
+#     python -m corpus info puzzles.yyc
+
+MAGIC = b"YYC1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQ")
+EXTENSION = ".yyc"
+
+
+def is_corpus(path):
+    """Return True if a file starts with the corpus magic bytes."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class CorpusWriter:
+    def __init__(self, path):
+        """
+        Create a corpus file and append puzzles to it one at a time.
+        The index is written when the writer is closed.
+
+        Args:
+            path (str): File to create
+        """
+        self.file = open(path, "wb")
+        self.offsets = array("Q")
+        self.file.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))  # Completed by close()
+
+    def write(self, grid):
+        """
+        Append a puzzle.
+
+        Args:
+            grid: Square 2D array-like with 0=black, 1=white, 2=empty
+        """
+        self.offsets.append(self.file.tell())
+        self.file.write(pack_puzzle(grid))
+
+    def close(self):
+        """Write the index, complete the header and close the file."""
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        if sys.byteorder != "little":
+            self.offsets.byteswap()
+        self.offsets.tofile(self.file)
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, 0, len(self.offsets), index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_corpus(path, puzzles):
+    """
+    Write a corpus from an iterable of grids.
+
+    Args:
+        path (str): File to create
+        puzzles: Iterable of grids
+
+    Returns:
+        int: Number of puzzles written
+    """
+    with CorpusWriter(path) as writer:
+        for grid in puzzles:
+            writer.write(grid)
+        return len(writer.offsets)
+
+
+class Corpus:
+    def __init__(self, path):
+        """
+        Open a corpus for random access.
+
+        Args:
+            path (str): Corpus file
+
+        Raises:
+            ValueError: If the file is not a corpus or its index is damaged
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.map) < HEADER.size:
+            raise ValueError(f"{self.path} is not a puzzle corpus")
+        magic, version, _, count, index_offset = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} puzzle corpus")
+        if index_offset + 8 * count > len(self.map):
+            raise ValueError(f"{self.path} has a truncated index")
+        # A view of the mapped index, not a copy
+        self.offsets = np.frombuffer(self.map, dtype="<u8", count=count, offset=index_offset)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, n):
+        """
+        Decode the Nth puzzle.
+
+        Args:
+            n (int): Position of the puzzle, negative values count from the end
+
+        Returns:
+            numpy.ndarray: The puzzle grid
+
+        Raises:
+            IndexError: If there is no such puzzle
+        """
+        if not -len(self) <= n < len(self):
+            raise IndexError(f"Corpus has {len(self)} puzzles, no puzzle {n}")
+        offset = int(self.offsets[n])
+        size = int.from_bytes(self.map[offset:offset + 2], "little")
+        data = memoryview(self.map)[offset + 2:offset + 2 + (size * size + 3) // 4]
+        try:
+            return unpack_puzzle(size, data)
+        finally:
+            data.release()  # The map cannot be closed while a view of it is alive
+
+    def __iter__(self):
+        for n in range(len(self)):
+            yield self[n]
+
+    def board(self, n):
+        """Create a Board from the Nth puzzle."""
+        from board import Board  # Imported here since board reads corpora through this module
+        return Board.from_grid(self[n])
+
+    def close(self):
+        """Unmap the file. Grids already returned stay valid."""
+        self.offsets = np.zeros(0, dtype="<u8")  # Drop the view so the map can be closed
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # Each process maps the file itself and shares the pages through the OS
+        return self.path
+
+    def __setstate__(self, path):
+        self.__init__(path)
+
+
+def _iter_grids(sources):
+    """Read the puzzles of files and directories (every file in name order)."""
+    for source in sources:
+        if os.path.isdir(source):
+            paths = [os.path.join(source, name) for name in sorted(os.listdir(source)) if not name.startswith(".")]
+        else:
+            paths = [source]
+        for path in paths:
+            if os.path.isfile(path):
+                for _, grid in read_puzzles(path):
+                    yield grid
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:]
+
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m corpus", description="Build and inspect puzzle corpora.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Pack puzzle files or directories into a corpus")
+    build.add_argument("output", help="Corpus file to create")
+    build.add_argument("sources", nargs="+", help="Puzzle files or directories in any puzzle_io format")
+    info = commands.add_parser("info", help="Describe a corpus")
+    info.add_argument("corpus", help="Corpus file")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        try:
+            count = write_corpus(args.output, _iter_grids(args.sources))
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Wrote {count} puzzles to {args.output}")
+        return 0
+
+    with Corpus(args.corpus) as corpus:
+        sizes = {}
+        for offset in corpus.offsets:
+            size = int.from_bytes(corpus.map[int(offset):int(offset) + 2], "little")
+            sizes[size] = sizes.get(size, 0) + 1
+        print(f"{args.corpus}: {len(corpus)} puzzles, {len(corpus.map)} bytes")
+        for size, count in sorted(sizes.items()):
+            print(f"  {size}x{size}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
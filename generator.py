@@ -0,0 +1,399 @@
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import config
+from bitboard import BitBoard
+from board import Board
+from control import SearchControl
+from rules import are_solutions
+from tracing import OFF, Tracer
+
+# Puzzle generation.
+# Random solutions start from a random maze, which is valid by construction, and are
+# then shuffled by a random walk that flips single cells and keeps a flip only when the
+# board still obeys every rule. The walk never leaves the set of solutions, so no
+# search is needed and the cost is a few bitboard operations per flip.
+#
+# Puzzles are carved out of a random solution by removing givens in random order while
+# the solution stays unique. Uniqueness needs one search per removal: the puzzle was
+# unique before cell i was removed, so any other solution must give cell i the opposite
+# color, and the puzzle stays unique exactly when that color cannot be completed.
+# Difficulty is the number of DFS states a solve of the finished puzzle needs (0 when
+# constraint propagation alone fills the board), and can be bounded from both sides:
+#
+#     python -m generator --count 1000 --size 12 --max-nodes 0 --output easy.yyc
+#     python -m generator --count 100 --size 10 --min-nodes 20 --workers 8
+
+
+def maze_solution(bitboard, rng):
+    """
+    Build a random valid solution from a maze.
+    The 2x2 windows of the board each hold exactly one cell with two odd coordinates
+    and one with two even coordinates, so coloring all of the former white and all of
+    the latter black already rules out monochrome and crossed windows. The cells in
+    between carve a random spanning tree: on odd sizes a tree of white passages joins
+    the odd cells, and on even sizes a tree of black walls joins the even cells to the
+    black top and left border. The other color fills the rest and stays connected,
+    because a tree never closes a loop around it.
+
+    Args:
+        bitboard (BitBoard): Geometry helper for the board size (at least 2)
+        rng (random.Random): Source of randomness
+
+    Returns:
+        tuple: (black, white) bitboard masks
+    """
+    n = bitboard.size
+    parity = n % 2  # Coordinate parity of the tree's nodes
+    nodes = {(r, c) for r in range(parity, n, 2) for c in range(parity, n, 2)}
+    tree = set(nodes)
+
+    if parity:
+        stack = [rng.choice(sorted(nodes))]
+    else:
+        # The border row and column are part of the black tree from the start
+        tree |= {(0, c) for c in range(n)} | {(r, 0) for r in range(n)}
+        stack = [(0, c) for c in range(0, n, 2)] + [(r, 0) for r in range(2, n, 2)]
+        rng.shuffle(stack)
+    seen = set(stack)
+
+    # Randomized depth-first search over the nodes, two cells apart
+    while stack:
+        r, c = stack[-1]
+        steps = [(r + dr, c + dc) for dr, dc in [(-2, 0), (2, 0), (0, -2), (0, 2)]
+                 if (r + dr, c + dc) in nodes and (r + dr, c + dc) not in seen]
+        if not steps:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(steps)
+        tree.add(((r + nr) // 2, (c + nc) // 2))  # Open the cell between the two nodes
+        seen.add((nr, nc))
+        stack.append((nr, nc))
+
+    mask = 0
+    for r, c in tree:
+        mask |= 1 << bitboard.index(r, c)
+    if parity:
+        return bitboard.full & ~mask, mask
+    return mask, bitboard.full & ~mask
+
+
+def is_solution(bitboard, black, white):
+    """
+    Check whether a full board obeys the 2x2 and connectivity rules. This is the move
+    test of the random walk, done on bitboards; finished puzzles are checked in batches
+    by verify_puzzles.
+
+    Args:
+        bitboard (BitBoard): Geometry helper for the board size
+        black, white (int): Bitboard masks of a full board
+
+    Returns:
+        bool: True if the board is a valid solution
+    """
+    return (not bitboard.block_anchors(black) and not bitboard.block_anchors(white) and
+            not bitboard.cross_anchors(black, white) and
+            black != 0 and white != 0 and
+            bitboard.is_connected(black) and bitboard.is_connected(white))
+
+
+def random_solution(size, rng=None, flips=None):
+    """
+    Draw a random valid solution.
+
+    Args:
+        size (int): Number of rows/columns (at least 2)
+        rng (random.Random, optional): Source of randomness
+        flips (int, optional): Flip attempts of the random walk, 20 per cell by default
+
+    Returns:
+        tuple: (black, white) bitboard masks
+    """
+    rng = rng or random.Random()
+    bitboard = BitBoard(size)
+    black, white = maze_solution(bitboard, rng)
+    if flips is None:
+        flips = 20 * bitboard.cells
+    for _ in range(flips):
+        bit = 1 << rng.randrange(bitboard.cells)
+        new_black, new_white = black ^ bit, white ^ bit
+        if is_solution(bitboard, new_black, new_white):
+            black, white = new_black, new_white
+    return black, white
+
+
+class GeneratedPuzzle:
+    def __init__(self, grid, solution, nodes):
+        """
+        A puzzle with a unique solution.
+
+        Args:
+            grid (numpy.ndarray): Puzzle with 0=black, 1=white, 2=empty
+            solution (numpy.ndarray): Its only solution
+            nodes (int): DFS states a solve needs; 0 if propagation alone solves it
+        """
+        self.grid = grid
+        self.solution = solution
+        self.nodes = nodes
+        self.givens = int((grid != 2).sum())
+
+
+class PuzzleGenerator:
+    def __init__(self, size, rng=None, min_nodes=0, max_nodes=None, search_limit=None):
+        """
+        Prepare to generate puzzles of one size.
+
+        Args:
+            size (int): Number of rows/columns (at least 2)
+            rng (random.Random, optional): Source of randomness
+            min_nodes (int): Least DFS states a solve of a generated puzzle must need
+            max_nodes (int, optional): Most DFS states a solve may need; 0 keeps only
+                puzzles solved by propagation alone
+            search_limit (int, optional): States a single uniqueness check may explore
+                before the given is kept as undecided (config.GENERATOR_SEARCH_LIMIT by default)
+        """
+        from solver import Solver  # Imported here so benchmark can use random_solution without it
+
+        self.bitboard = BitBoard(size)
+        self.rng = rng or random.Random()
+        self.min_nodes = min_nodes
+        self.max_nodes = max_nodes
+        # One solver serves every search; only its bitboard helpers and DFS are used
+        self.solver = Solver(Board.from_grid(np.full((size, size), 2)), set(), Tracer(OFF))
+        self.solver.control = SearchControl(max_nodes=search_limit or config.GENERATOR_SEARCH_LIMIT)
+
+    def _search(self, black, white):
+        """
+        Look for a solution that extends a state.
+
+        Args:
+            black, white (int): Bitboard masks of the givens
+
+        Returns:
+            tuple: (status, states explored) where status is SOLVED, EXHAUSTED or the
+                control's reason to stop; 0 states means propagation decided the state
+        """
+        from solver import SOLVED, EXHAUSTED
+
+        solver = self.solver
+        settled = solver.propagator.propagate(black, white)
+        if settled is None:
+            return EXHAUSTED, 0
+        black, white = settled
+        if black | white == self.bitboard.full:
+            return (SOLVED if solver._is_solution_bits(black, white) else EXHAUSTED), 0
+        if solver.regions.is_dead(black, white):
+            return EXHAUSTED, 0
+        solver.control.start()
+        status, _, states_explored = solver._dfs_search(black, white)
+        return status, states_explored
+
+    def _removable(self, black, white, i, solution_black):
+        """
+        Check whether a given can be removed from a unique puzzle.
+
+        Args:
+            black, white (int): Givens without cell i
+            i (int): Bit index of the removed given
+            solution_black (int): Black mask of the solution
+
+        Returns:
+            bool: True if the puzzle stays unique and within max_nodes
+        """
+        from solver import EXHAUSTED
+
+        if self.max_nodes == 0:
+            # Propagation alone must still fill the board, which also proves uniqueness
+            settled = self.solver.propagator.propagate(black, white)
+            return settled is not None and settled[0] | settled[1] == self.bitboard.full
+
+        bit = 1 << i
+        other = 1 if solution_black & bit else 0
+        if not self.solver._is_valid_bits(black, white, i, other):
+            status = EXHAUSTED  # The opposite color breaks a rule right away
+        elif other:
+            status, _ = self._search(black, white | bit)
+        else:
+            status, _ = self._search(black | bit, white)
+        if status != EXHAUSTED:
+            return False  # Another solution exists, or the check ran out of budget
+        if self.max_nodes is None:
+            return True
+        _, nodes = self._search(black, white)
+        return nodes <= self.max_nodes
+
+    def carve(self, black, white):
+        """
+        Remove givens from a solution in random order while it stays unique.
+        The last given of each color is always kept.
+
+        Args:
+            black, white (int): Bitboard masks of a full solution
+
+        Returns:
+            GeneratedPuzzle: The carved puzzle and the states its solve needs
+        """
+        solution_black, solution_white = black, white
+        cells = list(range(self.bitboard.cells))
+        self.rng.shuffle(cells)
+        for i in cells:
+            bit = 1 << i
+            if bit & black and (black & ~bit) == 0 or bit & white and (white & ~bit) == 0:
+                continue
+            if self._removable(black & ~bit, white & ~bit, i, solution_black):
+                black &= ~bit
+                white &= ~bit
+
+        _, nodes = self._search(black, white)
+        return GeneratedPuzzle(self.bitboard.to_grid(black, white),
+                               self.bitboard.to_grid(solution_black, solution_white), nodes)
+
+    def generate(self, attempts=100):
+        """
+        Generate a puzzle within the difficulty bounds.
+
+        Args:
+            attempts (int): Random solutions to try before giving up
+
+        Returns:
+            GeneratedPuzzle: A puzzle with a unique solution
+
+        Raises:
+            RuntimeError: If no attempt met min_nodes
+        """
+        for _ in range(attempts):
+            black, white = random_solution(self.bitboard.size, self.rng)
+            puzzle = self.carve(black, white)
+            if puzzle.nodes >= self.min_nodes:
+                return puzzle
+        raise RuntimeError(f"No puzzle needing at least {self.min_nodes} states in {attempts} attempts")
+
+
+def verify_puzzles(puzzles):
+    """
+    Check a batch of generated puzzles in one pass: every solution must obey the rules
+    and keep the givens of its puzzle.
+
+    Args:
+        puzzles (list): GeneratedPuzzle objects of one size
+
+    Returns:
+        list: The same puzzles
+
+    Raises:
+        RuntimeError: If a puzzle does not match its solution
+    """
+    if puzzles:
+        valid = are_solutions(np.stack([p.solution for p in puzzles]), np.stack([p.grid for p in puzzles]))
+        if not valid.all():
+            raise RuntimeError(f"{int((~valid).sum())} generated puzzles do not match their solutions")
+    return puzzles
+
+
+_generators = {}  # PuzzleGenerator per settings, reused by the tasks of a pool process
+
+
+def _generate_task(size, seed, min_nodes, max_nodes):
+    """Generate one puzzle inside a pool process."""
+    key = (size, min_nodes, max_nodes)
+    if key not in _generators:
+        _generators[key] = PuzzleGenerator(size, min_nodes=min_nodes, max_nodes=max_nodes)
+    generator = _generators[key]
+    generator.rng = random.Random(seed)
+    return generator.generate()
+
+
+def generate_puzzles(count, size, workers=None, seed=None, min_nodes=0, max_nodes=None):
+    """
+    Generate puzzles in a process pool.
+
+    Args:
+        count (int): Number of puzzles
+        size (int): Number of rows/columns
+        workers (int, optional): Pool size (the CPU count by default); 1 generates in this process
+        seed (int, optional): Makes the sequence of puzzles reproducible
+        min_nodes (int): Least DFS states a solve of each puzzle must need
+        max_nodes (int, optional): Most DFS states a solve of each puzzle may need
+
+    Yields:
+        GeneratedPuzzle: One per puzzle, in the order they finish, each verified against
+            its solution
+
+    Raises:
+        RuntimeError: If a generated puzzle does not match its solution
+    """
+    master = random.Random(seed)
+    seeds = (master.getrandbits(64) for _ in range(count))
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        for task_seed in seeds:
+            yield from verify_puzzles([_generate_task(size, task_seed, min_nodes, max_nodes)])
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = set()
+        for task_seed in seeds:
+            pending.add(pool.submit(_generate_task, size, task_seed, min_nodes, max_nodes))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from verify_puzzles([future.result() for future in done])
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from verify_puzzles([future.result() for future in done])
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:]
+
+    Returns:
+        int: Exit status
+    """
+    from corpus import EXTENSION, CorpusWriter
+    from puzzle_io import PuzzleWriter, format_puzzle
+
+    parser = argparse.ArgumentParser(prog="python -m generator", description="Generate Yin-Yang puzzles with unique solutions.")
+    parser.add_argument("--count", "-n", type=int, default=1, help="Number of puzzles (default: 1)")
+    parser.add_argument("--size", type=int, default=10, help="Number of rows/columns (default: 10)")
+    parser.add_argument("--min-nodes", type=int, default=0, help="Least DFS states a solve must need")
+    parser.add_argument("--max-nodes", type=int, help="Most DFS states a solve may need (0 = propagation only)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output")
+    parser.add_argument("--workers", "-j", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--output", "-o", help="Write to a puzzle file (.txt, .yyb) or corpus (.yyc) instead of stdout")
+    args = parser.parse_args(argv)
+    if args.size < 2:
+        parser.error("--size must be at least 2")
+
+    writer = None
+    if args.output:
+        writer = CorpusWriter(args.output) if args.output.endswith(EXTENSION) else PuzzleWriter(args.output)
+    start = time.perf_counter()
+    try:
+        puzzles = generate_puzzles(args.count, args.size, args.workers, args.seed, args.min_nodes, args.max_nodes)
+        for number, puzzle in enumerate(puzzles, 1):
+            if writer is None:
+                print(format_puzzle(puzzle.grid, f"{number}: {puzzle.givens} givens, {puzzle.nodes} states") + "\n")
+            else:
+                writer.write(puzzle.grid)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{args.count} puzzles in {elapsed:.3f}s ({60 * args.count / elapsed if elapsed else 0:.0f}/min)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
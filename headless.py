@@ -0,0 +1,237 @@
+import argparse
+import json
+import sys
+import time
+from board import Board, PUZZLE_LEVELS
+from puzzle_io import parse_puzzle
+from rules import are_solutions
+from solver import Solver
+from control import SearchControl
+from tracing import OFF, Tracer, default_tracer
+
+# Headless solving without pygame.
+# Solves a puzzle with any of the solver modes and reports the solution and statistics,
+# either from Python through solve_grid/solve_level or from the command line:
+#
+#     python -m headless --level 6 --algorithm dfs
+#     python -m headless puzzle.txt --algorithm sat --json
+#     python -m headless puzzle.txt --count-solutions 2
+#
+# Puzzle files can be in any format read by puzzle_io; the first puzzle of the file is
+# solved. Rows of 0=black, 1=white, 2=empty digits are accepted as well.
+
+# Command-line names of the solver modes and the Solver methods that implement them
+ALGORITHMS = {
+    "dfs": "dfs_solve",
+    "bfs": "bfs_solve",
+    "bfs-layered": "layered_bfs_solve",
+    "astar": "a_star_solve",
+    "idastar": "ida_star_solve",
+    "sat": "sat_solve",
+    "parallel-dfs": "parallel_dfs_solve",
+    "portfolio": "portfolio_solve",
+}
+
+
+class SolveResult:
+    def __init__(self, algorithm, solved, grid, elapsed, stats):
+        """
+        Outcome of a headless solve.
+
+        Args:
+            algorithm (str): Name of the solver mode that was used
+            solved (bool): True if a valid solution was found
+            grid (numpy.ndarray): Final grid, the solution when solved is True
+            elapsed (float): Wall-clock solve time in seconds
+            stats (dict): Counters reported by the solver, e.g. states_explored
+        """
+        self.algorithm = algorithm
+        self.solved = solved
+        self.grid = grid
+        self.elapsed = elapsed
+        self.stats = stats
+
+    def to_dict(self):
+        """Return the result as a JSON-serializable dictionary."""
+        return {
+            "algorithm": self.algorithm,
+            "solved": self.solved,
+            "grid": self.grid.tolist(),
+            "elapsed": self.elapsed,
+            "stats": self.stats,
+        }
+
+
+def solve_board(board, algorithm="dfs", verbose=False, max_time=None, max_nodes=None):
+    """
+    Solve a Board in place with one of the solver modes.
+
+    Args:
+        board (Board): Board to solve; its grid receives the solution
+        algorithm (str): One of the keys of ALGORITHMS
+        verbose (bool): Print the solver log to stdout
+        max_time (float, optional): Give up after this many seconds
+        max_nodes (int, optional): Give up after exploring this many states
+
+    Returns:
+        SolveResult: Solution and statistics; stats["stopped"] tells why a search gave up
+
+    Raises:
+        ValueError: If the algorithm is unknown
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm} (choose from {', '.join(ALGORITHMS)})")
+    fixed_cells = {(r, c) for r in range(board.size) for c in range(board.size) if board.grid[r, c] != 2}
+    puzzle = board.grid.copy()
+    solver = Solver(board, fixed_cells, default_tracer() if verbose else Tracer(OFF))
+    if max_time or max_nodes:
+        solver.control = SearchControl(max_time, max_nodes)
+
+    start = time.perf_counter()
+    result = getattr(solver, ALGORITHMS[algorithm])()
+    elapsed = time.perf_counter() - start
+
+    # Only report success for a grid that really passes the rules and keeps the givens
+    solved = bool(result) and bool(are_solutions(board.grid[None], puzzle[None])[0])
+    return SolveResult(algorithm, solved, board.grid.copy(), elapsed, dict(solver.stats))
+
+
+def solve_grid(grid, algorithm="dfs", verbose=False, max_time=None, max_nodes=None):
+    """
+    Solve a puzzle given as a grid.
+
+    Args:
+        grid: Square 2D array-like with 0=black, 1=white, 2=empty
+        algorithm (str): One of the keys of ALGORITHMS
+        verbose (bool): Print the solver log to stdout
+        max_time (float, optional): Give up after this many seconds
+        max_nodes (int, optional): Give up after exploring this many states
+
+    Returns:
+        SolveResult: Solution and statistics
+    """
+    return solve_board(Board.from_grid(grid), algorithm, verbose, max_time, max_nodes)
+
+
+def solve_level(level, algorithm="dfs", verbose=False, max_time=None, max_nodes=None):
+    """
+    Solve one of the predefined levels.
+
+    Args:
+        level (int): Key of board.PUZZLE_LEVELS
+        algorithm (str): One of the keys of ALGORITHMS
+        verbose (bool): Print the solver log to stdout
+        max_time (float, optional): Give up after this many seconds
+        max_nodes (int, optional): Give up after exploring this many states
+
+    Returns:
+        SolveResult: Solution and statistics
+    """
+    return solve_board(Board(level), algorithm, verbose, max_time, max_nodes)
+
+
+def count_solutions(grid, limit=None, max_time=None, max_nodes=None):
+    """
+    Count the solutions of a puzzle given as a grid.
+
+    Args:
+        grid: Square 2D array-like with 0=black, 1=white, 2=empty
+        limit (int, optional): Stop at this many solutions; 2 checks uniqueness
+        max_time (float, optional): Give up after this many seconds
+        max_nodes (int, optional): Give up after exploring this many states
+
+    Returns:
+        tuple: (number of solutions found, stats dict); stats["stopped"] is set when a
+            budget ran out before the count was complete
+    """
+    board = Board.from_grid(grid)
+    fixed_cells = {(r, c) for r in range(board.size) for c in range(board.size) if board.grid[r, c] != 2}
+    solver = Solver(board, fixed_cells, Tracer(OFF))
+    if max_time or max_nodes:
+        solver.control = SearchControl(max_time, max_nodes)
+    count = solver.count_solutions(limit)
+    return count, dict(solver.stats)
+
+
+def parse_grid(text):
+    """
+    Parse a puzzle written as rows of 0/1/2 digits or B/W/. characters.
+
+    Args:
+        text (str): Puzzle text; blank lines and spaces are ignored
+
+    Returns:
+        numpy.ndarray: The parsed grid
+
+    Raises:
+        ValueError: If a character is not a cell value or the rows differ in length
+    """
+    return parse_puzzle(text)
+
+
+def format_grid(grid):
+    """Format a grid as rows of 0/1/2 digits, the same layout parse_grid reads."""
+    return "\n".join("".join(str(v) for v in row) for row in grid.tolist())
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:]
+
+    Returns:
+        int: Exit status, 0 when the puzzle was solved (or has exactly one solution when
+            counting) and 1 otherwise
+    """
+    parser = argparse.ArgumentParser(prog="python -m headless", description="Solve a Yin-Yang puzzle without a display.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("puzzle", nargs="?", help="Puzzle file (text or .yyb binary), or - for text on stdin")
+    source.add_argument("--level", type=int, choices=sorted(PUZZLE_LEVELS), help="Solve a predefined level")
+    parser.add_argument("--algorithm", "-a", choices=list(ALGORITHMS), default="dfs", help="Solver mode (default: dfs)")
+    parser.add_argument("--max-time", type=float, help="Give up after this many seconds")
+    parser.add_argument("--max-nodes", type=int, help="Give up after exploring this many states")
+    parser.add_argument("--count-solutions", type=int, nargs="?", const=0, metavar="LIMIT",
+                        help="Count the solutions instead of solving, stopping at LIMIT if given (2 checks uniqueness)")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show the solver's progress log")
+    args = parser.parse_args(argv)
+
+    if args.level is not None:
+        board = Board(args.level)
+    else:
+        try:
+            if args.puzzle == "-":
+                board = Board.from_grid(parse_grid(sys.stdin.read()))
+            else:
+                board = Board.from_file(args.puzzle)
+        except (ValueError, IndexError) as e:
+            parser.error(str(e))
+
+    if args.count_solutions is not None:
+        count, stats = count_solutions(board.grid, args.count_solutions or None, args.max_time, args.max_nodes)
+        if args.json:
+            print(json.dumps({"solutions": count, "limit": args.count_solutions or None, "stats": stats}))
+        else:
+            # A count cut short by the limit or a budget is only a lower bound
+            partial = "stopped" in stats or (args.count_solutions and count >= args.count_solutions)
+            print(f"solutions: {count}{'+' if partial else ''}")
+            for key, value in stats.items():
+                if key != "solutions":
+                    print(f"{key}: {value}")
+        return 0 if count == 1 else 1
+
+    result = solve_board(board, args.algorithm, args.verbose, args.max_time, args.max_nodes)
+    if args.json:
+        print(json.dumps(result.to_dict()))
+    else:
+        print(format_grid(result.grid))
+        print(f"solved: {result.solved}, algorithm: {result.algorithm}, time: {result.elapsed:.3f}s")
+        for key, value in result.stats.items():
+            print(f"{key}: {value}")
+    return 0 if result.solved else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+from collections import namedtuple
+
+# Incremental heuristic for A*.
+# The score is the one of Solver.calculate_heuristic: empty cells, monochrome 2x2 windows,
+# disconnected colors, bounded regions, color imbalance and checkerboard windows. A child
+# differs from its parent only by the cells of one move (plus the cells propagation
+# forced), so its terms are derived from the parent's terms and those added cells:
+#   - empty cells and balance follow from the number of added cells of each color
+#   - new 2x2 and checkerboard windows can only appear around added cells, and are
+#     found with a few word-parallel mask operations
+#   - a connected color stays connected if every added cell of that color attaches to
+#     it, which is checked by growing from the old cells through the added cells only;
+#     only a color that was already split needs a full flood fill
+#   - bounded regions are known from the expansion, which only keeps unbounded children
+
+# Terms of a state's score; the weights are applied by HeuristicEngine.score
+HeuristicTerms = namedtuple("HeuristicTerms", "empty blocks black_connected white_connected bounded balance cross")
+
+
+class HeuristicEngine:
+    def __init__(self, bitboard, regions):
+        """
+        Create an engine for one board size.
+
+        Args:
+            bitboard (BitBoard): Geometry helper for the board size
+            regions (DeadRegionDetector): Used when a state's bounded regions are unknown
+        """
+        self.bitboard = bitboard
+        self.regions = regions
+
+    def score(self, terms):
+        """Combine terms into the heuristic value (lower is better)."""
+        return (terms.empty + terms.blocks * 10 +
+                (0 if terms.black_connected else 20) + (0 if terms.white_connected else 20) +
+                (50 if terms.bounded else 0) + abs(terms.balance) + (15 if terms.cross else 0))
+
+    def evaluate(self, black, white):
+        """
+        Compute the terms of a state from scratch.
+
+        Args:
+            black, white (int): Bitboard masks of the state
+
+        Returns:
+            tuple: (heuristic value, HeuristicTerms)
+        """
+        bb = self.bitboard
+        terms = HeuristicTerms(
+            empty=(bb.full & ~(black | white)).bit_count(),
+            blocks=bb.window_cells(bb.block_anchors(black) | bb.block_anchors(white)).bit_count(),
+            black_connected=bb.is_connected(black),
+            white_connected=bb.is_connected(white),
+            bounded=self.regions.is_dead(black, white),
+            balance=black.bit_count() - white.bit_count(),
+            cross=bool(bb.cross_anchors(black, white)),
+        )
+        return self.score(terms), terms
+
+    def child(self, terms, black, white, new_black, new_white, bounded=False):
+        """
+        Derive the terms of a child state from its parent's.
+
+        Args:
+            terms (HeuristicTerms): Terms of the parent state
+            black, white (int): Bitboard masks of the parent state
+            new_black, new_white (int): Bitboard masks of the child, a superset of the parent
+            bounded (bool, optional): Whether the child has bounded regions; None to check
+
+        Returns:
+            tuple: (heuristic value, HeuristicTerms) of the child
+        """
+        bb = self.bitboard
+        added_black = new_black & ~black
+        added_white = new_white & ~white
+        added = added_black | added_white
+
+        # Windows only ever gain cells, so new 2x2 and checkerboard windows touch an added cell
+        n = bb.size
+        near = (added | (added >> 1) | (added >> n) | (added >> (n + 1))) & bb.anchors
+        blocks = terms.blocks
+        if (bb.block_anchors(new_black) | bb.block_anchors(new_white)) & near:
+            blocks = bb.window_cells(bb.block_anchors(new_black) | bb.block_anchors(new_white)).bit_count()
+
+        child = HeuristicTerms(
+            empty=terms.empty - added.bit_count(),
+            blocks=blocks,
+            black_connected=self._stays_connected(terms.black_connected, black, added_black),
+            white_connected=self._stays_connected(terms.white_connected, white, added_white),
+            bounded=self.regions.is_dead(new_black, new_white) if bounded is None else bounded,
+            balance=terms.balance + added_black.bit_count() - added_white.bit_count(),
+            cross=terms.cross or bool(bb.cross_anchors(new_black, new_white) & near),
+        )
+        return self.score(child), child
+
+    def _stays_connected(self, connected, old, added):
+        """
+        Decide whether a color is connected after cells were added to it.
+
+        Args:
+            connected (bool): Whether the old cells were connected
+            old (int): Cells of the color before the move
+            added (int): Cells of the color added by the move
+
+        Returns:
+            bool: True if old | added is a single group (or empty)
+        """
+        bb = self.bitboard
+        if not added:
+            return connected
+        if not connected:
+            return bb.is_connected(old | added)  # The move may have joined the groups
+        if not old:
+            return bb.is_connected(added)
+
+        # Attach added cells to the group one ring at a time; usually a single step
+        reached = old
+        while added:
+            grown = added & bb.neighbors(reached)
+            if not grown:
+                return False
+            reached |= grown
+            added &= ~grown
+        return True
@@ -0,0 +1,113 @@
+import numpy as np
+from rules import block_windows, cross_windows
+
+# Array helpers for level-synchronous BFS.
+# A BFS layer is a uint8 array of shape (L, n * n), one board per row with 0=black,
+# 1=white, 2=empty. A whole layer is expanded at once: every board gets its most
+# constrained empty cell filled with both colors, the 2x2 and checkerboard rules are
+# applied to all children together, and duplicate boards are removed with np.unique.
+# Only the survivors are handed to the scalar propagation and dead-region checks.
+
+
+def select_cells(layer, size):
+    """
+    Pick the most constrained empty cell of every board, like Solver._select_cell:
+    the one with the most filled neighbors, ties going to the first in row-major order.
+
+    Args:
+        layer (numpy.ndarray): Boards of shape (L, size * size)
+        size (int): Number of rows/columns
+
+    Returns:
+        numpy.ndarray: Cell index per board; boards must not be full
+    """
+    grids = layer.reshape(-1, size, size)
+    filled = (grids != 2).astype(np.int8)
+    counts = np.zeros_like(filled)
+    counts[:, 1:, :] += filled[:, :-1, :]
+    counts[:, :-1, :] += filled[:, 1:, :]
+    counts[:, :, 1:] += filled[:, :, :-1]
+    counts[:, :, :-1] += filled[:, :, 1:]
+    counts[filled.astype(bool)] = -1  # Filled cells are never chosen
+    return counts.reshape(len(layer), -1).argmax(axis=1)
+
+
+def expand_layer(layer, size):
+    """
+    Generate the children of every board and drop those that complete a monochrome
+    2x2 window or a 2x2 checkerboard.
+
+    Args:
+        layer (numpy.ndarray): Boards of shape (L, size * size), none of them full
+        size (int): Number of rows/columns
+
+    Returns:
+        tuple: (children, cells) with the valid children, black children of the layer
+            first, and the cell that was filled in each of them
+    """
+    cells = select_cells(layer, size)
+    rows = np.arange(len(layer))
+    children = np.concatenate([layer, layer])
+    children[rows, cells] = 0
+    children[rows + len(layer), cells] = 1
+    cells = np.concatenate([cells, cells])
+
+    grids = children.reshape(-1, size, size)
+    valid = ~(block_windows(grids) | cross_windows(grids)).any(axis=(1, 2))
+    return children[valid], cells[valid]
+
+
+def unique_rows(layer):
+    """
+    Find the distinct boards of a layer.
+
+    Args:
+        layer (numpy.ndarray): Boards of shape (L, n * n)
+
+    Returns:
+        numpy.ndarray: Row index of the first copy of every distinct board, in layer order
+    """
+    if len(layer) < 2:
+        return np.arange(len(layer))
+    # Two bits per cell, so rows compare as short byte strings
+    packed = np.concatenate([np.packbits(layer == 0, axis=1), np.packbits(layer == 1, axis=1)], axis=1)
+    _, first = np.unique(packed, axis=0, return_index=True)
+    return np.sort(first)
+
+
+def to_masks(layer):
+    """
+    Convert boards to bitboard pairs.
+
+    Args:
+        layer (numpy.ndarray): Boards of shape (L, n * n)
+
+    Returns:
+        list: (black, white) masks per board, bit i being cell i
+    """
+    black = np.packbits(layer == 0, axis=1, bitorder="little")
+    white = np.packbits(layer == 1, axis=1, bitorder="little")
+    return [(int.from_bytes(b.tobytes(), "little"), int.from_bytes(w.tobytes(), "little"))
+            for b, w in zip(black, white)]
+
+
+def from_masks(states, cells):
+    """
+    Convert bitboard pairs to boards.
+
+    Args:
+        states (list): (black, white) masks per board
+        cells (int): Number of cells per board
+
+    Returns:
+        numpy.ndarray: Boards of shape (len(states), cells)
+    """
+    length = (cells + 7) // 8
+    def unpack(masks):
+        raw = np.frombuffer(b"".join(mask.to_bytes(length, "little") for mask in masks), dtype=np.uint8)
+        return np.unpackbits(raw.reshape(len(states), length), axis=1, bitorder="little")[:, :cells].astype(bool)
+
+    layer = np.full((len(states), cells), 2, dtype=np.uint8)
+    layer[unpack([black for black, _ in states])] = 0
+    layer[unpack([white for _, white in states])] = 1
+    return layer
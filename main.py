@@ -1,8 +1,4 @@
 import pygame
-from ui import main as run_ui
-
-# Initialize Pygame
-pygame.init()
 
 def main():
     """
@@ -16,8 +12,11 @@ def main():
     3. The board must be completely filled
     
     The game includes multiple levels of different difficulty and
-    three different solving algorithms: DFS, BFS, and A*.
+    four different solving algorithms: DFS, BFS, A*, and a SAT backend.
     """
+    # Initialize Pygame only when the game is started, so importing this module stays cheap
+    pygame.init()
+    from ui import main as run_ui
     run_ui()
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import config
+from board import Board
+from control import SearchControl
+from tracing import OFF, Tracer
+
+# Parallel DFS by splitting the search tree.
+# The parent assigns the first few most constrained cells in every consistent way and
+# hands each resulting state to a process pool as an independent subproblem. Subtrees
+# can be very unbalanced, so a worker that finishes its subproblem while none is queued
+# raises a shared "idle" event. A worker that has already spent DFS_SPLIT_NODES states
+# on its subproblem then stops and returns its unexplored branches, which the parent
+# queues as new subproblems for the idle workers to pick up. The workers share the
+# node budget of the whole search through a counter that every explored state is added
+# to, and get the time left of its budget, so both are enforced inside a subproblem.
+
+_solver = None  # Created in each pool process by _init_process
+_idle_event = None
+_queued = None  # Shared count of subproblems submitted but not started yet
+
+
+def _init_process(grid, cancel_event, idle_event, queued, color_order, cell_rank, max_time, max_nodes,
+                  shared_nodes):
+    """Build the solver used for every subproblem searched in a pool process."""
+    global _solver, _idle_event, _queued
+    from solver import Solver  # Imported here to avoid a circular import with solver
+
+    board = Board.from_grid(grid)
+    fixed_cells = {(r, c) for r in range(board.size) for c in range(board.size) if board.grid[r, c] != 2}
+    _solver = Solver(board, fixed_cells, Tracer(OFF))
+    _solver.control = SearchControl(max_time, max_nodes, cancel_event=cancel_event, shared_nodes=shared_nodes)
+    _solver.color_order = color_order
+    _solver.cell_rank = cell_rank
+    _idle_event = idle_event
+    _queued = queued
+
+
+def _should_split(states_explored):
+    """Split a subproblem once it has done its share of work and a worker is idle."""
+    return (states_explored >= config.DFS_SPLIT_NODES and states_explored % 64 == 0
+            and _idle_event.is_set())
+
+
+def _search_subproblem(black, white):
+    """
+    Run DFS below one state inside a pool process.
+
+    Returns:
+        tuple: (status, payload, states explored) as returned by Solver._dfs_search
+    """
+    with _queued.get_lock():
+        _queued.value -= 1
+    result = _solver._dfs_search(black, white, should_split=_should_split)
+    with _queued.get_lock():
+        if _queued.value == 0:
+            _idle_event.set()  # This worker has nothing left to pick up
+    return result
+
+
+def search_subproblems(grid, states, workers, control=None, color_order="white-first", cell_rank=None,
+                       nodes_used=0):
+    """
+    Search independent DFS subproblems in a process pool until one of them is solved.
+
+    Args:
+        grid: Puzzle grid with 0=black, 1=white, 2=empty
+        states (list): (black, white) bitboard states to search below, in DFS order
+        workers (int): Pool size
+        control (SearchControl, optional): Budgets and cancellation of the whole search;
+            it is charged with the states explored by all workers
+        color_order (str): Color order of the workers' DFS
+        cell_rank (list, optional): Tie-breaking rank of the workers' cell selection
+        nodes_used (int): States the search explored before, charged to the node budget
+
+    Returns:
+        tuple: (solution as (black, white) masks or None, stats dict with the total
+            states_explored, the number of subproblems and splits, the split_states
+            generated as new subproblems by splits, and the stop reason if the control
+            ended the search)
+    """
+    puzzle = Board.from_grid(grid).grid
+    cancel_event = multiprocessing.Event()
+    idle_event = multiprocessing.Event()
+    queued = multiprocessing.Value("q", len(states))
+    shared_nodes = multiprocessing.Value("q", nodes_used)
+    max_time = max_nodes = None
+    if control is not None:
+        max_time, max_nodes = control.remaining(), control.max_nodes
+    from solver import SOLVED, SPLIT, EXHAUSTED
+
+    solution = None
+    stats = {"states_explored": 0, "subproblems": len(states), "splits": 0, "split_states": 0,
+             "workers": workers}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_process,
+                             initargs=(puzzle.tolist(), cancel_event, idle_event, queued, color_order,
+                                       cell_rank, max_time, max_nodes, shared_nodes)) as pool:
+        pending = {pool.submit(_search_subproblem, black, white) for black, white in states}
+        if len(states) < workers:
+            idle_event.set()  # Some workers get no subproblem at all
+        while pending and solution is None and "stopped" not in stats:
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                status, payload, nodes = future.result()
+                stats["states_explored"] += nodes
+                if status == SOLVED:
+                    solution = solution or payload
+                elif status == SPLIT:
+                    stats["splits"] += 1
+                    stats["subproblems"] += len(payload)
+                    stats["split_states"] += len(payload) - 1  # Siblings; the current state was explored
+                    # The new subproblems keep the idle workers busy until they run out again
+                    with queued.get_lock():
+                        queued.value += len(payload)
+                        idle_event.clear()
+                    pending |= {pool.submit(_search_subproblem, black, white) for black, white in payload}
+                elif status != EXHAUSTED:
+                    stats["stopped"] = status
+
+            if control is not None and solution is None and "stopped" not in stats:
+                stop = control.step(shared_nodes.value, frontier=len(pending))
+                if stop:
+                    stats["stopped"] = stop
+                    break
+
+        # Stop the subproblems still searching and drop the ones that have not started
+        cancel_event.set()
+        for future in pending:
+            future.cancel()
+    if "stopped" in stats:
+        # Include the states of the subproblems that were stopped before they returned
+        stats["states_explored"] = shared_nodes.value - nodes_used
+    return solution, stats
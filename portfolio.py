@@ -0,0 +1,182 @@
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from board import Board
+from control import CANCELLED, NODE_LIMIT, TIME_LIMIT, SearchControl
+from rules import are_solutions
+from tracing import OFF, Tracer
+
+# Portfolio solving.
+# Solve times of the search modes vary wildly from puzzle to puzzle, so instead of
+# guessing which one to use, several of them run at once in a process pool on the same
+# board. The first verified solution wins and a shared event cancels the other runs.
+# Besides the different algorithms, DFS runs with different color orders and with
+# seeded tie-breaking for cell selection, which changes the shape of its search tree.
+# With fewer than two workers there is nothing to race in parallel, so the variants are
+# time-sliced in this process instead: every round restarts each remaining variant with
+# twice the time of the round before, until one of them solves the board or finishes
+# its search without a solution. A variant that runs out of nodes is not run again.
+
+SLICE_TIME = 0.05  # Seconds every variant gets in the first round of a time-sliced portfolio
+
+# One entry per run: a name, the Solver method, and the search order settings
+VARIANTS = [
+    {"name": "dfs", "method": "dfs_solve"},
+    {"name": "dfs-black-first", "method": "dfs_solve", "color_order": "black-first"},
+    {"name": "dfs-preferred", "method": "dfs_solve", "color_order": "preferred"},
+    {"name": "dfs-shuffled-1", "method": "dfs_solve", "seed": 1},
+    {"name": "dfs-shuffled-2", "method": "dfs_solve", "color_order": "black-first", "seed": 2},
+    {"name": "astar", "method": "a_star_solve"},
+    {"name": "bfs", "method": "bfs_solve"},
+    {"name": "sat", "method": "sat_solve"},
+]
+
+_cancel_event = None  # Set in each pool process by _init_process
+
+
+def _init_process(cancel_event):
+    """Store the event shared by all runs of a portfolio in a pool process."""
+    global _cancel_event
+    _cancel_event = cancel_event
+
+
+def _run_variant(grid, variant, max_time, max_nodes, cancel_event=None):
+    """
+    Solve a grid with one variant, inside a pool process unless a cancel event is given.
+
+    Returns:
+        tuple: (variant name, solved grid as nested lists or None, stats dict)
+    """
+    from solver import Solver  # Imported here so the parent process needs no solver state
+
+    board = Board.from_grid(grid)
+    fixed_cells = {(r, c) for r in range(board.size) for c in range(board.size) if board.grid[r, c] != 2}
+    solver = Solver(board, fixed_cells, Tracer(OFF))
+    solver.control = SearchControl(max_time, max_nodes, cancel_event=cancel_event or _cancel_event)
+    solver.color_order = variant.get("color_order", solver.color_order)
+    if "seed" in variant:
+        rank = list(range(board.size * board.size))
+        random.Random(variant["seed"]).shuffle(rank)
+        solver.cell_rank = rank
+
+    start = time.perf_counter()
+    result = getattr(solver, variant["method"])()
+    stats = dict(solver.stats, elapsed=time.perf_counter() - start)
+    return variant["name"], board.grid.tolist() if result else None, stats
+
+
+def is_verified(puzzle, solution):
+    """
+    Check a solution independently of the solver that produced it.
+
+    Args:
+        puzzle (numpy.ndarray): Puzzle grid with 0=black, 1=white, 2=empty
+        solution: Candidate solution grid
+
+    Returns:
+        bool: True if the solution obeys the rules and keeps every given cell
+    """
+    solution = Board.from_grid(solution).grid
+    return bool(are_solutions(solution[None], puzzle[None])[0])
+
+
+def solve_portfolio(grid, variants=None, workers=None, max_time=None, control=None, max_nodes=None):
+    """
+    Run several solver variants in parallel and return the first verified solution.
+
+    Args:
+        grid: Puzzle grid with 0=black, 1=white, 2=empty
+        variants (list, optional): Entries like those of VARIANTS; all of them by default
+        workers (int, optional): Pool size; one process per variant up to the CPU count.
+            With a single worker the variants are time-sliced in this process
+        max_time (float, optional): Time budget of every run in seconds
+        control (SearchControl, optional): Polled while waiting, so the caller can cancel
+        max_nodes (int, optional): Node budget of every run
+
+    Returns:
+        tuple: (solution grid as nested lists or None, stats dict with the winner's
+            name, the mode ("parallel" or "sliced") and workers, the stats of every run
+            that finished, and the stop reason if every run was stopped by its budget)
+    """
+    puzzle = Board.from_grid(grid).grid
+    variants = variants or VARIANTS
+    workers = workers or min(len(variants), multiprocessing.cpu_count())
+    if workers < 2:
+        return _solve_sliced(puzzle, variants, max_time, control, max_nodes)
+    cancel_event = multiprocessing.Event()
+
+    solution = None
+    stats = {"winner": None, "mode": "parallel", "workers": workers, "runs": {}}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_process,
+                             initargs=(cancel_event,)) as pool:
+        pending = {pool.submit(_run_variant, puzzle.tolist(), variant, max_time, max_nodes) for variant in variants}
+        while pending and solution is None:
+            done, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, result, run_stats = future.result()
+                stats["runs"][name] = run_stats
+                if result is not None and solution is None and is_verified(puzzle, result):
+                    solution = result
+                    stats["winner"] = name
+            if control is not None and control.poll():
+                break
+
+        # Stop the runs still searching and drop the ones that have not started
+        cancel_event.set()
+        for future in pending:
+            future.cancel()
+
+    # Without a solution, the puzzle is only known to be unsolvable if some run finished
+    reasons = [run.get("stopped") for run in stats["runs"].values()]
+    if solution is None and reasons and all(reasons) and not pending:
+        stats["stopped"] = reasons[0]
+    return solution, stats
+
+
+def _solve_sliced(puzzle, variants, max_time, control, max_nodes):
+    """
+    Time-slice the variants in this process; see solve_portfolio for the arguments.
+
+    Returns:
+        tuple: (solution grid as nested lists or None, stats dict as solve_portfolio's,
+            plus the number of rounds)
+    """
+    cancel_event = control.cancelled if control is not None else None
+    deadline = time.monotonic() + max_time if max_time else None
+    stats = {"winner": None, "mode": "sliced", "workers": 1, "rounds": 0, "runs": {}}
+    remaining = list(variants)
+    slice_time = SLICE_TIME
+    stop = None
+    while remaining:
+        stats["rounds"] += 1
+        for variant in list(remaining):
+            run_time = slice_time
+            if deadline is not None:
+                run_time = min(run_time, deadline - time.monotonic())
+                if run_time <= 0:
+                    stop = TIME_LIMIT
+                    break
+            name, result, run_stats = _run_variant(puzzle.tolist(), variant, run_time, max_nodes, cancel_event)
+            previous = stats["runs"].get(name)
+            if previous is not None:
+                run_stats["elapsed"] += previous["elapsed"]  # Time over all of its slices
+            stats["runs"][name] = run_stats
+
+            if result is not None and is_verified(puzzle, result):
+                stats["winner"] = name
+                return result, stats
+            reason = run_stats.get("stopped")
+            if reason == CANCELLED:
+                stop = reason
+                break
+            if reason is None:
+                return None, stats  # The search finished, so there is no solution
+            if reason == NODE_LIMIT:
+                remaining.remove(variant)  # A longer slice would end the same way
+        if stop is not None:
+            break
+        slice_time *= 2
+
+    stats["stopped"] = stop or NODE_LIMIT
+    return None, stats
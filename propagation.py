@@ -0,0 +1,181 @@
+from bitboard import iter_bits
+
+# Constraint propagation for Yin-Yang.
+# Forced deductions are applied repeatedly until nothing changes. Every rule below holds
+# for any valid solution, so propagation never removes a solution:
+#   1. 2x2 rule: a window with three cells of one color forces the fourth to the other color.
+#   2. Checkerboard rule: a window whose cells read X, Y / Y, ? forces ? to Y, because a
+#      2x2 checkerboard would need the two diagonals to cross.
+#   3. Liberty rule: a group with exactly one empty neighbor, while more cells of its color
+#      exist elsewhere, must grow through that neighbor.
+#   4. Articulation rule: an empty cell whose removal separates cells of a color from each
+#      other must take that color.
+#   5. Border rule: the cells of a color on the outer ring form one contiguous arc, so if
+#      only one gap between them holds the other color, every other gap is filled in.
+
+
+class Propagator:
+    def __init__(self, bitboard):
+        """
+        Create a propagator that shares the geometry of a BitBoard.
+
+        Args:
+            bitboard (BitBoard): Geometry helper for the board size
+        """
+        self.bitboard = bitboard
+        n = bitboard.size
+
+        # Outer ring in cyclic order: top row, right column, bottom row, left column
+        ring = [(0, c) for c in range(n)]
+        ring += [(r, n - 1) for r in range(1, n)]
+        ring += [(n - 1, c) for c in range(n - 2, -1, -1)]
+        ring += [(r, 0) for r in range(n - 2, 0, -1)]
+        self.ring = [r * n + c for r, c in ring] if n > 1 else []
+
+        # 8-neighborhood of every cell in clockwise order starting north, None when off-board
+        self.around = []
+        for i in range(bitboard.cells):
+            r, c = divmod(i, n)
+            cells = []
+            for dr, dc in [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]:
+                nr, nc = r + dr, c + dc
+                cells.append(nr * n + nc if 0 <= nr < n and 0 <= nc < n else None)
+            self.around.append(cells)
+
+    def propagate(self, black, white):
+        """
+        Apply forced deductions until a fixed point is reached.
+
+        Args:
+            black, white (int): Bitboard masks of the state
+
+        Returns:
+            tuple: (black, white) with every forced cell filled, or None if the state
+                contradicts the rules
+        """
+        while True:
+            result = self._window_rules(black, white)
+            if result is None:
+                return None
+            black, white = result
+
+            # The connectivity rules are more expensive, so they only run once the window
+            # rules are stable and start the loop over as soon as one of them fires
+            for rule in (self._liberty_rule, self._border_rule, self._articulation_rule):
+                forced = rule(black, white)
+                if forced is None:
+                    return None
+                forced_black, forced_white = forced
+                if forced_black or forced_white:
+                    if forced_black & forced_white:
+                        return None
+                    black |= forced_black
+                    white |= forced_white
+                    break
+            else:
+                return black, white
+
+    def _window_rules(self, black, white):
+        """
+        Apply the 2x2 and checkerboard rules with bit-parallel window operations.
+        In every window, a corner whose two side neighbors share a color is forced to the
+        opposite of its diagonal partner, which covers both rules at once.
+        """
+        bb = self.bitboard
+        n = bb.size
+        # Offsets of the four corners from the window anchor, paired with their diagonal
+        corners = [(0, n + 1), (1, n), (n, 1), (n + 1, 0)]
+        while True:
+            if bb.block_anchors(black) or bb.block_anchors(white) or bb.cross_anchors(black, white):
+                return None
+            empty = bb.full & ~(black | white)
+            forced_black = 0
+            forced_white = 0
+            for corner, diagonal in corners:
+                side1, side2 = [offset for offset in (0, 1, n, n + 1) if offset not in (corner, diagonal)]
+                same_sides = (((black >> side1) & (black >> side2)) |
+                              ((white >> side1) & (white >> side2)))
+                open_corner = (empty >> corner) & same_sides & bb.anchors
+                forced_white |= (open_corner & (black >> diagonal)) << corner
+                forced_black |= (open_corner & (white >> diagonal)) << corner
+            if not (forced_black or forced_white):
+                return black, white
+            if forced_black & forced_white:
+                return None
+            black |= forced_black
+            white |= forced_white
+
+    def _liberty_rule(self, black, white):
+        """Force the only empty neighbor of a group that still has to reach its color."""
+        bb = self.bitboard
+        empty = bb.full & ~(black | white)
+        forced = [0, 0]
+        for color, same in enumerate((black, white)):
+            groups = bb.components(same)
+            if len(groups) < 2:
+                continue
+            for group in groups:
+                liberties = bb.neighbors(group) & empty
+                if not liberties:
+                    return None
+                if liberties & (liberties - 1) == 0:
+                    forced[color] |= liberties
+        return forced[0], forced[1]
+
+    def _border_rule(self, black, white):
+        """Fill the gaps between same-colored border cells that cannot hold the other color."""
+        forced = [0, 0]
+        ring = self.ring
+        for color, (same, other) in enumerate(((black, white), (white, black))):
+            positions = [k for k, i in enumerate(ring) if same >> i & 1]
+            if len(positions) < 2 or not any(other >> i & 1 for i in ring):
+                continue
+            # Gaps between cyclically consecutive cells of this color on the ring
+            gaps = []
+            for start, end in zip(positions, positions[1:] + [positions[0] + len(ring)]):
+                gaps.append([ring[k % len(ring)] for k in range(start + 1, end)])
+            blocked = [gap for gap in gaps if any(other >> i & 1 for i in gap)]
+            if len(blocked) > 1:
+                return None
+            if len(blocked) == 1:
+                for gap in gaps:
+                    if gap is not blocked[0]:
+                        for i in gap:
+                            if not (black | white) >> i & 1:
+                                forced[color] |= 1 << i
+        return forced[0], forced[1]
+
+    def _articulation_rule(self, black, white):
+        """Force empty cells that every path between two cells of a color must cross."""
+        bb = self.bitboard
+        empty = bb.full & ~(black | white)
+        forced = [0, 0]
+        for color, same in enumerate((black, white)):
+            if same & (same - 1) == 0:  # Fewer than two cells: nothing to keep connected
+                continue
+            passable = same | empty
+            seed = same & -same
+            if bb.flood(seed, passable) & same != same:
+                return None  # Already cut off from each other
+            for i in iter_bits(empty):
+                if not self.may_cut(i, passable):
+                    continue
+                without = passable & ~(1 << i)
+                if bb.flood(seed, without) & same != same:
+                    forced[color] |= 1 << i
+        return forced[0], forced[1]
+
+    def may_cut(self, i, passable):
+        """
+        Local test for a cut point: the passable orthogonal neighbors of cell i must fall
+        into at least two groups when only the cells around i are used to join them.
+        """
+        around = self.around[i]
+        open_cells = [j is not None and passable >> j & 1 for j in around]
+        groups = 0
+        for k in (0, 2, 4, 6):  # Orthogonal neighbors
+            if open_cells[k] and not (open_cells[(k - 1) % 8] and open_cells[(k - 2) % 8]):
+                groups += 1
+        if groups == 0 and all(open_cells[k] for k in (0, 2, 4, 6)):
+            groups = 1  # The ring around i is fully open
+        return groups >= 2
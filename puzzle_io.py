@@ -0,0 +1,256 @@
+import os
+import sys
+import numpy as np
+
+# Puzzle files.
+# Two formats hold any number of square puzzles of any size and are read lazily, one
+# puzzle at a time, so very large collections never have to fit in memory.
+#
+# Text (any extension but .yyb): one row per line with B=black, W=white, .=empty. The
+# digits 0/1/2 are accepted as well. Puzzles are separated by blank lines, and a line
+# starting with # right before a puzzle gives it a name:
+#
+#     # Level 1
+#     B.W...
+#     ..WW..
+#
+# Binary (.yyb): the magic bytes b"YYB1", then one record per puzzle: the board size as
+# a 2-byte little-endian integer followed by the cells in row-major order, 2 bits per
+# cell and four cells per byte, lowest bits first (0=black, 1=white, 2=empty).
+
+MAGIC = b"YYB1"
+BINARY_EXTENSION = ".yyb"
+
+CELL_VALUES = {"B": 0, "W": 1, ".": 2, "b": 0, "w": 1, "0": 0, "1": 1, "2": 2}
+CELL_CHARS = "BW."  # Indexed by cell value when writing text
+
+
+def parse_puzzle(text):
+    """
+    Parse one puzzle written as text rows.
+
+    Args:
+        text (str): Rows of B/W/. or 0/1/2; blank lines, spaces and # comments are ignored
+
+    Returns:
+        numpy.ndarray: The parsed grid
+
+    Raises:
+        ValueError: If a character is not a cell or the rows do not form a square
+    """
+    rows = []
+    for line in text.splitlines():
+        line = "".join(line.split())
+        if not line or line.startswith("#"):
+            continue
+        try:
+            rows.append([CELL_VALUES[ch] for ch in line])
+        except KeyError:
+            raise ValueError(f"Invalid puzzle row: {line!r}") from None
+    if not rows or any(len(row) != len(rows) for row in rows):
+        raise ValueError("Puzzle must be a non-empty square grid")
+    return np.array(rows, dtype=int)
+
+
+def format_puzzle(grid, name=None):
+    """Format a grid as B/W/. rows, preceded by a # name line when a name is given."""
+    lines = [f"# {name}"] if name is not None else []
+    lines.extend("".join(CELL_CHARS[v] for v in row) for row in np.asarray(grid).tolist())
+    return "\n".join(lines)
+
+
+def pack_puzzle(grid):
+    """
+    Encode a grid as a binary record.
+
+    Args:
+        grid: Square 2D array-like with 0=black, 1=white, 2=empty
+
+    Returns:
+        bytes: Size header followed by the 2-bit cells
+    """
+    cells = np.asarray(grid, dtype=np.uint8).ravel()
+    size = int(np.asarray(grid).shape[0])
+    padded = np.zeros(-(-cells.size // 4) * 4, dtype=np.uint8)
+    padded[:cells.size] = cells
+    quads = padded.reshape(-1, 4)
+    packed = quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+    return size.to_bytes(2, "little") + packed.astype(np.uint8).tobytes()
+
+
+def unpack_puzzle(size, data):
+    """
+    Decode the cells of a binary record.
+
+    Args:
+        size (int): Board size from the record header
+        data: The (size * size + 3) // 4 bytes of packed cells, as bytes or any
+            buffer such as a slice of a memory map
+
+    Returns:
+        numpy.ndarray: The decoded grid
+
+    Raises:
+        ValueError: If a cell holds the unused value 3
+    """
+    packed = np.frombuffer(data, dtype=np.uint8)
+    cells = np.stack([(packed >> shift) & 3 for shift in (0, 2, 4, 6)], axis=1).ravel()[:size * size]
+    if (cells == 3).any():
+        raise ValueError("Invalid cell value in binary puzzle")
+    return cells.reshape(size, size).astype(int)
+
+
+def is_binary(path):
+    """Return True if a puzzle file uses the binary format."""
+    if path == "-":
+        return False
+    if path.endswith(BINARY_EXTENSION):
+        return True
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _read_text(path, parse):
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        lines, name, index = [], None, 0
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith("#") and not lines:
+                name = stripped[1:].strip() or None
+            elif stripped:
+                lines.append(stripped)
+            else:
+                if lines:
+                    index += 1
+                    text = "\n".join(lines)
+                    yield name or f"{path}:{index}", parse_puzzle(text) if parse else text
+                lines, name = [], None  # A name only applies to the puzzle right below it
+        if lines:
+            text = "\n".join(lines)
+            yield name or f"{path}:{index + 1}", parse_puzzle(text) if parse else text
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _read_binary(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a binary puzzle file")
+        index = 0
+        while True:
+            header = f.read(2)
+            if not header:
+                return
+            size = int.from_bytes(header, "little")
+            length = (size * size + 3) // 4
+            data = f.read(length)
+            if len(header) < 2 or len(data) < length:
+                raise ValueError(f"{path} ends in the middle of a puzzle")
+            index += 1
+            yield f"{path}:{index}", unpack_puzzle(size, data)
+
+
+def read_puzzles(path, parse=True):
+    """
+    Lazily read the puzzles of a file in either format, or of a corpus (see corpus.py).
+
+    Args:
+        path (str): Puzzle file, or - for text on stdin
+        parse (bool): Parse text puzzles here; with False they are yielded as text, so a
+            caller can report a malformed puzzle without ending the stream
+
+    Yields:
+        tuple: (name, grid) with the # name of a text puzzle or "path:index"
+
+    Raises:
+        ValueError: If a puzzle cannot be read
+    """
+    from corpus import Corpus, is_corpus  # Imported here since corpus builds on this module
+
+    path = os.fspath(path)
+    if path != "-" and is_corpus(path):
+        with Corpus(path) as corpus:
+            for index, grid in enumerate(corpus, 1):
+                yield f"{path}:{index}", grid
+    elif is_binary(path):
+        yield from _read_binary(path)
+    else:
+        yield from _read_text(path, parse)
+
+
+class PuzzleWriter:
+    def __init__(self, path, binary=None):
+        """
+        Open a puzzle file for writing one puzzle at a time.
+
+        Args:
+            path (str): File to create
+            binary (bool, optional): Use the binary format; by default it is chosen
+                by the .yyb extension
+        """
+        path = os.fspath(path)
+        self.binary = path.endswith(BINARY_EXTENSION) if binary is None else binary
+        self.file = open(path, "wb" if self.binary else "w")
+        self.count = 0
+        if self.binary:
+            self.file.write(MAGIC)
+
+    def write(self, grid, name=None):
+        """
+        Append a puzzle.
+
+        Args:
+            grid: Square 2D array-like with 0=black, 1=white, 2=empty
+            name (str, optional): Name stored in text files; binary files keep no names
+        """
+        if self.binary:
+            self.file.write(pack_puzzle(grid))
+        else:
+            self.file.write(("\n" if self.count else "") + format_puzzle(grid, name) + "\n")
+        self.count += 1
+
+    def close(self):
+        """Flush and close the file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_puzzles(path, puzzles, binary=None):
+    """
+    Write puzzles to a file.
+
+    Args:
+        path (str): File to create
+        puzzles: Iterable of grids or (name, grid) pairs
+        binary (bool, optional): Use the binary format (by default chosen by extension)
+
+    Returns:
+        int: Number of puzzles written
+    """
+    with PuzzleWriter(path, binary) as writer:
+        for item in puzzles:
+            if isinstance(item, tuple) and len(item) == 2 and isinstance(item[0], str):
+                writer.write(item[1], item[0])
+            else:
+                writer.write(item)
+        return writer.count
+
+
+def load_levels(path):
+    """
+    Load a level file as a dictionary of numbered levels.
+
+    Args:
+        path (str): Puzzle file in either format
+
+    Returns:
+        dict: Level number (from 1, in file order) to grid
+    """
+    return {level: grid for level, (_, grid) in enumerate(read_puzzles(path), 1)}
@@ -0,0 +1,94 @@
+# Dead-region detection for the solvers' pruning step.
+# A state is dead when the cells of one color can no longer be joined through empty
+# cells, or when an empty region of more than one cell is bordered by a single color.
+# Both rules are evaluated with bit-parallel flood fills over bitboard masks, so every
+# cell is visited by a bounded number of fills (linear in the board size).
+
+class DeadRegionDetector:
+    def __init__(self, bitboard):
+        """
+        Create a detector that shares the geometry of a BitBoard.
+
+        Args:
+            bitboard (BitBoard): Geometry helper for the board size
+        """
+        self.bitboard = bitboard
+
+    def is_dead(self, black, white):
+        """
+        Full check of a state, equivalent to Solver.has_bounded_regions.
+
+        Args:
+            black, white (int): Bitboard masks of the state
+
+        Returns:
+            bool: True if the state contains regions that can never be connected
+        """
+        bb = self.bitboard
+        empty = bb.full & ~(black | white)
+        if not empty:
+            return False
+
+        # All cells of a color must be reachable from each other through empty cells
+        # or cells of the same color
+        for same in (black, white):
+            if same and bb.flood(same & -same, same | empty) & same != same:
+                return True
+
+        for region in bb.components(empty):
+            if self._is_bounded(region, black, white):
+                return True
+        return False
+
+    def is_dead_after(self, black, white, i):
+        """
+        Incremental check of a state reached by filling cell i of a state that was not dead.
+        Only the components next to i can change, so only those are re-examined.
+
+        Args:
+            black, white (int): Bitboard masks of the new state
+            i (int): Bit index of the cell that was just filled
+
+        Returns:
+            bool: Same verdict as is_dead(black, white)
+        """
+        bb = self.bitboard
+        empty = bb.full & ~(black | white)
+        if not empty:
+            return False
+
+        # The placed color gained a cell, which must still reach the rest of that color
+        bit = 1 << i
+        same, other = (black, white) if black & bit else (white, black)
+        rest = same & ~bit
+        if rest and not bb.neighbor_masks[i] & rest:
+            if not bb.flood(bit, same | empty) & rest:
+                return True
+
+        # The other color lost i as a path, which can only split its cells if i linked
+        # at least two passable neighbors
+        passable = other | empty
+        links = bb.neighbor_masks[i] & passable
+        if other and links & (links - 1):
+            if bb.flood(other & -other, passable) & other != other:
+                return True
+
+        # The empty region that contained i may have split; every piece touches i.
+        # Regions elsewhere kept the same border, so they are still fine.
+        seeds = bb.neighbor_masks[i] & empty
+        while seeds:
+            piece = bb.flood(seeds & -seeds, empty)
+            if self._is_bounded(piece, black, white):
+                return True
+            seeds &= ~piece
+        return False
+
+    def _is_bounded(self, region, black, white):
+        """
+        Check whether an empty region is bordered by only one color.
+        Single empty cells are never bounded, as they can be filled with either color.
+        """
+        if region & (region - 1) == 0:
+            return False
+        border = self.bitboard.neighbors(region) & ~region
+        return bool(border & black) != bool(border & white)
@@ -0,0 +1,165 @@
+import numpy as np
+
+# Vectorized rule checks on NumPy grids.
+# Every function takes a single grid of shape (n, n) or a batch of grids of shape
+# (B, n, n), with 0=black, 1=white, 2=empty, and evaluates all 2x2 windows at once by
+# adding the four shifted views of the board instead of looping over slices. Batch
+# results have one entry per board, so thousands of generated puzzles can be checked
+# with a handful of array operations.
+
+WIN = "WIN"
+BLOCKS = "Invalid: 2x2 blocks detected"
+DISCONNECTED = "Invalid: Regions must be connected"
+
+
+def _corners(grids):
+    """Return the top-left, top-right, bottom-left and bottom-right cell of every 2x2 window."""
+    return grids[..., :-1, :-1], grids[..., :-1, 1:], grids[..., 1:, :-1], grids[..., 1:, 1:]
+
+
+def window_counts(grids, color):
+    """
+    Count the cells of one color in every 2x2 window.
+
+    Args:
+        grids (numpy.ndarray): Grid (n, n) or batch (B, n, n)
+        color (int): 0 for black, 1 for white
+
+    Returns:
+        numpy.ndarray: Counts of shape (..., n-1, n-1), indexed by the window's top-left cell
+    """
+    top_left, top_right, bottom_left, bottom_right = _corners(np.asarray(grids) == color)
+    return (top_left.astype(np.int8) + top_right + bottom_left + bottom_right)
+
+
+def block_windows(grids):
+    """Return a boolean (..., n-1, n-1) array marking monochrome 2x2 windows."""
+    grids = np.asarray(grids)
+    return (window_counts(grids, 0) == 4) | (window_counts(grids, 1) == 4)
+
+
+def cross_windows(grids):
+    """Return a boolean (..., n-1, n-1) array marking 2x2 checkerboards of black and white."""
+    top_left, top_right, bottom_left, bottom_right = _corners(np.asarray(grids))
+    return ((top_left != 2) & (top_right != 2) & (top_left != top_right) &
+            (top_left == bottom_right) & (top_right == bottom_left))
+
+
+def block_cells(grids):
+    """
+    Mark the cells covered by a monochrome 2x2 window.
+
+    Args:
+        grids (numpy.ndarray): Grid (n, n) or batch (B, n, n)
+
+    Returns:
+        numpy.ndarray: Boolean array of the same shape as grids
+    """
+    windows = block_windows(grids)
+    cells = np.zeros(np.shape(grids), dtype=bool)
+    cells[..., :-1, :-1] |= windows
+    cells[..., :-1, 1:] |= windows
+    cells[..., 1:, :-1] |= windows
+    cells[..., 1:, 1:] |= windows
+    return cells
+
+
+def has_blocks(grids):
+    """Return per board whether a monochrome 2x2 window exists (a bool for a single grid)."""
+    return block_windows(grids).any(axis=(-2, -1))
+
+
+def has_crosses(grids):
+    """Return per board whether a 2x2 checkerboard exists (a bool for a single grid)."""
+    return cross_windows(grids).any(axis=(-2, -1))
+
+
+def is_connected(masks):
+    """
+    Check per board whether the True cells form a single orthogonally connected group.
+    All boards of a batch are flood filled together, one ring of cells per step.
+
+    Args:
+        masks (numpy.ndarray): Boolean mask (n, n) or batch (B, n, n)
+
+    Returns:
+        numpy.ndarray: True where the mask is empty or connected (a bool for a single mask)
+    """
+    masks = np.asarray(masks, dtype=bool)
+    single = masks.ndim == 2
+    if single:
+        masks = masks[np.newaxis]
+    flat = masks.reshape(len(masks), masks.shape[1] * masks.shape[2])
+
+    # Start every fill from the first cell of its mask
+    region = np.zeros_like(flat)
+    rows = np.flatnonzero(flat.any(axis=1))
+    region[rows, flat[rows].argmax(axis=1)] = True
+    region = region.reshape(masks.shape)
+
+    while True:
+        grown = region.copy()
+        grown[:, 1:, :] |= region[:, :-1, :]
+        grown[:, :-1, :] |= region[:, 1:, :]
+        grown[:, :, 1:] |= region[:, :, :-1]
+        grown[:, :, :-1] |= region[:, :, 1:]
+        grown &= masks
+        if (grown == region).all():
+            break
+        region = grown
+
+    connected = (region == masks).all(axis=(1, 2))
+    return bool(connected[0]) if single else connected
+
+
+def _single_groups(grids):
+    """Return per board of a batch whether each color forms exactly one group."""
+    black, white = grids == 0, grids == 1
+    return (black.any(axis=(1, 2)) & white.any(axis=(1, 2)) &
+            is_connected(black) & is_connected(white))
+
+
+def win_verdicts(grids):
+    """
+    Evaluate boards the way Board.check_win_condition does.
+
+    Args:
+        grids (numpy.ndarray): Grid (n, n) or batch (B, n, n)
+
+    Returns:
+        The verdict of a single grid, or a list with one per board: WIN, BLOCKS,
+        DISCONNECTED, or None for a board that still has empty cells
+    """
+    grids = np.asarray(grids)
+    single = grids.ndim == 2
+    if single:
+        grids = grids[np.newaxis]
+
+    full = ~(grids == 2).any(axis=(1, 2))
+    blocks = has_blocks(grids)
+    connected = np.zeros(len(grids), dtype=bool)
+    candidates = full & ~blocks  # Connectivity only matters for the others
+    connected[candidates] = _single_groups(grids[candidates])
+    verdicts = [None if not f else BLOCKS if b else WIN if c else DISCONNECTED
+                for f, b, c in zip(full.tolist(), blocks.tolist(), connected.tolist())]
+    return verdicts[0] if single else verdicts
+
+
+def are_solutions(solutions, puzzles=None):
+    """
+    Check a batch of solutions, e.g. of generated puzzles, in one pass.
+
+    Args:
+        solutions (numpy.ndarray): Batch (B, n, n) of candidate solutions
+        puzzles (numpy.ndarray, optional): Batch (B, n, n) of puzzles whose givens the
+            solutions must keep
+
+    Returns:
+        numpy.ndarray: Boolean array with one verdict per board
+    """
+    solutions = np.asarray(solutions)
+    valid = (solutions != 2).all(axis=(1, 2)) & ~has_blocks(solutions) & _single_groups(solutions)
+    if puzzles is not None:
+        puzzles = np.asarray(puzzles)
+        valid &= ((puzzles == 2) | (puzzles == solutions)).all(axis=(1, 2))
+    return valid
@@ -0,0 +1,611 @@
+import heapq
+from bitboard import iter_bits
+from propagation import Propagator
+
+# SAT backend for Yin-Yang.
+# Each cell is one Boolean variable (True = black). The 2x2 and checkerboard rules are
+# plain clauses. Connectivity is added lazily: whenever a model has a color split into
+# several groups, a cut clause is added for each group and the solver runs again.
+# The built-in solver is a small CDCL engine (two watched literals, first-UIP clause
+# learning, activity-based branching from a heap, phase saving and Luby restarts). Its
+# connectivity theory applies the liberty, border and articulation rules of the tree
+# searches to partial assignments, so the learned clauses carry the same pruning. If
+# pycosat is installed it can be used instead.
+
+try:
+    import pycosat
+except ImportError:
+    pycosat = None
+
+
+def luby(i):
+    """Return the i-th element (1-based) of the Luby restart sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+class SatSolver:
+    def __init__(self, num_vars):
+        """
+        Create an empty CNF problem over variables 1..num_vars.
+        Literals are non-zero ints: v means variable v is True, -v means it is False.
+
+        Args:
+            num_vars (int): Number of variables
+        """
+        self.num_vars = num_vars
+        self.ok = True  # False once the clauses are known to be unsatisfiable
+        self.watches = {}
+        for v in range(1, num_vars + 1):
+            self.watches[v] = []
+            self.watches[-v] = []
+        self.values = [0] * (num_vars + 1)  # 1 = True, -1 = False, 0 = unassigned
+        self.levels = [0] * (num_vars + 1)
+        self.reasons = [None] * (num_vars + 1)
+        self.phase = [False] * (num_vars + 1)  # Last value of each variable, reused on decisions
+        self.activity = [0.0] * (num_vars + 1)
+        self.var_inc = 1.0
+        # Branching order: a heap of (-activity, variable) with stale entries skipped
+        # lazily. Bumping or unassigning a variable pushes a fresh entry.
+        self.order = [(0.0, v) for v in range(1, num_vars + 1)]
+        self.trail = []
+        self.trail_lim = []  # Trail length at the start of each decision level
+        self.qhead = 0
+        self.true_mask = 0  # Bit v-1 set when variable v is True
+        self.false_mask = 0  # Bit v-1 set when variable v is False
+        self.conflicts = 0
+        self.decisions = 0
+
+    def value(self, lit):
+        """Return 1 if lit is True, -1 if False and 0 if unassigned."""
+        value = self.values[abs(lit)]
+        return value if lit > 0 else -value
+
+    def add_clause(self, lits):
+        """
+        Add a clause. Must be called at decision level 0 (before solve or after backtrack(0)).
+
+        Args:
+            lits (iterable): Literals of the clause
+        """
+        if not self.ok:
+            return
+        clause = []
+        for lit in dict.fromkeys(lits):
+            if -lit in clause or self.value(lit) == 1:
+                return  # Tautology or already satisfied
+            if self.value(lit) == 0:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            if self._propagate() is not None:
+                self.ok = False
+        else:
+            self._attach(clause)
+
+    def _attach(self, clause):
+        """Watch the first two literals of a clause."""
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _enqueue(self, lit, reason):
+        """Make lit True at the current decision level."""
+        v = abs(lit)
+        if lit > 0:
+            self.values[v] = 1
+            self.true_mask |= 1 << (v - 1)
+        else:
+            self.values[v] = -1
+            self.false_mask |= 1 << (v - 1)
+        self.levels[v] = len(self.trail_lim)
+        self.reasons[v] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        """
+        Run unit propagation over the watched literals.
+
+        Returns:
+            list: A conflicting clause, or None if no conflict was found
+        """
+        values = self.values
+        watches = self.watches
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            watching = watches[false_lit]
+            kept = []
+            for index, clause in enumerate(watching):
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                first_value = values[abs(first)] if first > 0 else -values[abs(first)]
+                if first_value == 1:
+                    kept.append(clause)
+                    continue
+                # Look for another literal that is not False to watch instead
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if (values[abs(lit)] if lit > 0 else -values[abs(lit)]) != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if first_value == -1:
+                        kept.extend(watching[index + 1:])
+                        watches[false_lit] = kept
+                        self.qhead = len(self.trail)
+                        return clause
+                    self._enqueue(first, clause)
+            watches[false_lit] = kept
+        return None
+
+    def _analyze(self, conflict):
+        """
+        Derive a first-UIP learned clause from a conflict.
+
+        Returns:
+            tuple: (learned clause with the asserting literal first, backtrack level)
+        """
+        seen = [False] * (self.num_vars + 1)
+        level = len(self.trail_lim)
+        learnt = [None]
+        pending = 0
+        lit = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                v = abs(q)
+                if lit is not None and v == abs(lit):
+                    continue
+                if not seen[v] and self.levels[v] > 0:
+                    seen[v] = True
+                    self._bump(v)
+                    if self.levels[v] == level:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while not seen[abs(self.trail[index])]:
+                index -= 1
+            lit = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(lit)]
+        learnt[0] = -lit
+
+        backtrack_level = 0
+        if len(learnt) > 1:
+            best = max(range(1, len(learnt)), key=lambda k: self.levels[abs(learnt[k])])
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            backtrack_level = self.levels[abs(learnt[1])]
+        return learnt, backtrack_level
+
+    def _bump(self, v):
+        """Increase the branching activity of a variable involved in a conflict."""
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self._rebuild_order()
+        elif self.values[v] == 0:
+            heapq.heappush(self.order, (-self.activity[v], v))
+        if len(self.order) > 8 * self.num_vars:
+            self._rebuild_order()  # Drop the stale entries
+
+    def _rebuild_order(self):
+        """Rebuild the branching heap from the unassigned variables."""
+        self.order = [(-self.activity[v], v) for v in range(1, self.num_vars + 1) if self.values[v] == 0]
+        heapq.heapify(self.order)
+
+    def backtrack(self, level):
+        """
+        Undo every assignment above the given decision level.
+
+        Args:
+            level (int): Decision level to return to
+        """
+        if len(self.trail_lim) <= level:
+            return
+        limit = self.trail_lim[level]
+        cleared = 0
+        order, activity = self.order, self.activity
+        for lit in self.trail[limit:]:
+            v = abs(lit)
+            self.phase[v] = lit > 0
+            self.values[v] = 0
+            self.reasons[v] = None
+            cleared |= 1 << (v - 1)
+            heapq.heappush(order, (-activity[v], v))
+        self.true_mask &= ~cleared
+        self.false_mask &= ~cleared
+        del self.trail[limit:]
+        del self.trail_lim[level:]
+        self.qhead = limit
+
+    def _pick_branch(self):
+        """Return the unassigned variable with the highest activity, or None."""
+        order, values, activity = self.order, self.values, self.activity
+        while order:
+            negative, v = heapq.heappop(order)
+            if values[v] == 0 and -negative == activity[v]:
+                return v
+        return None
+
+    def _theory_conflict(self, clause):
+        """
+        Turn a clause reported by a theory check, false under the current assignment,
+        into a conflict at the highest decision level among its literals.
+
+        Returns:
+            list: The attached conflict clause, or None if it is false at level 0
+        """
+        level = max(self.levels[abs(lit)] for lit in clause)
+        if level == 0:
+            self.ok = False
+            return None
+        self.backtrack(level)
+        clause.sort(key=lambda lit: -self.levels[abs(lit)])
+        self._attach(clause)
+        return clause
+
+    def _theory_implication(self, clause):
+        """
+        Attach a clause reported by a theory check that has exactly one unassigned literal,
+        and make that literal True with the clause as its reason.
+        """
+        clause.sort(key=lambda lit: (self.value(lit) != 0, -self.levels[abs(lit)]))
+        self._attach(clause)
+        self._enqueue(clause[0], clause)
+
+    def solve(self, should_stop=None, theory=None):
+        """
+        Search for a satisfying assignment.
+
+        Args:
+            should_stop (callable, optional): Polled once per conflict; returning True aborts
+            theory (callable, optional): Called with the solver after every propagation
+                fixed point; returns a clause that the partial assignment falsifies
+                (a conflict) or leaves with one unassigned literal (an implication),
+                or None if it has nothing to add
+
+        Returns:
+            bool: True if satisfiable (read the model with model()), False if unsatisfiable
+                or aborted
+        """
+        if not self.ok:
+            return False
+        restarts = 1
+        budget = 100 * luby(restarts)
+        while True:
+            conflict = self._propagate()
+            if conflict is None and theory is not None:
+                clause = theory(self)
+                if clause is not None:
+                    if any(self.value(lit) == 0 for lit in clause):
+                        self._theory_implication(clause)
+                        continue
+                    conflict = self._theory_conflict(clause)
+                    if not self.ok:
+                        return False
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, level = self._analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self.var_inc /= 0.95
+
+                budget -= 1
+                if budget <= 0:
+                    restarts += 1
+                    budget = 100 * luby(restarts)
+                    self.backtrack(0)
+                if should_stop and should_stop():
+                    self.backtrack(0)
+                    return False
+            else:
+                v = self._pick_branch()
+                if v is None:
+                    return True
+                self.decisions += 1
+                self.trail_lim.append(len(self.trail))
+                self._enqueue(v if self.phase[v] else -v, None)
+
+    def model(self):
+        """Return the current assignment as a list of booleans indexed by variable."""
+        return [value == 1 for value in self.values]
+
+
+class PycosatSolver:
+    def __init__(self, num_vars):
+        """
+        Same interface as SatSolver, backed by the optional pycosat package.
+        pycosat is not incremental, so every solve() starts from all clauses.
+
+        Args:
+            num_vars (int): Number of variables
+        """
+        self.num_vars = num_vars
+        self.clauses = []
+        self.solution = None
+        self.conflicts = 0
+        self.decisions = 0
+
+    def add_clause(self, lits):
+        """Add a clause."""
+        self.clauses.append(list(lits))
+
+    def backtrack(self, level):
+        """Nothing to undo: every solve() starts from scratch."""
+
+    def solve(self, should_stop=None, theory=None):
+        """Search for a satisfying assignment; should_stop and theory are ignored."""
+        result = pycosat.solve(self.clauses, vars=self.num_vars)
+        if result == "UNSAT":
+            return False
+        self.solution = [False] * (self.num_vars + 1)
+        for lit in result:
+            if lit > 0:
+                self.solution[lit] = True
+        return True
+
+    def model(self):
+        """Return the last assignment as a list of booleans indexed by variable."""
+        return self.solution
+
+
+def encode_board(bitboard, black, white, sat):
+    """
+    Add the clauses of a Yin-Yang board to a SAT solver.
+    Cell i is variable i + 1, True meaning black.
+
+    Args:
+        bitboard (BitBoard): Geometry helper for the board size
+        black, white (int): Bitboard masks of the givens
+        sat: SatSolver or PycosatSolver with bitboard.cells variables
+    """
+    n = bitboard.size
+    for i in iter_bits(black):
+        sat.add_clause([i + 1])
+    for i in iter_bits(white):
+        sat.add_clause([-(i + 1)])
+
+    for w in iter_bits(bitboard.anchors):
+        a, b, c, d = w + 1, w + 2, w + n + 1, w + n + 2
+        sat.add_clause([-a, -b, -c, -d])  # Not all black
+        sat.add_clause([a, b, c, d])  # Not all white
+        sat.add_clause([-a, b, c, -d])  # No checkerboard with black on the main diagonal
+        sat.add_clause([a, -b, -c, d])  # No checkerboard with white on the main diagonal
+
+    # From 4x4 up, disjoint windows each need both colors, so every color has several
+    # cells and no cell can be cut off from its own color
+    if n >= 4:
+        for i in range(bitboard.cells):
+            neighbors = [j + 1 for j in iter_bits(bitboard.neighbor_masks[i])]
+            sat.add_clause([-(i + 1)] + neighbors)
+            sat.add_clause([i + 1] + [-j for j in neighbors])
+
+
+def connectivity_cuts(bitboard, black, white, given_black=0, given_white=0):
+    """
+    Build cut clauses for every color that a model splits into several groups.
+    For a group S and a cell t of the same color outside it, any path from S to t must
+    cross a neighbor of S, so for every s in S: not s or not t or (some neighbor of S has
+    the color). t is a given cell whenever possible, which drops it from the clause.
+
+    Args:
+        bitboard (BitBoard): Geometry helper for the board size
+        black, white (int): Bitboard masks of the model
+        given_black, given_white (int): Givens, preferred as t for stronger cuts
+
+    Returns:
+        list: Clauses to add (empty when both colors are connected)
+    """
+    cuts = []
+    for same, given, sign in ((black, given_black, 1), (white, given_white, -1)):
+        groups = bitboard.components(same)
+        if len(groups) < 2:
+            continue
+        for group in groups:
+            rest = same & ~group
+            t = rest & given or rest
+            t = (t & -t).bit_length() - 1
+            boundary = [sign * (v + 1) for v in iter_bits(bitboard.neighbors(group) & ~group)]
+            for s in iter_bits(group):
+                cuts.append([-sign * (s + 1), -sign * (t + 1)] + boundary)
+    return cuts
+
+
+class ConnectivityTheory:
+    def __init__(self, bitboard):
+        """
+        Connectivity reasoning on partial assignments for the built-in solver.
+        Instead of waiting for a full model, it applies the connectivity rules of
+        propagation.py to the assigned cells and explains each deduction with a clause:
+        a conflict as soon as the cells of a color can no longer reach each other, the
+        only way out of a group that still has to reach the rest of its color, the cells
+        the border rule fills in, and the empty cut points every path of a color crosses.
+
+        Args:
+            bitboard (BitBoard): Geometry helper for the board size
+        """
+        self.bitboard = bitboard
+        self.propagator = Propagator(bitboard)  # Outer ring and local cut point test
+
+    def __call__(self, sat):
+        """
+        Check the current partial assignment of a SatSolver.
+
+        Returns:
+            list: A conflict or implication clause, or None
+        """
+        bb = self.bitboard
+        black, white = sat.true_mask, sat.false_mask
+        open_cells = bb.full & ~(black | white)
+        for same, sign in ((black, 1), (white, -1)):
+            if not same:
+                continue
+            seed = same & -same
+            reach = bb.flood(seed, same | open_cells)
+            cut_off = same & ~reach
+            if cut_off:
+                # Every cell around the reachable area has the other color
+                return self._cut(sign, seed, cut_off, reach)
+
+            groups = bb.components(same)
+            if len(groups) < 2:
+                continue
+            for group in groups:
+                exits = bb.neighbors(group) & open_cells
+                if exits & (exits - 1) == 0:
+                    # The group's single open neighbor must take its color
+                    clause = self._cut(sign, group, same & ~group, group)
+                    return clause
+
+        clause = self._border(black, white)
+        if clause is not None:
+            return clause
+        for same, sign in ((black, 1), (white, -1)):
+            clause = self._articulation(same, sign, open_cells)
+            if clause is not None:
+                return clause
+        return None
+
+    def _border(self, black, white):
+        """
+        Apply the border rule. Around the outer ring, no four cells may read X, Y, X, Y
+        for colors X and Y, since the two X cells and the two Y cells could not both be
+        joined inside the board. A ring with four or more runs of assigned colors is a
+        conflict; with two runs, an open cell between two cells of one run takes its color.
+
+        Returns:
+            list: A four-literal conflict or implication clause, or None
+        """
+        ring = self.propagator.ring
+        assigned = [(k, 1 if black >> i & 1 else -1) for k, i in enumerate(ring) if (black | white) >> i & 1]
+        changes = [j for j in range(len(assigned)) if assigned[j][1] != assigned[j - 1][1]]
+        if not changes:
+            return None  # At most one color on the ring
+
+        # Split the assigned cells into runs of one color, in ring order
+        assigned = assigned[changes[0]:] + assigned[:changes[0]]
+        runs = [[assigned[0]]]
+        for entry in assigned[1:]:
+            if entry[1] == runs[-1][-1][1]:
+                runs[-1].append(entry)
+            else:
+                runs.append([entry])
+
+        sign = runs[0][0][1]
+        if len(runs) >= 4:
+            p1, p2, p3, p4 = (ring[run[0][0]] for run in runs[:4])
+            return [-sign * (p1 + 1), sign * (p2 + 1), -sign * (p3 + 1), sign * (p4 + 1)]
+
+        # Two runs: any cell of the other run takes the place of the fourth cell
+        for run, other in ((runs[0], runs[1]), (runs[1], runs[0])):
+            sign = run[0][1]
+            y = ring[other[0][0]]
+            for (ka, _), (kb, _) in zip(run, run[1:]):
+                if kb - ka > 1:
+                    a, b, i = ring[ka], ring[kb], ring[ka + 1]
+                    return [-sign * (a + 1), -sign * (b + 1), sign * (y + 1), sign * (i + 1)]
+        return None
+
+    def _articulation(self, same, sign, open_cells):
+        """
+        Find an open cell that every path between two cells of a color crosses.
+
+        Returns:
+            list: An implication clause forcing the cell to the color, or None
+        """
+        if same & (same - 1) == 0:  # Fewer than two cells: nothing to keep connected
+            return None
+        bb = self.bitboard
+        passable = same | open_cells
+        seed = same & -same
+        for i in iter_bits(open_cells):
+            if not self.propagator.may_cut(i, passable):
+                continue
+            reach = bb.flood(seed, passable & ~(1 << i))
+            if same & ~reach:
+                # The boundary of the reachable area is cell i plus cells of the other color
+                return self._cut(sign, seed, same & ~reach, reach)
+        return None
+
+    def _cut(self, sign, inside, outside, region):
+        """
+        Build the clause: not s or not t or (some neighbor of region has the color),
+        for s the first cell of inside and t the first cell of outside.
+        """
+        s = (inside & -inside).bit_length() - 1
+        t = (outside & -outside).bit_length() - 1
+        boundary = self.bitboard.neighbors(region) & ~region
+        return [-sign * (s + 1), -sign * (t + 1)] + [sign * (v + 1) for v in iter_bits(boundary)]
+
+
+def solve_board(bitboard, black, white, backend="auto", should_stop=None):
+    """
+    Solve a board with the SAT encoding and lazily added connectivity cuts.
+
+    Args:
+        bitboard (BitBoard): Geometry helper for the board size
+        black, white (int): Bitboard masks of the givens
+        backend (str): "builtin", "pycosat", or "auto" (pycosat when installed)
+        should_stop (callable, optional): Polled by the built-in solver to abort early
+
+    Returns:
+        tuple: ((black, white) solution or None, stats dict with rounds, cuts,
+            conflicts and decisions)
+    """
+    if backend == "auto":
+        backend = "pycosat" if pycosat is not None else "builtin"
+    sat = PycosatSolver(bitboard.cells) if backend == "pycosat" else SatSolver(bitboard.cells)
+    encode_board(bitboard, black, white, sat)
+
+    theory = None
+    if backend == "builtin":
+        theory = ConnectivityTheory(bitboard)
+        # Start the phases from a connected comb: black columns hanging off the top row,
+        # white columns standing on the bottom row. Free cells near it rarely conflict.
+        n = bitboard.size
+        for i in range(bitboard.cells):
+            r, c = divmod(i, n)
+            sat.phase[i + 1] = r == 0 or (r < n - 1 and c % 2 == 0) or (r == n - 1 and c == 0)
+
+    stats = {"backend": backend, "rounds": 0, "cuts": 0}
+    solution = None
+    while True:
+        stats["rounds"] += 1
+        if not sat.solve(should_stop, theory):
+            break
+        model = sat.model()
+        model_black = sum(1 << i for i in range(bitboard.cells) if model[i + 1])
+        model_white = bitboard.full & ~model_black
+        cuts = connectivity_cuts(bitboard, model_black, model_white, black, white)
+        if not cuts:
+            solution = (model_black, model_white)
+            break
+        stats["cuts"] += len(cuts)
+        sat.backtrack(0)
+        for clause in cuts:
+            sat.add_clause(clause)
+
+    stats["conflicts"] = sat.conflicts
+    stats["decisions"] = sat.decisions
+    return solution, stats
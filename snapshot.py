@@ -0,0 +1,77 @@
+import time
+import config
+
+# Decoupling the search from the display.
+# A solver publishes every state it explores into a SnapshotBuffer, which only keeps the
+# latest one, so publishing costs a single assignment. A renderer reads the buffer when
+# it is ready to draw a frame, and a FrameThrottle decides when that is: at a capped
+# frame rate, or every N explored states when config.SOLVE_SPEED is set.
+
+
+class SnapshotBuffer:
+    def __init__(self):
+        """Create an empty buffer."""
+        # (number of states published, black, white); replaced as a whole so a reader
+        # in another thread never sees a half-written snapshot
+        self.state = (0, 0, 0)
+
+    def publish(self, black, white):
+        """
+        Replace the snapshot with a newer state.
+
+        Args:
+            black, white (int): Bitboard masks of the state
+
+        Returns:
+            int: Number of states published so far, including this one
+        """
+        count = self.state[0] + 1
+        self.state = (count, black, white)
+        return count
+
+    def latest(self):
+        """Return the newest snapshot as (number of states published, black, white)."""
+        return self.state
+
+
+class FrameThrottle:
+    def __init__(self, fps=30, every=0):
+        """
+        Decide which published states are drawn.
+
+        Args:
+            fps (float): Maximum frames per second when drawing by time
+            every (int): Draw every this many states instead of by time (0 = by time)
+        """
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.every = every
+        self.next_frame = 0.0
+        self.drawn_count = 0  # Count of the last drawn state
+
+    @classmethod
+    def from_config(cls):
+        """Create a throttle from config.SOLVE_FPS and config.SOLVE_SPEED."""
+        return cls(config.SOLVE_FPS, config.SOLVE_SPEED)
+
+    def ready(self, count):
+        """
+        Check whether a frame should be drawn now.
+        A renderer that polls the buffer sees only some of the counts, so in the
+        every-N mode a frame is due once N states were published since the last one.
+
+        Args:
+            count (int): Number of states published so far
+
+        Returns:
+            bool: True if the renderer should draw the latest snapshot
+        """
+        if self.every:
+            if count - self.drawn_count < self.every:
+                return False
+            self.drawn_count = count
+            return True
+        now = time.monotonic()
+        if now < self.next_frame:
+            return False
+        self.next_frame = now + self.interval
+        return True
@@ -1,21 +1,79 @@
 import numpy as np
 from collections import deque
 import heapq
-import random
+import multiprocessing
+from array import array
+from bitboard import BitBoard, iter_bits
+from validity import WindowTracker
+from connectivity import ConnectivityTracker
+from regions import DeadRegionDetector
+from heuristic import HeuristicEngine
+from rules import has_crosses
+import layers
+from state import SearchState
+from propagation import Propagator
+from transposition import ZobristKeys, TranspositionTable
+import sat
+import config
+from tracing import DEBUG, default_tracer
+from snapshot import SnapshotBuffer, FrameThrottle
+from control import SearchControl
+from portfolio import solve_portfolio
+from parallel_dfs import search_subproblems
+
+# Outcomes of a DFS below one state, besides the control's reasons to stop
+SOLVED = "solved"
+EXHAUSTED = "exhausted"
+SPLIT = "split"
 
 class Solver:
-    def __init__(self, board, fixed_cells):
+    def __init__(self, board, fixed_cells, tracer=None):
         """
         Initialize the solver with a board and fixed cells.
         
         Args:
             board: The Board object to solve
             fixed_cells: Set of (row, col) tuples representing cells that cannot be changed
+            tracer (Tracer, optional): Destination of the solver log; console output
+                gated by config.DEBUG when omitted
         """
         self.board = board
         self.fixed_cells = fixed_cells  # Cells that cannot be changed
         self.draw_callback = None  # Will be set by UI to update display during solving
-        self.disable_logging = False  # Flag to control debug output
+        self.snapshots = SnapshotBuffer()  # Latest explored state, for renderers
+        self.frame_throttle = FrameThrottle.from_config()  # When draw_callback is called
+        self.tracer = tracer or default_tracer()  # Level-gated solver log
+        self.stats = {}  # Counters from the most recent solve, e.g. states_explored
+        # Cancellation, time/node budgets and progress reports for every solve
+        self.control = SearchControl(config.SOLVE_TIME_LIMIT or None, config.SOLVE_NODE_LIMIT or None)
+        
+        # Search states are (black, white) bitboard pairs; the grid is only rebuilt for drawing
+        self.bitboard = BitBoard(board.size)
+        self.windows = WindowTracker(board.size)
+        self.regions = DeadRegionDetector(self.bitboard)
+        self.heuristic = HeuristicEngine(self.bitboard, self.regions)
+        self.propagator = Propagator(self.bitboard)
+        # States seen by A* and BFS, keyed by an incrementally updated Zobrist hash
+        self.zobrist = ZobristKeys(self.bitboard.cells)
+        self.transpositions = TranspositionTable(config.TRANSPOSITION_CAPACITY, config.TRANSPOSITION_POLICY)
+        # Search order variants, used to diversify the runs of a portfolio solve
+        self.color_order = "white-first"  # DFS color order: white-first, black-first or preferred
+        self.cell_rank = None  # Tie-break rank per cell for cell selection; row-major if None
+        self.solution_path = None  # Moves (r, c, color) from the start to the solution of the last A* or IDA* solve
+        self.fixed_mask = 0
+        for r, c in fixed_cells:
+            self.fixed_mask |= 1 << self.bitboard.index(r, c)
+        self.sync_grid()  # Window counters of the board grid, read by is_valid_move
+
+    def sync_grid(self):
+        """
+        Reload the window counters and empty-cell count of the board grid that
+        is_valid_move reads. It runs automatically whenever the grid was replaced or
+        edited in place since the last call.
+        """
+        self._synced_grid = self.board.grid
+        self._synced_copy = self.board.grid.copy()  # Detects in-place edits
+        self.windows.reset(*self.bitboard.pack(self.board.grid))
 
     def is_valid_move(self, r, c, color):
         """
@@ -28,25 +86,26 @@ class Solver:
         Returns:
             bool: True if the move is valid, False otherwise
         """
-        if self.board.grid[r, c] != 2:  # Ensure the cell is empty
+        grid = self.board.grid
+        # The counters are only trusted while the grid is the one they were loaded from,
+        # unchanged; a vectorized comparison is far cheaper than reloading them
+        if grid is not self._synced_grid or not np.array_equal(grid, self._synced_copy):
+            self.sync_grid()
+        if grid[r, c] != 2:  # Ensure the cell is empty
             return False
         
-        # Temporarily place the move
-        self.board.grid[r, c] = color
-        
-        # Use Board's check_2x2_blocks() to ensure no 2x2 monochrome blocks
-        invalid_cells = self.board.check_2x2_blocks()
-        if (r, c) in invalid_cells:
-            self.board.grid[r, c] = 2  # Revert move
+        # Only the (at most four) 2x2 windows containing (r, c) can become monochrome,
+        # which the per-window counters tell in O(1)
+        if self.windows.would_block(self.bitboard.index(r, c), color):
             return False
         
-        # Check connectivity **only when the board is full**
-        if not np.any(self.board.grid == 2):
-            if not self.board.check_consecutive_blocks():
-                self.board.grid[r, c] = 2  # Revert move
-                return False
+        # Check connectivity **only when the move fills the last empty cell**
+        if self.windows.empty == 1:
+            grid[r, c] = color  # Temporarily place the move
+            connected = self.board.check_consecutive_blocks()
+            grid[r, c] = 2  # Revert move
+            return connected
         
-        self.board.grid[r, c] = 2  # Revert move
         return True
 
     def check_2x2_cross(self, grid=None):
@@ -61,17 +120,7 @@ class Solver:
         """
         if grid is None:
             grid = self.board.grid
-            
-        for r in range(grid.shape[0] - 1):
-            for c in range(grid.shape[1] - 1):
-                block = grid[r:r+2, c:c+2].flatten()
-                if sorted(block) == [0, 0, 1, 1]:  # A cross shape
-                    # Check if it's a checkerboard pattern (diagonal cells match)
-                    if (grid[r, c] == grid[r+1, c+1] and 
-                        grid[r, c+1] == grid[r+1, c] and
-                        grid[r, c] != grid[r, c+1]):
-                        return False
-        return True
+        return not has_crosses(grid)
 
     def count_filled_neighbors(self, r, c, grid=None):
         """
@@ -106,42 +155,15 @@ class Solver:
         Returns:
             bool: True if all cells of the color form a single connected group
         """
-        visited = set()
-        start = None
-
-        # Find a starting point for BFS
-        for r in range(grid.shape[0]):
-            for c in range(grid.shape[1]):
-                if grid[r, c] == color:
-                    start = (r, c)
-                    break
-            if start:
-                break
-
-        if not start:
-            return True  # No cells of this color exist yet
-
-        queue = [start]
-        visited.add(start)
-
-        # BFS to find all connected cells of the same color
-        while queue:
-            r, c = queue.pop(0)
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < grid.shape[0] and 0 <= nc < grid.shape[1]:
-                    if (nr, nc) not in visited and grid[nr, nc] == color:
-                        visited.add((nr, nc))
-                        queue.append((nr, nc))
-
-        # Check if all cells of the given color were visited
-        total_cells = np.count_nonzero(grid == color)
-        return len(visited) == total_cells
+        return ConnectivityTracker.from_grid(grid).is_connected(color)
 
     def calculate_heuristic(self, grid):
         """
         Calculate heuristic value for A* search.
-        Lower values are better (goal is to minimize this value).
+        Lower values are better (goal is to minimize this value). The grid is packed
+        once and scored by the bitboard engine: empty cells, cells in monochrome 2x2
+        windows (x10), each disconnected color (+20), bounded regions (+50), color
+        imbalance, and checkerboard windows (+15).
         
         Args:
             grid (numpy.ndarray): Grid to evaluate
@@ -149,72 +171,12 @@ class Solver:
         Returns:
             int: Heuristic value (lower is better)
         """
-        # Count empty cells - fewer is better
-        empty_count = np.count_nonzero(grid == 2)
-        
-        # Check for 2x2 blocks of same color - penalize heavily
-        invalid_cells = set()
-        for r in range(grid.shape[0]-1):
-            for c in range(grid.shape[1]-1):
-                block = grid[r:r+2, c:c+2]
-                if np.all(block == 0) or np.all(block == 1):
-                    invalid_cells.update([(r,c), (r,c+1), (r+1,c), (r+1,c+1)])
-        invalid_blocks_penalty = len(invalid_cells) * 10
-        
-        # Check for connectivity - penalize disconnected regions
-        connectivity_penalty = 0
-        if np.count_nonzero(grid == 0) > 0 and not self.is_single_connected_group(grid, 0):
-            connectivity_penalty += 20
-        if np.count_nonzero(grid == 1) > 0 and not self.is_single_connected_group(grid, 1):
-            connectivity_penalty += 20
-        
-        # Check for bounded regions - penalize heavily
-        bounded_regions_penalty = 0
-        if self.has_bounded_regions(grid):
-            bounded_regions_penalty = 50
-        
-        # Check for balance between black and white - slight penalty for imbalance
-        black_count = np.count_nonzero(grid == 0)
-        white_count = np.count_nonzero(grid == 1)
-        balance_penalty = abs(black_count - white_count)
-        
-        # Check for 2x2 cross patterns
-        cross_penalty = 0 if self.check_2x2_cross(grid) else 15
-        
-        # Combine all factors
-        return empty_count + invalid_blocks_penalty + connectivity_penalty + bounded_regions_penalty + balance_penalty + cross_penalty
+        return self._heuristic_bits(*self.bitboard.pack(grid))
     
     def find_regions(self, grid, color):
         """Find all connected regions of a specific color."""
-        regions = []
-        visited = set()
-        
-        if not hasattr(self, 'disable_logging') or not self.disable_logging:
-            print(f"Finding regions of color {color}")
-        
-        for r in range(grid.shape[0]):
-            for c in range(grid.shape[1]):
-                if grid[r, c] == color and (r, c) not in visited:
-                    # Start a new region
-                    region = set()
-                    queue = [(r, c)]
-                    visited.add((r, c))
-                    
-                    while queue:
-                        curr_r, curr_c = queue.pop(0)
-                        region.add((curr_r, curr_c))
-                        
-                        for dr, dc in [(0,1), (1,0), (0,-1), (-1,0)]:
-                            nr, nc = curr_r + dr, curr_c + dc
-                            if 0 <= nr < grid.shape[0] and 0 <= nc < grid.shape[1]:
-                                if grid[nr, nc] == color and (nr, nc) not in visited:
-                                    visited.add((nr, nc))
-                                    queue.append((nr, nc))
-                    
-                    regions.append(region)
-        
-        if not hasattr(self, 'disable_logging') or not self.disable_logging:
-            print(f"Total regions found for color {color}: {len(regions)}")
+        regions = ConnectivityTracker.from_grid(grid).regions(color)
+        self.tracer.debug("Regions found", color=color, regions=len(regions))
         return regions
 
     def can_regions_connect(self, grid, region1, region2, empty_cells, blocking_color):
@@ -234,11 +196,11 @@ class Solver:
         
         # Use BFS to find a path from region1 to region2 through empty cells OR same-color cells
         visited = set()
-        queue = list(region1)  # Start from all cells in region1
+        queue = deque(region1)  # Start from all cells in region1
         visited.update(region1)
         
         while queue:
-            r, c = queue.pop(0)
+            r, c = queue.popleft()
             
             # Check if we've reached region2
             for dr, dc in [(0,1), (1,0), (0,-1), (-1,0)]:
@@ -257,8 +219,7 @@ class Solver:
                         queue.append((nr, nc))
         
         # If we've exhausted all possible paths and haven't reached region2, they can't be connected
-        if not hasattr(self, 'disable_logging') or not self.disable_logging:
-            print(f"  No path found between regions of color {color}")
+        self.tracer.debug("No path found between regions", color=color)
         return False
 
     def has_bounded_regions(self, grid):
@@ -267,83 +228,11 @@ class Solver:
         A bounded region is a set of empty cells surrounded by cells of the opposite color,
         making it impossible for the other color to maintain connectivity.
         """
-        # For each color, find all regions and check if any are bounded
-        for color in [0, 1]:
-            opposite_color = 1 - color
-            
-            # Find all empty cells
-            empty_cells = set(map(tuple, np.argwhere(grid == 2)))
-            if not empty_cells:
-                continue
-                
-            # Find all regions of this color
-            color_regions = self.find_regions(grid, color)
-            
-            # If there's more than one region, check if they can be connected
-            if len(color_regions) > 1:
-                if not hasattr(self, 'disable_logging') or not self.disable_logging:
-                    print(f"Found {len(color_regions)} regions of color {color}, checking connectivity")
-                
-                # For each pair of regions, check if they can be connected
-                for i in range(len(color_regions)):
-                    for j in range(i+1, len(color_regions)):
-                        # If these regions can't be connected, the board is invalid
-                        if not self.can_regions_connect(grid, color_regions[i], color_regions[j], empty_cells, opposite_color):
-                            if not hasattr(self, 'disable_logging') or not self.disable_logging:
-                                print(f"Color {color} has disconnected regions that cannot be connected")
-                            return True
-        
-        # Check for empty regions completely surrounded by a single color
-        empty_cells = set(map(tuple, np.argwhere(grid == 2)))
-        visited_empty = set()
-        
-        for r, c in empty_cells:
-            if (r, c) in visited_empty:
-                continue
-                    
-            # Start a new region
-            region = set()
-            queue = [(r, c)]
-            region.add((r, c))
-            visited_empty.add((r, c))
-            
-            # Track which colors border this region
-            borders_black = False
-            borders_white = False
-            
-            while queue:
-                curr_r, curr_c = queue.pop(0)
-                
-                # Check all neighbors
-                for dr, dc in [(0,1), (1,0), (0,-1), (-1,0)]:
-                    nr, nc = curr_r + dr, curr_c + dc
-                    if 0 <= nr < grid.shape[0] and 0 <= nc < grid.shape[1]:
-                        if grid[nr, nc] == 2:  # Empty cell
-                            if (nr, nc) not in visited_empty:
-                                visited_empty.add((nr, nc))
-                                region.add((nr, nc))
-                                queue.append((nr, nc))
-                        elif grid[nr, nc] == 0:
-                            borders_black = True
-                        elif grid[nr, nc] == 1:
-                            borders_white = True
-            
-            # If this region is bordered by only one color, it's bounded
-            # EXCEPTION: Single empty cells are not considered bounded, as they can be filled with either color
-            if (borders_black and not borders_white) or (borders_white and not borders_black):
-                # Special case: If it's a single empty cell, it's not bounded (can be filled with either color)
-                if len(region) == 1:
-                    continue
-                    
-                # A region bordered by only one color is problematic (if more than 1 cell)
-                if not hasattr(self, 'disable_logging') or not self.disable_logging:
-                    if borders_black:
-                        print(f"Found empty region of size {len(region)} bordered only by BLACK")
-                    else:
-                        print(f"Found empty region of size {len(region)} bordered only by WHITE")
-                return True
-        
-        return False
+        black, white = self.bitboard.pack(grid)
+        bounded = self.regions.is_dead(black, white)
+        if bounded:
+            self.tracer.debug("Found regions that can never be connected")
+        return bounded
 
     def get_preferred_colors(self, r, c, grid):
         """
@@ -379,6 +268,240 @@ class Solver:
         else:
             return [0, 1]
 
+
+    def _is_valid_bits(self, black, white, i, color):
+        """
+        Bitboard version of is_valid_move for a search state.
+        
+        Args:
+            black, white (int): Bitboard masks of the state
+            i (int): Bit index of the cell to fill
+            color (int): Color to place (0=black, 1=white)
+            
+        Returns:
+            bool: True if the move is valid, False otherwise
+        """
+        bit = 1 << i
+        if (black | white) & bit:  # Ensure the cell is empty
+            return False
+        
+        if color == 0:
+            black |= bit
+            same = black
+        else:
+            white |= bit
+            same = white
+        
+        # Reject the move if one of the windows containing the new cell is monochrome
+        if self.windows.completes_block(same, i):
+            return False
+        
+        # Check connectivity **only when the board is full**
+        if black | white == self.bitboard.full:
+            return self._is_connected_bits(black, white)
+        return True
+
+    def _is_connected_bits(self, black, white):
+        """Check that both colors are present and each forms a single connected group."""
+        return (black != 0 and white != 0 and
+                self.bitboard.is_connected(black) and self.bitboard.is_connected(white))
+
+    def _is_solution_bits(self, black, white):
+        """
+        Bitboard version of Board.check_win_condition() == "WIN".
+        
+        Args:
+            black, white (int): Bitboard masks of the state
+            
+        Returns:
+            bool: True if the state is a complete, valid solution
+        """
+        if black | white != self.bitboard.full:
+            return False
+        if self.bitboard.block_anchors(black) or self.bitboard.block_anchors(white):
+            return False
+        return self._is_connected_bits(black, white)
+
+    def _heuristic_bits(self, black, white):
+        """
+        Bitboard version of calculate_heuristic.
+        
+        Args:
+            black, white (int): Bitboard masks of the state
+            
+        Returns:
+            int: Heuristic value (lower is better)
+        """
+        return self.heuristic.evaluate(black, white)[0]
+
+    def _select_cell(self, black, white):
+        """
+        Pick the most constrained empty cell (most filled neighbors). Ties go to the
+        first cell in row-major order, or to the lowest cell_rank when one is set.
+        
+        Args:
+            black, white (int): Bitboard masks of the state
+            
+        Returns:
+            int: Bit index of the chosen cell, or -1 if the board is full
+        """
+        filled = black | white
+        best, best_count = -1, -1
+        rank = self.cell_rank
+        if rank is not None:
+            for i in iter_bits(self.bitboard.full & ~filled):
+                count = (self.bitboard.neighbor_masks[i] & filled).bit_count()
+                if count > best_count or (count == best_count and rank[i] < rank[best]):
+                    best, best_count = i, count
+            return best
+        
+        for i in iter_bits(self.bitboard.full & ~filled):
+            count = (self.bitboard.neighbor_masks[i] & filled).bit_count()
+            if count > best_count:
+                best, best_count = i, count
+                if count == 4:
+                    break
+        return best
+
+    def _preferred_colors_bits(self, black, white, i):
+        """Bitboard version of get_preferred_colors."""
+        neighbors = self.bitboard.neighbor_masks[i]
+        if (neighbors & black).bit_count() > (neighbors & white).bit_count():
+            return [1, 0]
+        return [0, 1]
+
+    def _dfs_colors(self, black, white, i):
+        """
+        Colors for DFS to try on cell i, in the reverse of the order they are tried,
+        since the search pops them from the end.
+        """
+        if self.color_order == "black-first":
+            return [1, 0]
+        if self.color_order == "preferred" and i >= 0:
+            return self._preferred_colors_bits(black, white, i)[::-1]
+        return [0, 1]
+
+    def _expand(self, black, white, colors=None, parent_dead=False):
+        """
+        Generate the children of a state by filling its most constrained cell.
+        
+        Args:
+            black, white (int): Bitboard masks of the state
+            colors (list, optional): Color order to try, preferred order if None
+            parent_dead (bool): Whether the state itself has bounded regions; children of
+                a state that passed the check only need the incremental check
+            
+        Returns:
+            list: (cell index, color, black, white) for every valid, unbounded child
+        """
+        i = self._select_cell(black, white)
+        if i < 0 or (1 << i) & self.fixed_mask:
+            return []
+        
+        if colors is None:
+            colors = self._preferred_colors_bits(black, white, i)
+        
+        children = []
+        for color in colors:
+            if self._is_valid_bits(black, white, i, color):
+                if color == 0:
+                    child = self._settle(black | (1 << i), white, i, parent_dead)
+                else:
+                    child = self._settle(black, white | (1 << i), i, parent_dead)
+                if child is not None:
+                    children.append((i, color, child[0], child[1]))
+        return children
+
+    def _settle(self, black, white, i, parent_dead=False):
+        """
+        Apply constraint propagation after cell i was filled, then the bounded-region check.
+        
+        Args:
+            black, white (int): Bitboard masks of the state, including cell i
+            i (int): Bit index of the cell that was just filled
+            parent_dead (bool): Whether the state before the move has bounded regions
+            
+        Returns:
+            tuple: (black, white) with forced cells filled, or None if the state is pruned
+        """
+        settled = self.propagator.propagate(black, white)
+        if settled is None:
+            return None
+        new_black, new_white = settled
+        
+        if new_black | new_white == self.bitboard.full:
+            return settled if self._is_connected_bits(new_black, new_white) else None
+        
+        # The incremental check only holds when cell i is the single change
+        if parent_dead or settled != (black, white):
+            bounded = self.regions.is_dead(new_black, new_white)
+        else:
+            bounded = self.regions.is_dead_after(new_black, new_white, i)
+        return None if bounded else settled
+
+    def _propagate_root(self, black, white):
+        """
+        Apply constraint propagation to the initial state before searching.
+        If that fills the whole board, the solution is written to the board grid.
+        
+        Args:
+            black, white (int): Bitboard masks of the initial state
+            
+        Returns:
+            tuple: (black, white) after propagation, or None if the puzzle has no solution
+        """
+        settled = self.propagator.propagate(black, white)
+        if settled is None:
+            self.tracer.info("Propagation found a contradiction in the initial board")
+            return None
+        
+        forced = (settled[0] | settled[1]) & ~(black | white)
+        self.stats["propagated"] = forced.bit_count()
+        self.tracer.info("Propagation filled cells before searching", cells=forced.bit_count())
+        
+        if settled[0] | settled[1] == self.bitboard.full:
+            if not self._is_solution_bits(*settled):
+                return None
+            self.board.grid = self.bitboard.to_grid(*settled)
+            self.tracer.info("Puzzle solved by propagation alone")
+        return settled
+
+    def _begin_solve(self):
+        """Reset the statistics and start the budget clock for a new solve."""
+        self.stats = {"states_explored": 0, "propagated": 0}
+        self.control.start()
+
+    def _stop(self, reason, states_explored):
+        """
+        Record that a search was stopped early by its control.
+        
+        Args:
+            reason (str): Why the search stopped (cancelled, time limit or node limit)
+            states_explored (int): States explored before stopping
+            
+        Returns:
+            bool: Always False, as no solution was found
+        """
+        self.stats["states_explored"] = states_explored
+        self.stats["stopped"] = reason
+        self.tracer.info("Search stopped", reason=reason, states_explored=states_explored)
+        return False
+
+    def _publish(self, black, white):
+        """
+        Publish an explored state as the latest snapshot. When a display is attached,
+        the board grid is updated and redrawn only as often as the frame throttle allows,
+        so the search is not slowed down to the speed of rendering.
+        """
+        count = self.snapshots.publish(black, white)
+        if self.draw_callback and self.frame_throttle.ready(count):
+            self.board.grid = self.bitboard.to_grid(black, white)
+            self.draw_callback()
+
+    def _board_rows(self, black, white):
+        """Format a bitboard state as text rows for the log."""
+        return self.bitboard.format_rows(black, white)
+
     def a_star_solve(self):
         """
         Solve the board using A* search algorithm.
@@ -388,232 +511,622 @@ class Solver:
         Returns:
             bool: True if a solution was found, False otherwise
         """
-        print("\n=== Starting A* Search ===")
-        # Initialize visited states set to avoid revisiting
-        visited = set()
+        tracer = self.tracer
+        tracer.info("Starting A* search")
+        self._begin_solve()
+        # Transposition table of visited states to avoid revisiting
+        visited = self.transpositions
+        visited.clear()
         
-        # Priority queue for A* search
+        # Priority queue for A* search, holding (f-score, node, black, white, hash, terms)
+        # where terms are the state's HeuristicTerms, from which its children are scored.
+        # Nodes live in an arena of flat arrays indexed by node number: the parent node,
+        # the move that led to the node (cell * 2 + color) and the depth. A path is only
+        # rebuilt from the parent pointers once a solution is found.
         pq = []
+        parents = array("l", [-1])
+        moves = array("l", [-1])
+        depths = array("l", [0])
+        self.solution_path = None
         
-        # Initial state
-        initial_state = self.board.grid.copy()
-        initial_state_tuple = tuple(map(tuple, initial_state))
+        # Initial state as a (black, white) bitboard pair, with forced cells filled in
+        root = self._propagate_root(*self.bitboard.pack(self.board.grid))
+        if root is None:
+            return False
+        black, white = root
+        if black | white == self.bitboard.full:
+            return True
 
         # Initial priority is based on heuristic of initial state
-        initial_heuristic = self.calculate_heuristic(initial_state)
-        print(f"Initial state heuristic: {initial_heuristic}")
+        initial_heuristic, initial_terms = self.heuristic.evaluate(black, white)
+        tracer.info("Initial state heuristic", heuristic=initial_heuristic)
         
-        # Use a counter to break ties and ensure unique comparison
-        counter = 0
-        heapq.heappush(pq, (self.calculate_heuristic(initial_state), counter, initial_state_tuple, []))
-        visited.add(initial_state_tuple)
+        # The node number is unique and increasing, so it also breaks ties
+        initial_hash = self.zobrist.hash(black, white)
+        heapq.heappush(pq, (initial_heuristic, 0, black, white, initial_hash, initial_terms))
+        visited.add(initial_hash)
+        root_dead = self.regions.is_dead(black, white)
+        control = self.control
+        best_heuristic = initial_heuristic
         
         # Keep track of the number of states explored
         states_explored = 0
+        tracing = tracer.enabled(DEBUG)  # Read once so a quiet log costs nothing per state
         
-        # Create a flag to temporarily disable logging
-        self.disable_logging = True
-        
-        while pq and states_explored < 100000:  # Increased limit for more thorough search
+        node_limit = config.ASTAR_NODE_LIMIT
+        while pq:
+            if node_limit and len(parents) >= node_limit:
+                # The open set outgrew its budget: free it and continue with the
+                # memory-bounded IDA* from the start state
+                tracer.info("A* node limit reached, continuing with IDA*",
+                            states_explored=states_explored, nodes_generated=len(parents))
+                del pq[:], parents, moves, depths
+                visited.clear()
+                return self._ida_search(*root, initial_terms, root_dead, states_explored)
+
             # Get the state with lowest f-score (priority)
-            f_score, _, state_tuple, path = heapq.heappop(pq)
+            f_score, node, black, white, state_hash, terms = heapq.heappop(pq)
+            depth = depths[node]
             states_explored += 1
+            best_heuristic = min(best_heuristic, f_score - depth)
+            stop = control.step(states_explored, depth, len(pq), best_heuristic)
+            if stop:
+                return self._stop(stop, states_explored)
 
-            # Print detailed state every 10 states
-            if states_explored % 10 == 0:
-                print(f"\n--- A* State #{states_explored} ---")
-                print(f"Queue size: {len(pq)}, Current f-score: {f_score}")
-                print("Current board state:")
-                current_state = np.array([list(row) for row in state_tuple])
-                for row in current_state:
-                    print(" ".join(["■" if cell == 0 else "□" if cell == 1 else "·" for cell in row]))
-                
-                # Print top 3 states in queue (if available)
-                if len(pq) > 0:
-                    print("\nTop 3 states in priority queue:")
-                    top_states = sorted(pq)[:min(3, len(pq))]
-                    for i, (score, _, state_t, _) in enumerate(top_states):
-                        print(f"State {i+1}, f-score: {score}")
-                        state_arr = np.array([list(row) for row in state_t])
-                        empty_count = np.count_nonzero(state_arr == 2)
-                        print(f"Empty cells: {empty_count}")
-            
-            # Convert tuple back to numpy array
-            current_state = np.array([list(row) for row in state_tuple])
+            # Log the detailed state every 10 states
+            if tracing and states_explored % 10 == 0:
+                # Top 3 states in the queue in O(Q) instead of sorting it
+                top_states = [f"f-score {score}, empty cells {(self.bitboard.full & ~(top_black | top_white)).bit_count()}"
+                              for score, _, top_black, top_white, _, _ in heapq.nsmallest(3, pq)]
+                tracer.debug("A* state", state=states_explored, queue=len(pq), f_score=f_score,
+                             board=self._board_rows(black, white), top_of_queue=top_states)
             
             # Update the board for visualization
-            self.board.grid = current_state.copy()
-            if self.draw_callback:
-                self.draw_callback()
+            self._publish(black, white)
             
             # Check if we've reached a solution
-            if not np.any(current_state == 2):  # No empty cells
-                win_status = self.board.check_win_condition()
-                if win_status == "WIN":
-                    print(f"A* solution found after exploring {states_explored} states!")
+            if black | white == self.bitboard.full:  # No empty cells
+                if self._is_solution_bits(black, white):
+                    self.board.grid = self.bitboard.to_grid(black, white)
+                    self.solution_path = self._arena_path(node, parents, moves)
+                    self.stats["states_explored"] = states_explored
+                    tracer.info("A* solution found", states_explored=states_explored,
+                                depth=depth, nodes_generated=len(parents))
                     return True
                 continue
             
-            # Find all empty cells
-            empty_cells = list(zip(*np.where(current_state == 2)))
-            
-            # Prioritize cells with more filled neighbors (more constrained)
-            empty_cells.sort(key=lambda pos: -self.count_filled_neighbors(pos[0], pos[1], current_state))
-            
-            # Try each empty cell
-            for r, c in empty_cells[:1]:  # Only try the most constrained cell
-                # Skip if this cell is fixed
-                if (r, c) in self.fixed_cells:
-                    continue
-                
-                # Try colors in order determined by surrounding cells
-                colors_to_try = self.get_preferred_colors(r, c, current_state)
+            # Expand the most constrained cell, trying colors in preferred order
+            for cell, color, new_black, new_white in self._expand(black, white, parent_dead=root_dead and node == 0):
+                new_hash = self.zobrist.update(state_hash, black, white, new_black, new_white)
                 
-                for color in colors_to_try:
-                    # Check if this is a valid move
-                    original_board = self.board.grid.copy()
-                    self.board.grid = current_state.copy()
+                # Add to the table, skipping states that have been visited before
+                if visited.add(new_hash):
                     
-                    if self.is_valid_move(r, c, color):
-                        # Create a new state by filling this cell
-                        new_state = current_state.copy()
-                        new_state[r, c] = color
-                        
-                        # Check for bounded regions with logging disabled
-                        has_bounded = self.has_bounded_regions(new_state)
-                        
-                        if has_bounded:
-                            self.board.grid = original_board
-                            continue
-                        
-                        new_state_tuple = tuple(map(tuple, new_state))
-                        
-                        # Check if this state has been visited before
-                        if new_state_tuple not in visited:
-                            # Add to visited set
-                            visited.add(new_state_tuple)
-                            
-                            # Calculate new g_score (path cost)
-                            new_g_score = len(path) + 1
-                            
-                            # Calculate new f_score (g_score + heuristic)
-                            new_f_score = new_g_score + self.calculate_heuristic(new_state)
-                            
-                            # Add to priority queue with unique counter to break ties
-                            counter += 1
-                            new_path = path + [(r, c, color)]
-                            heapq.heappush(pq, (new_f_score, counter, new_state_tuple, new_path))
+                    # Calculate new f_score (g_score, the path cost, + heuristic). The
+                    # heuristic is derived from the parent's terms, and the expansion only
+                    # returns children without bounded regions.
+                    new_heuristic, new_terms = self.heuristic.child(terms, black, white, new_black, new_white)
+                    new_f_score = depth + 1 + new_heuristic
                     
-                    # Restore the original board
-                    self.board.grid = original_board
+                    # Record the child in the arena and queue it under its node number
+                    child = len(parents)
+                    parents.append(node)
+                    moves.append(cell * 2 + color)
+                    depths.append(depth + 1)
+                    heapq.heappush(pq, (new_f_score, child, new_black, new_white, new_hash, new_terms))
             
             # Periodically report progress
             if states_explored % 1000 == 0:
-                print(f"A* search: {states_explored} states explored, queue size: {len(pq)}")
+                tracer.info("A* search progress", states_explored=states_explored, queue=len(pq))
         
-        # Reset the logging flag
-        self.disable_logging = False
-        print(f"A* search exhausted after exploring {states_explored} states")
+        self.stats["states_explored"] = states_explored
+        tracer.info("A* search exhausted", states_explored=states_explored)
         return False  # No solution found
 
+    def _arena_path(self, node, parents, moves):
+        """
+        Rebuild the moves that lead to an A* node by following its parent pointers.
+        
+        Args:
+            node (int): Node number in the arena
+            parents, moves (array): Parent node and move (cell * 2 + color) per node
+            
+        Returns:
+            list: (r, c, color) moves from the start state to the node
+        """
+        path = []
+        while parents[node] >= 0:
+            cell, color = divmod(moves[node], 2)
+            path.append((*self.bitboard.position(cell), color))
+            node = parents[node]
+        path.reverse()
+        return path
+
+    def ida_star_solve(self):
+        """
+        Solve the board using Iterative Deepening A* (IDA*).
+        Each iteration is a depth-first search that only follows states whose f-score
+        (depth + heuristic) is within a bound; the next iteration raises the bound to the
+        lowest f-score that was cut off. Only the current path and the untried children
+        along it are kept, so memory grows with the depth instead of the number of states.
+
+        Returns:
+            bool: True if a solution was found, False otherwise
+        """
+        tracer = self.tracer
+        tracer.info("Starting IDA* search")
+        self._begin_solve()
+        self.solution_path = None
+
+        root = self._propagate_root(*self.bitboard.pack(self.board.grid))
+        if root is None:
+            return False
+        black, white = root
+        if black | white == self.bitboard.full:
+            return True
+
+        initial_heuristic, initial_terms = self.heuristic.evaluate(black, white)
+        tracer.info("Initial state heuristic", heuristic=initial_heuristic)
+        return self._ida_search(black, white, initial_terms, self.regions.is_dead(black, white))
+
+    def _ida_search(self, black, white, terms, root_dead, states_explored=0):
+        """
+        Run IDA* iterations from a state with a rising bound until one of them ends the search.
+
+        Args:
+            black, white (int): Bitboard masks of the start state
+            terms (HeuristicTerms): Heuristic terms of the start state
+            root_dead (bool): Whether the start state has bounded regions
+            states_explored (int): States already explored by this solve
+
+        Returns:
+            bool: True if a solution was found, False otherwise
+        """
+        bound = self.heuristic.score(terms)
+        while True:
+            status, next_bound, states_explored = self._ida_iteration(
+                black, white, terms, root_dead, bound, states_explored)
+            if status == SOLVED:
+                return True
+            if status != EXHAUSTED:
+                return self._stop(status, states_explored)
+            if next_bound is None:  # Nothing was cut off, so the whole tree was searched
+                self.stats["states_explored"] = states_explored
+                self.tracer.info("IDA* search exhausted", states_explored=states_explored)
+                return False
+            self.tracer.info("IDA* bound raised", bound=next_bound, states_explored=states_explored)
+            bound = next_bound
+
+    def _ida_iteration(self, black, white, terms, root_dead, bound, states_explored):
+        """
+        Search depth-first below a state, skipping children whose f-score exceeds the bound.
+
+        Args:
+            black, white (int): Bitboard masks of the start state
+            terms (HeuristicTerms): Heuristic terms of the start state
+            root_dead (bool): Whether the start state has bounded regions
+            bound (int): Highest f-score that is followed
+            states_explored (int): States already explored by this solve
+
+        Returns:
+            tuple: (status, next_bound, states_explored) where status is SOLVED, EXHAUSTED
+                or the control's reason to stop, and next_bound is the lowest f-score
+                that was cut off (None if none was)
+        """
+        tracer = self.tracer
+        control = self.control
+        next_bound = None
+        best_heuristic = self.heuristic.score(terms)
+        # One list of untried children, (move, black, white, terms), per level of the
+        # current path, sorted so the lowest f-score is popped first. The start state is
+        # the single entry of the first level; move is cell * 2 + color.
+        stack = [[(-1, black, white, terms)]]
+        path = []  # Moves from the start state to the current state
+
+        while stack:
+            pending = stack[-1]
+            if not pending:
+                stack.pop()
+                continue
+            move, black, white, terms = pending.pop()
+            depth = len(stack) - 1
+            if depth:
+                del path[depth - 1:]
+                path.append(move)
+
+            states_explored += 1
+            stop = control.step(states_explored, depth, len(stack), best_heuristic)
+            if stop:
+                return stop, next_bound, states_explored
+            self._publish(black, white)
+
+            if black | white == self.bitboard.full:
+                if self._is_solution_bits(black, white):
+                    self.board.grid = self.bitboard.to_grid(black, white)
+                    self.solution_path = [(*self.bitboard.position(m // 2), m % 2) for m in path]
+                    self.stats["states_explored"] = states_explored
+                    tracer.info("IDA* solution found", states_explored=states_explored,
+                                depth=depth, bound=bound)
+                    return SOLVED, next_bound, states_explored
+                continue
 
-    def dfs_solve(self):
+            # Score the children from this state's terms; the expansion only returns
+            # children without bounded regions
+            children = []
+            for cell, color, new_black, new_white in self._expand(black, white, parent_dead=root_dead and depth == 0):
+                new_heuristic, new_terms = self.heuristic.child(terms, black, white, new_black, new_white)
+                f_score = depth + 1 + new_heuristic
+                if f_score > bound:
+                    next_bound = f_score if next_bound is None else min(next_bound, f_score)
+                    continue
+                best_heuristic = min(best_heuristic, new_heuristic)
+                children.append((f_score, cell * 2 + color, new_black, new_white, new_terms))
+            children.sort(key=lambda child: child[0])
+            stack.append([child[1:] for child in reversed(children)])  # Ties keep the preferred color first
+
+        return EXHAUSTED, next_bound, states_explored
+
+
+    def dfs_solve(self, workers=None):
         """
         Solve the board using Depth-First Search (DFS).
         DFS explores as far as possible along each branch before backtracking.
+        The board is changed in place and every move is recorded on an undo trail,
+        so memory grows with the search depth rather than the number of explored states.
+        Each branch fixes the same cell to a different color, so no state can be reached
+        twice and no visited set is needed.
+        With more than one worker, the top of the search tree is split into subproblems
+        that are searched in parallel processes (see parallel_dfs).
+        
+        Args:
+            workers (int, optional): Number of processes (config.DFS_WORKERS by default)
         
         Returns:
             bool: True if a solution was found, False otherwise
         """
-        print("Starting DFS solver...")
-        stack = []
-        visited_states = set()  # Track visited states to avoid cycles
-        empty_cells = set(map(tuple, np.argwhere(self.board.grid == 2)))  # All empty cells
-        states_explored = 0
+        tracer = self.tracer
+        tracer.info("Starting DFS solver")
+        self._begin_solve()
+        black, white = self.bitboard.pack(self.board.grid)
+        empty_count = (self.bitboard.full & ~(black | white)).bit_count()
 
-        if not empty_cells:
+        if not empty_count:
             return self.board.check_win_condition() == "WIN"
         
-        print(f"Initial board has {len(empty_cells)} empty cells")
+        tracer.info("Initial board", empty_cells=empty_count)
+
+        root = self._propagate_root(black, white)
+        if root is None:
+            return False
+        black, white = root
+        if black | white == self.bitboard.full:
+            return True
 
-        # Initialize stack with both colors for the first empty cell
-        start_r, start_c = next(iter(empty_cells))
+        root_dead = self.regions.is_dead(black, white)
+        workers = workers or config.DFS_WORKERS
+        if workers > 1:
+            return self._parallel_dfs(black, white, root_dead, workers)
         
-        for color in [0, 1]:  
-            if self.is_valid_move(start_r, start_c, color):
-                new_grid = self.board.grid.copy()
-                new_grid[start_r, start_c] = color
-                
-                # Check for bounded regions
-                self.disable_logging = True
-                has_bounded = self.has_bounded_regions(new_grid)
-                self.disable_logging = False
-                
-                if not has_bounded:
-                    state_tuple = tuple(map(tuple, new_grid))
-                    stack.append((start_r, start_c, color, new_grid))
-                    visited_states.add(state_tuple)
-                    print(f"Added initial move: ({start_r}, {start_c}) = {color}")
+        status, solution, states_explored = self._dfs_search(black, white, root_dead)
+        if status == SOLVED:
+            self.board.grid = self.bitboard.to_grid(*solution)
+            self.stats["states_explored"] = states_explored
+            tracer.info("DFS solution found", states_explored=states_explored)
+            return True
+        if status != EXHAUSTED:
+            return self._stop(status, states_explored)
+
+        self.stats["states_explored"] = states_explored
+        tracer.info("DFS search exhausted", states_explored=states_explored)
+        return False  # No solution found
+
+    def _dfs_search(self, black, white, root_dead=False, should_split=None):
+        """
+        Run the in-place DFS below a state until the first solution.
+        
+        Args:
+            black, white (int): Bitboard masks of the state to search from
+            root_dead (bool): Whether that state has bounded regions
+            should_split (callable, optional): Called with the number of states explored
+                so far; when it returns True the search stops and hands back its
+                unexplored branches instead of searching them. The siblings generated
+                for the branches are not counted as explored states
+            
+        Returns:
+            tuple: (status, payload, states explored) where status is SOLVED with the
+                solution masks, EXHAUSTED with None, SPLIT with a list of (black, white)
+                states left to search, or the control's reason to stop with None
+        """
+        walk = self._dfs_walk(black, white, root_dead, should_split)
+        try:
+            solution_black, solution_white, states_explored = next(walk)
+        except StopIteration as finished:
+            return finished.value
+        walk.close()
+        return SOLVED, (solution_black, solution_white), states_explored
+
+    def _dfs_walk(self, black, white, root_dead=False, should_split=None):
+        """
+        Generator behind _dfs_search that keeps searching after each solution, so the
+        caller decides how many solutions it needs. Nothing is copied per state; only
+        the masks of a solution are handed out.
+        
+        Args:
+            black, white (int): Bitboard masks of the state to search from
+            root_dead (bool): Whether that state has bounded regions
+            should_split (callable, optional): As for _dfs_search
+            
+        Yields:
+            tuple: (black, white, states explored so far) for every solution
+            
+        Returns:
+            tuple: (status, payload, states explored) with status EXHAUSTED, SPLIT or
+                the control's reason to stop, as for _dfs_search
+        """
+        state = SearchState(self.board.size)
+        state.load(black, white)
+        if state.is_full():
+            if state.is_solved():
+                yield black, white, 0
+            return EXHAUSTED, None, 0
+        states_explored = 0
+        
+        # One frame per depth: [cell, colors left to try, trail length before the move]
+        # Colors are popped from the end, so by default white is tried before black
+        i = self._select_cell(black, white)
+        stack = [[i, self._dfs_colors(black, white, i), 0]]
+        tracer = self.tracer
+        tracing = tracer.enabled(DEBUG)  # Read once so a quiet log costs nothing per state
+        control = self.control
 
         while stack:
-            r, c, color, current_grid = stack.pop()  # DFS pops last added state (LIFO)
+            frame = stack[-1]
+            i, colors, mark = frame
+            state.undo_to(mark)  # Backtrack out of the previous sibling
+            
+            if i < 0 or (1 << i) & self.fixed_mask or not colors:
+                stack.pop()
+                continue
+            
+            color = colors.pop()
+            if not self._place_checked(state, i, color, root_dead and len(stack) == 1):
+                continue
             states_explored += 1
+            stop = control.step(states_explored, len(stack), len(stack))
+            if stop:
+                return stop, None, states_explored
             
-            # Print detailed state every 10 states
-            if states_explored % 10 == 0:
-                print(f"\n--- DFS State #{states_explored} ---")
-                print(f"Stack size: {len(stack)}")
-                print(f"Current position: ({r}, {c}) = {color}")
-                print("Current board state:")
-                for row in current_grid:
-                    print(" ".join(["■" if cell == 0 else "□" if cell == 1 else "·" for cell in row]))
-                
-                # Print top of stack (if available)
-                if stack:
-                    print("\nTop of stack:")
-                    top_r, top_c, top_color, _ = stack[-1]
-                    print(f"Next position to explore: ({top_r}, {top_c}) = {top_color}")
-                    empty_count = np.count_nonzero(current_grid == 2)
-                    print(f"Empty cells remaining: {empty_count}")
-            
-            self.board.grid = current_grid  # Update board state
-
-            if self.draw_callback:
-                self.draw_callback()  # Update the display
-
-            if not np.any(current_grid == 2):  # Board is full
-                if self.board.check_win_condition() == "WIN":
-                    print(f"DFS solution found after exploring {states_explored} states!")
-                    return True
+            # Log the detailed state every 10 states
+            if tracing and states_explored % 10 == 0:
+                tracer.debug("DFS state", state=states_explored, stack=len(stack),
+                             position=self.bitboard.position(i), color=color, empty_cells=state.windows.empty,
+                             board=self._board_rows(state.black, state.white))
+            
+            self._publish(state.black, state.white)  # Update the display
+
+            if state.is_full():  # Board is full
+                if state.is_solved():
+                    yield state.black, state.white, states_explored
                 continue
 
-            # Expand to all valid empty neighbors with both colors
-            empty_cells = list(zip(*np.where(current_grid == 2)))
-            # Prioritize cells with more filled neighbors
-            empty_cells.sort(key=lambda pos: -self.count_filled_neighbors(pos[0], pos[1], current_grid))
-            
-            next_cells = empty_cells[:1]  # Only try the most constrained cell
-            
-            for nr, nc in next_cells:
-                if (nr, nc) not in self.fixed_cells:
-                    for new_color in [0, 1]:  # Try both black and white
-                        if self.is_valid_move(nr, nc, new_color):
-                            new_grid = current_grid.copy()
-                            new_grid[nr, nc] = new_color
-                            
-                            # Check for bounded regions
-                            self.disable_logging = True
-                            has_bounded = self.has_bounded_regions(new_grid)
-                            self.disable_logging = False
-                            
-                            if not has_bounded:
-                                state_tuple = tuple(map(tuple, new_grid))
-                                if state_tuple not in visited_states:
-                                    stack.append((nr, nc, new_color, new_grid))
-                                    visited_states.add(state_tuple)
-
-        print(f"DFS search exhausted after exploring {states_explored} states")
-        return False  # No solution found
+            if should_split is not None and should_split(states_explored):
+                branches = self._unexplored_branches(state, stack, root_dead)
+                return SPLIT, branches, states_explored
+
+            # Go one level deeper on the most constrained cell
+            i = self._select_cell(state.black, state.white)
+            stack.append([i, self._dfs_colors(state.black, state.white, i), len(state.trail)])
+
+        return EXHAUSTED, None, states_explored
+
+    def _unexplored_branches(self, state, stack, root_dead=False):
+        """
+        Turn the rest of a DFS into independent subproblems: the current state, whose
+        subtree has not been entered yet, followed by every sibling still waiting on the
+        stack, deepest first so the order matches the one DFS would have used.
+        
+        Args:
+            state (SearchState): Current in-place state; it is rewound by this call
+            stack (list): DFS frames of [cell, colors left to try, trail mark]
+            root_dead (bool): Whether the root of the search has bounded regions
+            
+        Returns:
+            list: (black, white) states that together cover the unexplored search space
+        """
+        branches = [(state.black, state.white)]
+        for depth in range(len(stack) - 1, -1, -1):
+            i, colors, mark = stack[depth]
+            for color in reversed(colors):
+                state.undo_to(mark)
+                if self._place_checked(state, i, color, root_dead and depth == 0):
+                    branches.append((state.black, state.white))
+        return branches
+
+    def _split_states(self, black, white, root_dead, depth):
+        """
+        Enumerate every consistent assignment of the next most constrained cells,
+        one cell per level, as the starting points of a parallel DFS.
+        
+        Args:
+            black, white (int): Bitboard masks of the root state
+            root_dead (bool): Whether the root state has bounded regions
+            depth (int): Number of cells to assign
+            
+        Returns:
+            tuple: (list of (black, white) states in DFS order, solution masks found
+                while splitting or None, number of states generated)
+        """
+        states = [(black, white)]
+        generated = 0
+        for level in range(depth):
+            children = []
+            for parent_black, parent_white in states:
+                i = self._select_cell(parent_black, parent_white)
+                colors = self._dfs_colors(parent_black, parent_white, i)[::-1]
+                for _, _, child_black, child_white in self._expand(parent_black, parent_white, colors,
+                                                                  root_dead and level == 0):
+                    generated += 1
+                    if child_black | child_white == self.bitboard.full:
+                        if self._is_solution_bits(child_black, child_white):
+                            return [], (child_black, child_white), generated
+                        continue
+                    children.append((child_black, child_white))
+            states = children
+            if not states:
+                break
+        return states, None, generated
+
+    def _parallel_dfs(self, black, white, root_dead, workers):
+        """
+        Split the search tree at a shallow depth and search the subtrees in parallel.
+        
+        Args:
+            black, white (int): Bitboard masks of the propagated root state
+            root_dead (bool): Whether the root state has bounded regions
+            workers (int): Number of processes
+            
+        Returns:
+            bool: True if a solution was found, False otherwise
+        """
+        tracer = self.tracer
+        states, solution, generated = self._split_states(black, white, root_dead, config.DFS_SPLIT_DEPTH)
+        self.stats["subproblems"] = len(states)
+        tracer.info("Split search tree", subproblems=len(states), depth=config.DFS_SPLIT_DEPTH, workers=workers)
+        if solution is None and states:
+            # The split itself may already use up a small budget
+            stop = self.control.step(generated, config.DFS_SPLIT_DEPTH, len(states))
+            if stop:
+                return self._stop(stop, generated)
+
+        if solution is None and states:
+            solution, stats = search_subproblems(self.board.grid, states, workers, self.control,
+                                                 self.color_order, self.cell_rank, generated)
+            self.stats.update(stats)
+        self.stats["states_explored"] = self.stats.get("states_explored", 0) + generated
+        states_explored = self.stats["states_explored"]
+        
+        if solution is None:
+            if self.stats.get("stopped"):
+                return self._stop(self.stats["stopped"], states_explored)
+            tracer.info("DFS search exhausted", states_explored=states_explored)
+            return False
+        
+        self.board.grid = self.bitboard.to_grid(*solution)
+        self._publish(*solution)
+        tracer.info("DFS solution found", states_explored=states_explored,
+                    subproblems=self.stats.get("subproblems"))
+        return True
+
+    def parallel_dfs_solve(self):
+        """
+        Solve the board with DFS split across one process per CPU.
+        
+        Returns:
+            bool: True if a solution was found, False otherwise
+        """
+        return self.dfs_solve(workers=max(2, multiprocessing.cpu_count()))
+
+    def iter_solutions(self):
+        """
+        Enumerate every solution of the board, lazily.
+        The same in-place DFS and pruning as dfs_solve is used and continues after each
+        solution, so only the solutions themselves are ever copied. The board grid is
+        not changed; stats["solutions"] counts the solutions yielded so far.
+        
+        Yields:
+            numpy.ndarray: Each solution grid
+        """
+        for black, white in self._solution_masks():
+            yield self.bitboard.to_grid(black, white)
+
+    def count_solutions(self, limit=None):
+        """
+        Count the solutions of the board, stopping early at a limit.
+        A limit of 2 is enough to tell unique puzzles apart and stops the search at the
+        second solution. Like the other search modes, the bounded-region pruning assumes
+        the givens include both colors.
+        
+        Args:
+            limit (int, optional): Stop counting once this many solutions are found
+            
+        Returns:
+            int: Number of solutions found; incomplete if stats["stopped"] is set
+        """
+        count = 0
+        for _ in self._solution_masks():
+            count += 1
+            if limit and count >= limit:
+                break
+        self.tracer.info("Solutions counted", solutions=count, limit=limit,
+                         states_explored=self.stats["states_explored"])
+        return count
+
+    def has_unique_solution(self):
+        """Return True if the board has exactly one solution."""
+        return self.count_solutions(limit=2) == 1
+
+    def _solution_masks(self):
+        """
+        Generator behind iter_solutions and count_solutions.
+        
+        Yields:
+            tuple: (black, white) masks of every solution
+        """
+        self._begin_solve()
+        self.stats["solutions"] = 0
+        black, white = self.bitboard.pack(self.board.grid)
+        settled = self.propagator.propagate(black, white)
+        if settled is None:
+            return
+        self.stats["propagated"] = ((settled[0] | settled[1]) & ~(black | white)).bit_count()
+        black, white = settled
+        
+        walk = self._dfs_walk(black, white, self.regions.is_dead(black, white))
+        while True:
+            try:
+                solution_black, solution_white, states_explored = next(walk)
+            except StopIteration as finished:
+                status, _, states_explored = finished.value
+                self.stats["states_explored"] = states_explored
+                if status != EXHAUSTED:
+                    self._stop(status, states_explored)
+                return
+            self.stats["states_explored"] = states_explored
+            self.stats["solutions"] += 1
+            yield solution_black, solution_white
+
+    def _place_checked(self, state, i, color, parent_dead=False):
+        """
+        Try a move on an in-place search state, keeping it only if it passes the same
+        checks as is_valid_move and has_bounded_regions. Cells forced by constraint
+        propagation are placed along with it.
+        
+        Args:
+            state (SearchState): State to modify
+            i (int): Bit index of the cell to fill
+            color (int): Color to place (0=black, 1=white)
+            parent_dead (bool): Whether the state before the move has bounded regions
+            
+        Returns:
+            bool: True if the move was placed, False if it was rejected (state unchanged)
+        """
+        if not state.can_place(i, color):
+            return False
+        mark = len(state.trail)
+        state.place(i, color)
+        
+        settled = self._settle(state.black, state.white, i, parent_dead)
+        if settled is None:
+            state.undo_to(mark)
+            return False
+        
+        # Record the forced cells on the trail so backtracking removes them too
+        new_black, new_white = settled
+        for j in iter_bits(new_black & ~state.black):
+            state.place(j, 0)
+        for j in iter_bits(new_white & ~state.white):
+            state.place(j, 1)
+        return True
 
 
     def bfs_solve(self):
@@ -624,90 +1137,219 @@ class Solver:
         Returns:
             bool: True if a solution was found, False otherwise
         """
-        print("Starting BFS solver...")
+        tracer = self.tracer
+        tracer.info("Starting BFS solver")
+        self._begin_solve()
         queue = deque()
-        visited_states = set()
-        empty_cells = set(map(tuple, np.argwhere(self.board.grid == 2)))  # All empty cells
+        visited_states = self.transpositions
+        visited_states.clear()
+        black, white = self.bitboard.pack(self.board.grid)
         states_explored = 0
 
-        if not empty_cells:
+        if black | white == self.bitboard.full:
             return self.board.check_win_condition() == "WIN"
 
-        # Initialize queue with both colors for the first empty cell
-        start_r, start_c = next(iter(empty_cells))
-        for color in [0, 1]:  
-            if self.is_valid_move(start_r, start_c, color):
-                new_grid = self.board.grid.copy()
-                new_grid[start_r, start_c] = color
-                
-                # Check for bounded regions
-                self.disable_logging = True
-                has_bounded = self.has_bounded_regions(new_grid)
-                self.disable_logging = False
-                
-                if not has_bounded:
-                    state_tuple = tuple(map(tuple, new_grid))
-                    if state_tuple not in visited_states:
-                        queue.append((start_r, start_c, color, new_grid))
-                        visited_states.add(state_tuple)
+        root = self._propagate_root(black, white)
+        if root is None:
+            return False
+        black, white = root
+        if black | white == self.bitboard.full:
+            return True
 
+        # Initialize queue with both colors for the most constrained empty cell
+        root_hash = self.zobrist.hash(black, white)
+        for i, color, new_black, new_white in self._expand(black, white, [0, 1], self.regions.is_dead(black, white)):
+            new_hash = self.zobrist.update(root_hash, black, white, new_black, new_white)
+            queue.append((i, color, new_black, new_white, new_hash))
+            visited_states.add(new_hash)
+
+        tracing = tracer.enabled(DEBUG)  # Read once so a quiet log costs nothing per state
+        control = self.control
+        root_filled = (black | white).bit_count()
         while queue:
-            r, c, color, current_grid = queue.popleft()
+            i, color, black, white, state_hash = queue.popleft()
             states_explored += 1
+            stop = control.step(states_explored, (black | white).bit_count() - root_filled, len(queue))
+            if stop:
+                return self._stop(stop, states_explored)
             
-            # Print detailed state every 10 states
-            if states_explored % 10 == 0:
-                print(f"\n--- BFS State #{states_explored} ---")
-                print(f"Queue size: {len(queue)}")
-                print(f"Current position: ({r}, {c}) = {color}")
-                print("Current board state:")
-                for row in current_grid:
-                    print(" ".join(["■" if cell == 0 else "□" if cell == 1 else "·" for cell in row]))
-                
-                # Print front of queue (if available)
-                if queue:
-                    print("\nFront of queue:")
-                    front_r, front_c, front_color, _ = queue[0]
-                    print(f"Next position to explore: ({front_r}, {front_c}) = {front_color}")
-                    empty_count = np.count_nonzero(current_grid == 2)
-                    print(f"Empty cells remaining: {empty_count}")
+            # Log the detailed state every 10 states
+            if tracing and states_explored % 10 == 0:
+                front = queue[0] if queue else None  # Next state to explore
+                tracer.debug("BFS state", state=states_explored, queue=len(queue),
+                             position=self.bitboard.position(i), color=color,
+                             empty_cells=(self.bitboard.full & ~(black | white)).bit_count(),
+                             next_position=self.bitboard.position(front[0]) if front else None,
+                             next_color=front[1] if front else None,
+                             board=self._board_rows(black, white))
                 
-            self.board.grid = current_grid  # Update board state
-
             # Visualize in Pygame
-            if self.draw_callback:
-                self.draw_callback()
+            self._publish(black, white)
 
-            if not np.any(current_grid == 2):  # Board is full
-                if self.board.check_win_condition() == "WIN":
-                    print(f"BFS solution found after exploring {states_explored} states!")
+            if black | white == self.bitboard.full:  # Board is full
+                if self._is_solution_bits(black, white):
+                    self.board.grid = self.bitboard.to_grid(black, white)
+                    self.stats["states_explored"] = states_explored
+                    tracer.info("BFS solution found", states_explored=states_explored)
                     return True
                 continue
 
-            # Find all empty cells
-            empty_cells = list(zip(*np.where(current_grid == 2)))
-            # Prioritize cells with more filled neighbors
-            empty_cells.sort(key=lambda pos: -self.count_filled_neighbors(pos[0], pos[1], current_grid))
-            
-            next_cells = empty_cells[:1]  # Only try the most constrained cell
-            
-            for nr, nc in next_cells:
-                if (nr, nc) not in self.fixed_cells:
-                    for new_color in [0, 1]:  # Try both black and white
-                        if self.is_valid_move(nr, nc, new_color):
-                            new_grid = current_grid.copy()
-                            new_grid[nr, nc] = new_color
-                            
-                            # Check for bounded regions
-                            self.disable_logging = True
-                            has_bounded = self.has_bounded_regions(new_grid)
-                            self.disable_logging = False
-                            
-                            if not has_bounded:
-                                state_tuple = tuple(map(tuple, new_grid))
-                                if state_tuple not in visited_states:
-                                    queue.append((nr, nc, new_color, new_grid))
-                                    visited_states.add(state_tuple)
-
-        print(f"BFS search exhausted after exploring {states_explored} states")
+            # Expand the most constrained cell with both colors
+            for child_i, child_color, new_black, new_white in self._expand(black, white, [0, 1]):
+                new_hash = self.zobrist.update(state_hash, black, white, new_black, new_white)
+                if visited_states.add(new_hash):
+                    queue.append((child_i, child_color, new_black, new_white, new_hash))
+
+        self.stats["states_explored"] = states_explored
+        tracer.info("BFS search exhausted", states_explored=states_explored)
         return False  # No solution found
+
+    def layered_bfs_solve(self):
+        """
+        Solve the board with a level-synchronous Breadth-First Search.
+        Each depth layer is kept as a NumPy array of boards (see layers.py): the whole
+        layer is expanded at once, the 2x2 rules are checked for all children together
+        and duplicates are removed with np.unique, so only the surviving children go
+        through propagation and the bounded-region check one at a time.
+
+        Returns:
+            bool: True if a solution was found, False otherwise
+        """
+        tracer = self.tracer
+        tracer.info("Starting layered BFS solver")
+        self._begin_solve()
+        bb = self.bitboard
+        black, white = bb.pack(self.board.grid)
+        states_explored = 0
+
+        if black | white == bb.full:
+            return self.board.check_win_condition() == "WIN"
+
+        root = self._propagate_root(black, white)
+        if root is None:
+            return False
+        black, white = root
+        if black | white == bb.full:
+            return True
+
+        cell_count = bb.size * bb.size
+        layer = layers.from_masks([root], cell_count)
+        parent_dead = self.regions.is_dead(black, white)
+        control = self.control
+        depth = 0
+        while len(layer):
+            depth += 1
+            children, cells = layers.expand_layer(layer, bb.size)
+            distinct = layers.unique_rows(children)
+            tracer.debug("BFS layer", depth=depth, boards=len(layer), children=len(children),
+                         distinct=len(distinct))
+            children, cells = children[distinct], cells[distinct]
+
+            survivors = []
+            for (new_black, new_white), i in zip(layers.to_masks(children), cells.tolist()):
+                settled = self._settle(new_black, new_white, i, parent_dead)
+                if settled is None:
+                    continue
+                states_explored += 1
+                stop = control.step(states_explored, depth, len(children) - len(survivors))
+                if stop:
+                    return self._stop(stop, states_explored)
+                self._publish(*settled)
+
+                if settled[0] | settled[1] == bb.full:
+                    if self._is_solution_bits(*settled):
+                        self.board.grid = bb.to_grid(*settled)
+                        self.stats["states_explored"] = states_explored
+                        tracer.info("BFS solution found", states_explored=states_explored, depth=depth)
+                        return True
+                    continue
+                survivors.append(settled)
+
+            # Propagation can turn different children into the same state
+            layer = layers.from_masks(survivors, cell_count)
+            layer = layer[layers.unique_rows(layer)]
+            parent_dead = False
+
+        self.stats["states_explored"] = states_explored
+        tracer.info("BFS search exhausted", states_explored=states_explored)
+        return False  # No solution found
+
+    def sat_solve(self):
+        """
+        Solve the board with the SAT backend in sat.py.
+        The board is encoded with one variable per cell and clauses for the 2x2 rules;
+        connectivity is enforced by cut clauses that are added lazily, so the clause
+        learning engine scales to boards far beyond what the tree searches can handle.
+        
+        Returns:
+            bool: True if a solution was found, False otherwise
+        """
+        self.tracer.info("Starting SAT solver")
+        self._begin_solve()
+        black, white = self.bitboard.pack(self.board.grid)
+
+        if black | white == self.bitboard.full:
+            return self.board.check_win_condition() == "WIN"
+
+        root = self._propagate_root(black, white)
+        if root is None:
+            return False
+        black, white = root
+        if black | white == self.bitboard.full:
+            return True
+
+        stop = []  # Reason the control gave for aborting, if any
+        def should_stop():
+            reason = self.control.poll()
+            if reason:
+                stop.append(reason)
+            return reason is not None
+
+        solution, stats = sat.solve_board(self.bitboard, black, white, should_stop=should_stop)
+        self.stats.update(stats)
+        if stop:
+            return self._stop(stop[0], 0)
+        self.tracer.info("SAT search finished", **stats)
+        if solution is None:
+            self.tracer.info("SAT solver found no solution")
+            return False
+
+        self.board.grid = self.bitboard.to_grid(*solution)
+        self._publish(*solution)
+        self.tracer.info("SAT solution found")
+        return True
+
+    def portfolio_solve(self):
+        """
+        Solve the board with a portfolio of solvers running in parallel processes.
+        DFS with several search orders, A*, BFS and the SAT backend all start on the
+        same board; the first verified solution wins and the other runs are cancelled.
+        With a single CPU the variants are time-sliced in this process instead.
+        
+        Returns:
+            bool: True if a solution was found, False otherwise
+        """
+        self.tracer.info("Starting portfolio solver")
+        self._begin_solve()
+        
+        solution, stats = solve_portfolio(self.board.grid, max_time=self.control.remaining(), control=self.control,
+                                          max_nodes=self.control.max_nodes)
+        self.stats.update(stats)
+        for name, run in stats["runs"].items():
+            self.tracer.info("Portfolio run finished", variant=name,
+                             states_explored=run.get("states_explored"), elapsed=round(run["elapsed"], 3))
+        
+        if solution is None:
+            stop = self.control.poll() or stats.get("stopped")
+            if stop:
+                return self._stop(stop, 0)
+            self.tracer.info("Portfolio found no solution")
+            return False
+        
+        winner = stats["runs"][stats["winner"]]
+        self.stats["states_explored"] = winner.get("states_explored", 0)
+        self.stats["propagated"] = winner.get("propagated", 0)
+        self.board.grid = np.array(solution)
+        self._publish(*self.bitboard.pack(self.board.grid))
+        self.tracer.info("Portfolio solution found", winner=stats["winner"])
+        return True
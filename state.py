@@ -0,0 +1,95 @@
+from validity import WindowTracker
+from connectivity import ConnectivityTracker
+
+# Mutable search state for in-place backtracking.
+# Every placement is recorded on a trail, so the search can return to any earlier
+# point by popping the trail instead of keeping a copy of the board per node. Only the
+# 2x2 window counters are kept up to date per move; connectivity is checked once the
+# board is full, since the search already keeps both colors connected while it runs.
+
+class SearchState:
+    def __init__(self, size):
+        """
+        Create an empty search state for a board of the given size.
+
+        Args:
+            size (int): Number of rows/columns of the square board
+        """
+        self.size = size
+        self.black = 0
+        self.white = 0
+        self.windows = WindowTracker(size)
+        self.connectivity = ConnectivityTracker(size)  # Loaded by is_solved
+        self.trail = []  # (cell, color) per placement, oldest first
+
+    def load(self, black, white):
+        """
+        Reset the state to a bitboard pair and clear the trail.
+
+        Args:
+            black, white (int): Bitboard masks for each color
+        """
+        self.black = black
+        self.white = white
+        self.windows.reset(black, white)
+        self.trail = []
+
+    def can_place(self, i, color):
+        """
+        Check whether cell i is empty and color would not complete a 2x2 block.
+
+        Args:
+            i (int): Bit index of the cell
+            color (int): Color to place (0=black, 1=white)
+
+        Returns:
+            bool: True if the placement keeps the 2x2 rule
+        """
+        if (self.black | self.white) >> i & 1:
+            return False
+        return not self.windows.would_block(i, color)
+
+    def place(self, i, color):
+        """
+        Fill an empty cell and record it on the trail.
+
+        Args:
+            i (int): Bit index of the cell
+            color (int): Color placed (0=black, 1=white)
+        """
+        if color == 0:
+            self.black |= 1 << i
+        else:
+            self.white |= 1 << i
+        self.windows.place(i, color)
+        self.trail.append((i, color))
+
+    def undo(self):
+        """Undo the most recent placement."""
+        i, color = self.trail.pop()
+        if color == 0:
+            self.black &= ~(1 << i)
+        else:
+            self.white &= ~(1 << i)
+        self.windows.remove(i, color)
+
+    def undo_to(self, mark):
+        """
+        Undo placements until the trail is back to the given length.
+
+        Args:
+            mark (int): Trail length to return to
+        """
+        while len(self.trail) > mark:
+            self.undo()
+
+    def is_full(self):
+        """Return True when no empty cells remain."""
+        return self.windows.is_full()
+
+    def is_solved(self):
+        """Return True if the board is full, has no 2x2 blocks and both colors are connected."""
+        if not (self.windows.is_full() and self.windows.blocks == 0):
+            return False
+        self.connectivity.load(self.black, self.white)
+        return self.connectivity.components == [1, 1]
@@ -0,0 +1,141 @@
+import json
+import sys
+import time
+from collections import deque
+import config
+
+# Level-gated tracing for the solvers.
+# A Tracer forwards records at or above its level to a sink: the console, a ring buffer
+# that keeps the most recent records in memory, or a JSON-lines file. Checking a level
+# is a single comparison, and hot loops read tracer.level once before they start, so a
+# disabled tracer costs nothing per state. Anything expensive to build, such as a board
+# dump, is only built after the level check.
+
+DEBUG = 10  # Per-state details, including board dumps
+INFO = 20  # Start, progress and result of a solve
+OFF = 100  # Nothing is recorded
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", OFF: "OFF"}
+
+
+class TraceRecord:
+    def __init__(self, level, message, fields):
+        """
+        One traced event.
+
+        Args:
+            level (int): Severity level (DEBUG or INFO)
+            message (str): Human-readable summary
+            fields (dict): Structured values; lists are printed one item per line
+        """
+        self.time = time.time()
+        self.level = level
+        self.message = message
+        self.fields = fields
+
+    def format(self):
+        """Format the record as console text."""
+        inline = " ".join(f"{key}={value}" for key, value in self.fields.items() if not isinstance(value, list))
+        lines = [f"{self.message} {inline}" if inline else self.message]
+        for key, value in self.fields.items():
+            if isinstance(value, list):
+                lines.append(f"{key}:")
+                lines.extend(f"  {item}" for item in value)
+        return "\n".join(lines)
+
+    def to_dict(self):
+        """Return the record as a JSON-serializable dictionary."""
+        return {"time": self.time, "level": LEVEL_NAMES.get(self.level, self.level),
+                "message": self.message, **self.fields}
+
+
+class StreamSink:
+    def __init__(self, stream=None):
+        """
+        Write records as text to a stream.
+
+        Args:
+            stream (file, optional): Target stream; sys.stdout at the time of writing by default
+        """
+        self.stream = stream
+
+    def write(self, record):
+        print(record.format(), file=self.stream or sys.stdout)
+
+
+class RingBufferSink:
+    def __init__(self, capacity=1000):
+        """
+        Keep the most recent records in memory.
+
+        Args:
+            capacity (int): Number of records kept; older ones are dropped
+        """
+        self.buffer = deque(maxlen=capacity)
+
+    def write(self, record):
+        self.buffer.append(record)
+
+    def records(self):
+        """Return the buffered records, oldest first."""
+        return list(self.buffer)
+
+
+class FileSink:
+    def __init__(self, path):
+        """
+        Append records to a file, one JSON object per line.
+
+        Args:
+            path (str): File to append to
+        """
+        self.file = open(path, "a")
+
+    def write(self, record):
+        self.file.write(json.dumps(record.to_dict(), default=str) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class Tracer:
+    def __init__(self, level=INFO, sink=None):
+        """
+        Create a tracer.
+
+        Args:
+            level (int): Minimum level recorded (DEBUG, INFO or OFF)
+            sink (optional): Object with a write(record) method; console output by default
+        """
+        self.level = level
+        self.sink = sink if sink is not None else StreamSink()
+
+    def enabled(self, level):
+        """Return True if records at this level are recorded."""
+        return level >= self.level
+
+    def log(self, level, message, **fields):
+        """
+        Record an event if its level is enabled.
+
+        Args:
+            level (int): Severity level
+            message (str): Human-readable summary
+            **fields: Structured values attached to the record
+        """
+        if level >= self.level:
+            self.sink.write(TraceRecord(level, message, fields))
+
+    def debug(self, message, **fields):
+        self.log(DEBUG, message, **fields)
+
+    def info(self, message, **fields):
+        self.log(INFO, message, **fields)
+
+
+def default_tracer():
+    """
+    Create the tracer used when a solver is given none: console output at INFO level,
+    or DEBUG level when config.DEBUG is set.
+    """
+    return Tracer(DEBUG if config.DEBUG else INFO)
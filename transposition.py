@@ -0,0 +1,146 @@
+import random
+from collections import OrderedDict
+from bitboard import iter_bits
+
+# Duplicate detection for the search modes.
+# A state is identified by a 64-bit Zobrist hash: the XOR of one random key per filled
+# cell and color. Filling cells only XORs in their keys, so a child's hash is derived
+# from its parent's in time proportional to the cells that changed, instead of building
+# and hashing a key for the whole board at every node. The table holding the hashes
+# has a fixed capacity and evicts old entries when it is full, so memory stays bounded
+# on long searches. An evicted state may be explored again, which costs time but never
+# loses a solution. Two different states sharing a 64-bit hash is possible in principle,
+# but far too unlikely to matter at the number of states these searches visit.
+
+
+class ZobristKeys:
+    def __init__(self, cells, seed=0):
+        """
+        Draw the random keys for a board.
+
+        Args:
+            cells (int): Number of cells on the board
+            seed (int): Seed for the key generator, so hashes are reproducible
+        """
+        rng = random.Random(seed)
+        self.keys = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(2)]  # Indexed by color, then cell
+
+    def hash(self, black, white):
+        """
+        Compute the hash of a state from scratch.
+
+        Args:
+            black, white (int): Bitboard masks of the state
+
+        Returns:
+            int: 64-bit Zobrist hash
+        """
+        return self.update(0, 0, 0, black, white)
+
+    def update(self, h, black, white, new_black, new_white):
+        """
+        Derive the hash of a state reached by filling cells of another state.
+
+        Args:
+            h (int): Hash of the (black, white) state
+            black, white (int): Bitboard masks of the earlier state
+            new_black, new_white (int): Bitboard masks of the later state
+
+        Returns:
+            int: Hash of the (new_black, new_white) state
+        """
+        keys = self.keys[0]
+        for i in iter_bits(new_black & ~black):
+            h ^= keys[i]
+        keys = self.keys[1]
+        for i in iter_bits(new_white & ~white):
+            h ^= keys[i]
+        return h
+
+
+class TranspositionTable:
+    POLICIES = ("lru", "fifo")
+
+    def __init__(self, capacity, policy="lru"):
+        """
+        Create an empty table.
+
+        Args:
+            capacity (int): Maximum number of stored hashes; 0 or less means unbounded
+            policy (str): Entry evicted when the table is full: "lru" drops the one
+                looked up least recently, "fifo" drops the oldest insertion
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.entries = OrderedDict()  # Hash -> stored value, oldest first
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, h):
+        return h in self.entries
+
+    def get(self, h, default=None):
+        """
+        Look up a hash, refreshing its entry under the LRU policy.
+
+        Args:
+            h (int): State hash
+            default: Value returned when the hash is not stored
+
+        Returns:
+            The stored value, or default
+        """
+        if h not in self.entries:
+            return default
+        self.hits += 1
+        if self.policy == "lru":
+            self.entries.move_to_end(h)
+        return self.entries[h]
+
+    def put(self, h, value=None):
+        """
+        Store a value for a hash, evicting an entry if the table is full.
+
+        Args:
+            h (int): State hash
+            value: Value to store with it
+        """
+        if h in self.entries:
+            self.entries[h] = value
+            if self.policy == "lru":
+                self.entries.move_to_end(h)
+            return
+        if 0 < self.capacity <= len(self.entries):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[h] = value
+
+    def add(self, h):
+        """
+        Record a state as seen.
+
+        Args:
+            h (int): State hash
+
+        Returns:
+            bool: True if the state was new, False if it was already stored
+        """
+        if h in self.entries:
+            self.get(h)  # Count the hit and refresh the entry
+            return False
+        self.put(h)
+        return True
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.evictions = 0
@@ -4,7 +4,8 @@ import time
 import psutil
 import os
 from solver import Solver
-from config import CELL_SIZE, WHITE, BLACK, GRAY, BLUE
+from worker import SolveWorker
+from config import CELL_SIZE, WHITE, BLACK, GRAY, BLUE, SOLVE_FPS
 from board import Board
 
 # Initialize pygame
@@ -16,10 +17,27 @@ pygame.display.set_caption("Yin-Yang Puzzle")
 # Get the current process for memory tracking
 process = psutil.Process(os.getpid())
 
+# Fonts and fixed button labels are created once instead of on every frame
+font = pygame.font.Font(None, 24)
+font_normal = pygame.font.Font(None, 36)
+font_small = pygame.font.Font(None, 28)
+font_large = pygame.font.Font(None, 48)
+labels = {name: font.render(name, True, WHITE)
+          for name in ("Solve", "Stop", "Reset", "Back", "DFS", "BFS", "A*", "SAT", "?")}
+
+# Solver method run for each algorithm button
+SOLVE_METHODS = {"DFS": "dfs_solve", "BFS": "layered_bfs_solve", "A*": "a_star_solve", "SAT": "sat_solve"}
+
+# State of a solve running in the background
+worker = None  # SolveWorker of the current solve
+display_grid = None  # Latest state published by the running solver, drawn instead of the board
+progress = None  # Latest progress event of the running solver
+
 def draw_grid():
     """
     Draw the game board, buttons, and status information.
     This function is called repeatedly to update the display.
+    While a solver runs, its latest published state is drawn instead of the board.
     """
     screen.fill(WHITE)
     
@@ -32,7 +50,8 @@ def draw_grid():
     x_offset = (screen.get_width() - board_width) // 2
     y_offset = (screen.get_height() - (board_height + 100)) // 2  # Increased space for buttons
     
-    invalid_cells = board.check_2x2_blocks()
+    grid = display_grid if display_grid is not None else board.grid
+    invalid_cells = set() if solving else board.check_2x2_blocks()
 
     # Draw board with red backgrounds for invalid cells
     for r in range(board_size):
@@ -48,8 +67,8 @@ def draw_grid():
                             CELL_SIZE, CELL_SIZE), 1)
             
             # Draw cell contents (black or white circles)
-            if board.grid[r, c] != 2:
-                color = BLACK if board.grid[r, c] == 0 else WHITE
+            if grid[r, c] != 2:
+                color = BLACK if grid[r, c] == 0 else WHITE
                 center = (x_offset + c * CELL_SIZE + CELL_SIZE//2,
                          y_offset + r * CELL_SIZE + CELL_SIZE//2)
                 radius = CELL_SIZE//2 - 4
@@ -62,8 +81,8 @@ def draw_grid():
     # Draw centered buttons
     button_y = y_offset + board_height + 10
     
-    # Solve button
-    solve_color = (0, 100, 255) if not solving else (100, 100, 100)
+    # Solve button, which stops the solver while it runs
+    solve_color = (0, 100, 255) if not solving else (200, 0, 0)
     pygame.draw.rect(screen, solve_color, (x_offset, button_y, 80, 30))
     
     # Reset button
@@ -87,20 +106,17 @@ def draw_grid():
     astar_color = (0, 150, 0) if selected_algo == "A*" else (100, 100, 100)
     pygame.draw.rect(screen, astar_color, (x_offset + 180, algo_button_y, 80, 30))
     
-    font = pygame.font.Font(None, 24)
-    solve_text = font.render("Solve", True, WHITE)
-    reset_text = font.render("Reset", True, WHITE)
-    back_text = font.render("Back", True, WHITE)
-    dfs_text = font.render("DFS", True, WHITE)
-    bfs_text = font.render("BFS", True, WHITE)
-    astar_text = font.render("A*", True, WHITE)
+    # SAT button (green when selected, gray otherwise)
+    sat_color = (0, 150, 0) if selected_algo == "SAT" else (100, 100, 100)
+    pygame.draw.rect(screen, sat_color, (x_offset + 270, algo_button_y, 80, 30))
     
-    screen.blit(solve_text, (x_offset + 20, button_y + 5))
-    screen.blit(reset_text, (x_offset + 110, button_y + 5))
-    screen.blit(back_text, (x_offset + 200, button_y + 5))
-    screen.blit(dfs_text, (x_offset + 25, algo_button_y + 5))
-    screen.blit(bfs_text, (x_offset + 115, algo_button_y + 5))
-    screen.blit(astar_text, (x_offset + 205, algo_button_y + 5))
+    screen.blit(labels["Stop" if solving else "Solve"], (x_offset + 20, button_y + 5))
+    screen.blit(labels["Reset"], (x_offset + 110, button_y + 5))
+    screen.blit(labels["Back"], (x_offset + 200, button_y + 5))
+    screen.blit(labels["DFS"], (x_offset + 25, algo_button_y + 5))
+    screen.blit(labels["BFS"], (x_offset + 115, algo_button_y + 5))
+    screen.blit(labels["A*"], (x_offset + 205, algo_button_y + 5))
+    screen.blit(labels["SAT"], (x_offset + 295, algo_button_y + 5))
 
     # Add "?" button for Level 5 to access 10x10 board
     if current_level == 5:
@@ -110,16 +126,15 @@ def draw_grid():
                          screen.get_height() - question_button_size - 10,
                          question_button_size,
                          question_button_size))
-        question_text = font.render("?", True, WHITE)
+        question_text = labels["?"]
         question_rect = question_text.get_rect(center=(
                                               screen.get_width() - question_button_size//2 - 10,
                                               screen.get_height() - question_button_size//2 - 10))
         screen.blit(question_text, question_rect)
 
     # Check win condition and display message
-    win_status = board.check_win_condition()
+    win_status = None if solving else board.check_win_condition()
     if win_status:
-        font_large = pygame.font.Font(None, 48)
         if win_status == "WIN":
             text = font_large.render("You Won!", True, (0,255,0))
         else:
@@ -127,9 +142,6 @@ def draw_grid():
         text_rect = text.get_rect(center=(screen.get_width()//2, 40))
         screen.blit(text, text_rect)
     
-    # Use consistent font size for time and memory displays
-    font = pygame.font.Font(None, 24)
-    
     # Display elapsed time if solving or after solving
     if solving and solve_start_time:
         elapsed = time.time() - solve_start_time
@@ -145,6 +157,11 @@ def draw_grid():
         memory_text = font.render(f"Memory: {peak_memory:.2f} KB", True, BLACK)
         screen.blit(memory_text, (x_offset, y_offset - 20))
     
+    # Display the progress of a running solver
+    if solving and progress:
+        progress_text = font.render(f"Nodes: {progress['nodes']}  Depth: {progress['depth']}", True, BLACK)
+        screen.blit(progress_text, (x_offset + 160, y_offset - 40))
+    
     # Update the display
     pygame.display.flip()
 
@@ -154,9 +171,6 @@ def draw_level_menu():
     Shows title, subtitle, and level selection buttons.
     """
     screen.fill(WHITE)
-    font_large = pygame.font.Font(None, 48)
-    font_normal = pygame.font.Font(None, 36)
-    font_small = pygame.font.Font(None, 28)
     
     # Main title
     title = font_large.render("Yin-Yang Puzzle Game", True, BLACK)
@@ -195,6 +209,7 @@ def main():
     """
     global board, solver, fixed_cells, x_offset, y_offset, board_width, board_height, current_level
     global selected_algo, solving, solve_start_time, solve_end_time, peak_memory
+    global worker, display_grid, progress
     
     # Initialize algorithm selection
     selected_algo = "A*"  # Default algorithm
@@ -205,6 +220,8 @@ def main():
     
     # Set up initial window size for menu
     resize_window(600, 600)
+    clock = pygame.time.Clock()
+    baseline_memory = 0
 
     running = True
     while running:
@@ -233,7 +250,6 @@ def main():
                             board = Board(current_level)    
                             fixed_cells = {(r, c) for r in range(board.size) for c in range(board.size) if board.grid[r, c] != 2}
                             solver = Solver(board, fixed_cells)
-                            solver.draw_callback = draw_grid
                             level_selected = True
                             solving = False
                             solve_start_time = None
@@ -246,12 +262,41 @@ def main():
         
         # Game loop for selected level
         while level_selected and running:
+            if solving:
+                # Collect what the background solver reported since the last frame
+                for solver_event in worker.poll_events():
+                    if solver_event["type"] == "progress":
+                        progress = solver_event
+                    else:
+                        solving = False
+                        solve_end_time = time.time()
+                        if solver_event["type"] == "error":
+                            print(f"Solver failed: {solver_event['error']!r}")
+                        result = solver_event.get("result", False)
+                        stopped = worker.solver.stats.get("stopped")
+                        print(f"Puzzle solved: {result}, Time: {solve_end_time - solve_start_time:.2f}s, "
+                              f"Memory: {peak_memory:.2f} KB" + (f", stopped: {stopped}" if stopped else ""))
+                
+                if solving:
+                    # Redraw the searched state at the pace set by SOLVE_FPS or SOLVE_SPEED
+                    count, black, white = solver.snapshots.latest()
+                    if count and solver.frame_throttle.ready(count):
+                        display_grid = solver.bitboard.to_grid(black, white)
+                    # Memory used by the algorithm, relative to the baseline before solving
+                    current_memory = process.memory_info().rss / 1024  # KB
+                    peak_memory = max(peak_memory, current_memory - baseline_memory)
+                else:
+                    display_grid = None
+            
             draw_grid()
+            clock.tick(SOLVE_FPS)  # Cap the frame rate so the solver thread gets the CPU
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                    if solving:
+                        worker.cancel()
                 
-                elif event.type == pygame.MOUSEBUTTONDOWN and not solving:
+                elif event.type == pygame.MOUSEBUTTONDOWN:
                     x, y = event.pos
                     
                     # Calculate board dimensions and offsets for the current board size
@@ -263,6 +308,12 @@ def main():
                     button_y = y_offset + board_height + 10
                     algo_button_y = button_y + 40
                     
+                    # While a solver runs, only the Stop button responds
+                    if solving:
+                        if x_offset <= x <= x_offset + 80 and button_y <= y <= button_y + 30:
+                            worker.cancel()
+                        continue
+                    
                     # Check if "?" button was clicked (only on Level 5)
                     if current_level == 5:
                         question_button_size = 30
@@ -276,7 +327,6 @@ def main():
                             board = Board(current_level)
                             fixed_cells = {(r, c) for r in range(board.size) for c in range(board.size) if board.grid[r, c] != 2}
                             solver = Solver(board, fixed_cells)
-                            solver.draw_callback = draw_grid
                             solving = False
                             solve_start_time = None
                             solve_end_time = None
@@ -286,53 +336,26 @@ def main():
                             resize_window_for_board(board.size)
                             continue
                     
-                    # Solve button
+                    # Solve button: run the selected algorithm in the background
                     if x_offset <= x <= x_offset + 80 and button_y <= y <= button_y + 30:
-                        if not solving:
-                            solving = True
-                            solve_start_time = time.time()
-                            solve_end_time = None
-                            peak_memory = 0
-                            
-                            # Get baseline memory before solving
-                            baseline_memory = process.memory_info().rss / 1024  # KB
-                            
-                            # Run the selected algorithm
-                            result = False
-                            
-                            # Track memory usage during solving
-                            def memory_tracking_callback():
-                                global peak_memory
-                                current_memory = process.memory_info().rss / 1024  # KB
-                                # Calculate memory used by algorithm (relative to baseline)
-                                algorithm_memory = current_memory - baseline_memory
-                                peak_memory = max(peak_memory, algorithm_memory)
-                                draw_grid()  # Update display with current memory usage
-                            
-                            # Set the callback for memory tracking
-                            solver.draw_callback = memory_tracking_callback
-                            
-                            if selected_algo == "DFS":
-                                result = solver.dfs_solve()
-                            elif selected_algo == "BFS":
-                                result = solver.bfs_solve()
-                            else:  # A*
-                                result = solver.a_star_solve()
-                            
-                            solve_end_time = time.time()
-                            solving = False
-                            
-                            # Reset the callback
-                            solver.draw_callback = draw_grid
-                            
-                            print(f"Puzzle solved: {result}, Time: {solve_end_time - solve_start_time:.2f}s, Memory: {peak_memory:.2f} KB")
+                        solving = True
+                        solve_start_time = time.time()
+                        solve_end_time = None
+                        peak_memory = 0
+                        progress = None
+                        display_grid = None
+                        
+                        # Get baseline memory before solving
+                        baseline_memory = process.memory_info().rss / 1024  # KB
+                        
+                        worker = SolveWorker(solver, SOLVE_METHODS[selected_algo])
+                        worker.start()
                     
                     # Reset button
                     elif x_offset + 90 <= x <= x_offset + 170 and button_y <= y <= button_y + 30:
                         board = Board(current_level)
                         fixed_cells = {(r, c) for r in range(board.size) for c in range(board.size) if board.grid[r, c] != 2}
                         solver = Solver(board, fixed_cells)
-                        solver.draw_callback = draw_grid
                         solving = False
                         solve_start_time = None
                         solve_end_time = None
@@ -357,6 +380,10 @@ def main():
                     elif x_offset + 180 <= x <= x_offset + 260 and algo_button_y <= y <= algo_button_y + 30:
                         selected_algo = "A*"
                     
+                    # SAT button
+                    elif x_offset + 270 <= x <= x_offset + 350 and algo_button_y <= y <= algo_button_y + 30:
+                        selected_algo = "SAT"
+                    
                     # Board interaction
                     elif (y_offset <= y <= y_offset + board_height and 
                         x_offset <= x <= x_offset + board_width):
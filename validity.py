@@ -0,0 +1,116 @@
+# Incremental 2x2 rule checking.
+# Every cell belongs to at most four 2x2 windows, so a placement only needs to look at
+# those windows instead of rescanning the whole board.
+
+class WindowTracker:
+    def __init__(self, size):
+        """
+        Precompute the 2x2 windows touching each cell of a board.
+
+        Args:
+            size (int): Number of rows/columns of the square board
+        """
+        self.size = size
+        self.cells = size * size
+
+        # Window w has its top-left corner at cell w; only anchors with r, c < size-1 exist
+        self.window_masks = {}
+        for r in range(size - 1):
+            for c in range(size - 1):
+                w = r * size + c
+                self.window_masks[w] = ((1 << w) | (1 << (w + 1)) |
+                                        (1 << (w + size)) | (1 << (w + size + 1)))
+
+        # Windows containing each cell (at most four)
+        self.windows_of = [[] for _ in range(self.cells)]
+        for w, mask in self.window_masks.items():
+            for i in (w, w + 1, w + size, w + size + 1):
+                self.windows_of[i].append(w)
+
+        # Per-window counters indexed by color (0=black, 1=white), then by anchor cell
+        self.counts = [[0] * self.cells, [0] * self.cells]
+        self.empty = self.cells
+        self.blocks = 0  # Number of monochrome 2x2 windows
+
+    def completes_block(self, same, i):
+        """
+        Check whether cell i sits in a 2x2 window fully covered by same.
+
+        Args:
+            same (int): Bitboard mask of one color, including cell i
+            i (int): Bit index of the cell that was just filled
+
+        Returns:
+            bool: True if one of the windows containing i is monochrome
+        """
+        for w in self.windows_of[i]:
+            mask = self.window_masks[w]
+            if same & mask == mask:
+                return True
+        return False
+
+    def reset(self, black, white):
+        """
+        Rebuild the counters from a bitboard pair.
+
+        Args:
+            black, white (int): Bitboard masks for each color
+        """
+        self.blocks = 0
+        for w, mask in self.window_masks.items():
+            self.counts[0][w] = (black & mask).bit_count()
+            self.counts[1][w] = (white & mask).bit_count()
+            if self.counts[0][w] == 4 or self.counts[1][w] == 4:
+                self.blocks += 1
+        self.empty = self.cells - (black | white).bit_count()
+
+    def would_block(self, i, color):
+        """
+        Check whether placing color on cell i would complete a monochrome 2x2 window.
+
+        Args:
+            i (int): Bit index of an empty cell
+            color (int): Color to place (0=black, 1=white)
+
+        Returns:
+            bool: True if the placement breaks the 2x2 rule
+        """
+        counts = self.counts[color]
+        for w in self.windows_of[i]:
+            if counts[w] == 3:
+                return True
+        return False
+
+    def place(self, i, color):
+        """
+        Record color on cell i in O(1).
+
+        Args:
+            i (int): Bit index of an empty cell
+            color (int): Color placed (0=black, 1=white)
+        """
+        counts = self.counts[color]
+        for w in self.windows_of[i]:
+            counts[w] += 1
+            if counts[w] == 4:
+                self.blocks += 1
+        self.empty -= 1
+
+    def remove(self, i, color):
+        """
+        Undo a previous place(i, color) when the search backtracks.
+
+        Args:
+            i (int): Bit index of the cell to clear
+            color (int): Color that was placed there
+        """
+        counts = self.counts[color]
+        for w in self.windows_of[i]:
+            if counts[w] == 4:
+                self.blocks -= 1
+            counts[w] -= 1
+        self.empty += 1
+
+    def is_full(self):
+        """Return True when no empty cells remain."""
+        return self.empty == 0
@@ -0,0 +1,83 @@
+import queue
+import threading
+import config
+from control import SearchControl
+from snapshot import FrameThrottle, SnapshotBuffer
+
+# Running a solver off the caller's thread.
+# A SolveWorker runs one solver method in a background thread and reports back through
+# a queue of events, so an event loop can keep pumping while the search runs:
+#   {"type": "progress", "nodes", "depth", "frontier", "best_heuristic", "elapsed"}
+#   {"type": "done", "result", "stats"}
+#   {"type": "error", "error"}
+# The search can be cancelled at any time and stops by itself when its time or node
+# budget runs out. The board being searched is read from solver.snapshots instead of
+# through a draw callback, since drawing has to happen on the UI thread; the caller
+# redraws when solver.frame_throttle is ready, so config.SOLVE_SPEED still applies.
+
+
+class SolveWorker:
+    def __init__(self, solver, method, max_time=None, max_nodes=None, progress_interval=0.1):
+        """
+        Prepare a background solve.
+
+        Args:
+            solver (Solver): Solver to run; it must not be used elsewhere until done
+            method (str): Name of the solver method, e.g. "dfs_solve"
+            max_time (float, optional): Time budget in seconds (config.SOLVE_TIME_LIMIT by default)
+            max_nodes (int, optional): Node budget (config.SOLVE_NODE_LIMIT by default)
+            progress_interval (float): Minimum seconds between progress events
+        """
+        self.solver = solver
+        self.method = method
+        self.events = queue.Queue()
+        self.result = None
+        self.control = SearchControl(max_time or config.SOLVE_TIME_LIMIT or None,
+                                     max_nodes or config.SOLVE_NODE_LIMIT or None,
+                                     progress=self._report_progress,
+                                     progress_interval=progress_interval)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start the search in the background."""
+        self.solver.control = self.control
+        self.solver.snapshots = SnapshotBuffer()
+        self.solver.frame_throttle = FrameThrottle.from_config()
+        self.solver.draw_callback = None  # Drawing stays on the caller's thread
+        self.thread.start()
+
+    def cancel(self):
+        """Ask the search to stop at its next state."""
+        self.control.cancel()
+
+    def is_running(self):
+        """Return True while the search thread is alive."""
+        return self.thread.is_alive()
+
+    def join(self, timeout=None):
+        """Wait for the search thread to finish."""
+        self.thread.join(timeout)
+
+    def poll_events(self):
+        """
+        Collect the events posted since the last call without blocking.
+
+        Returns:
+            list: Event dictionaries, oldest first
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _report_progress(self, info):
+        self.events.put({"type": "progress", **info})
+
+    def _run(self):
+        try:
+            self.result = getattr(self.solver, self.method)()
+            self.events.put({"type": "done", "result": self.result, "stats": dict(self.solver.stats)})
+        except Exception as e:
+            self.events.put({"type": "error", "error": e})